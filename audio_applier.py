@@ -0,0 +1,48 @@
+import time
+
+class AudioApplier:
+    def __init__(self, apply, is_ready, timeout=3.0, clock=time.monotonic):
+        self.apply = apply
+        self.is_ready = is_ready
+        self.timeout = timeout
+        self.clock = clock
+        self.requested_at = None
+        self.requests = 0
+        self.deduplicated = 0
+        self.applied = 0
+        self.timeouts = 0
+        self.latencies = []
+
+    @property
+    def pending(self):
+        return self.requested_at is not None
+
+    def request(self):
+        self.requests += 1
+        if self.requested_at is not None:
+            self.deduplicated += 1
+            return False
+        self.requested_at = self.clock()
+        return True
+
+    def notify_ready(self):
+        if self.requested_at is None:
+            return False
+        self._apply()
+        return True
+
+    def expire(self):
+        if self.requested_at is None or self.clock() - self.requested_at < self.timeout:
+            return False
+        if self.is_ready():
+            self._apply()
+        else:
+            self.requested_at = None
+            self.timeouts += 1
+        return True
+
+    def _apply(self):
+        self.latencies.append(self.clock() - self.requested_at)
+        self.requested_at = None
+        self.applied += 1
+        self.apply()
@@ -0,0 +1,1488 @@
+import sys
+import os
+import argparse
+import platform
+import json
+import time
+import tempfile
+import threading
+import http.server
+import hashlib
+import tracemalloc
+import subprocess
+from playlist_model import PlaylistModel, MediaListSync, path_to_mrl, mrl_to_path
+from config_store import ConfigWriter, read_config
+from saved_playlists import BinaryPlaylist, PlaylistIndex, read_saved_playlist, write_saved_playlist
+from path_validator import PathValidator
+from metadata_prober import MetadataProber, PROBE_CHUNK
+from thumbnails import ThumbnailCache, ThumbnailService, StubFrameSource
+from update_checker import UpdateChecker
+from update_handshake import wait_for_exit, replace_file
+from progress_tracker import ProgressTracker
+from player_state import PlayerState, StateStore
+from audio_applier import AudioApplier
+from event_bridge import EventBridge
+from playback_core import PlaybackCore, MediaBackend, STATE_PLAYING, STATE_PAUSED, STATE_STOPPED
+from media_prefetch import MediaPrefetcher
+
+SIZES = (1000, 10000, 100000)
+DROP_FILES = 10000
+MOVE_STEPS = 1000
+FAR_MOVES = 100
+ROUND_TRIPS = 20
+MANUAL_SWITCHES = 1000
+COLD_OPEN_MS = 350
+WARM_OPEN_MS = 40
+PROBE_SECONDS = 0.0005
+TOUCHED_FILES = 10
+OVERLAP_PATHS = 300
+SLOW_DIRECTORIES = 40
+SLOW_WORKERS = 4
+SLOW_LISTING_SECONDS = 0.05
+OVERLAP_TIMEOUT = 30
+VISIBLE_ROWS = 20
+SCROLL_SCREENS = 40
+FRAME_SECONDS = 0.002
+THUMBNAIL_QUOTA_ROWS = 400
+RELEASE_LATENCY = 0.2
+UPDATE_CHECKS = 10
+DOWNLOAD_BYTES_PER_ENTRY = 256
+LINK_RATE = 4 * 1024 * 1024
+LINK_LATENCY = 0.05
+LINK_BLOCK = 64 * 1024
+DELTA_INSERT = 3000
+DELTA_REWRITE = 64 * 1024
+DELTA_DELETE = 5000
+DELTA_APPEND = 100 * 1024
+LEGACY_UPDATER_SLEEPS = 7.0
+PLAYER_EXIT_SECONDS = (0.2, 1.0)
+HUNG_PLAYER_TIMEOUT = 0.5
+LEGACY_STARTUP_IMPORTS = ('requests', 'subprocess', 'random', 'downloader', 'saved_playlists', 'path_validator',
+                          'metadata_prober', 'thumbnails')
+PLATFORM_MODULES = ('PyQt6', 'vlc', 'win32gui', 'win32con', 'winreg', 'win32api')
+IMPORT_STUBS = '''import sys, time, json, types, importlib.abc, importlib.machinery, importlib.util
+class StubType(type):
+    def __getattr__(cls, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return Stub
+    def __or__(cls, other):
+        return Stub
+    __ror__ = __or__
+class Stub(metaclass=StubType):
+    def __init__(self, *args, **kwargs):
+        pass
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return Stub()
+    def __call__(self, *args, **kwargs):
+        return Stub()
+    def __or__(self, other):
+        return self
+    __ror__ = __or__
+class StubModule(types.ModuleType):
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return Stub
+class StubFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    def __init__(self, roots):
+        self.roots = roots
+    def find_spec(self, name, path, target=None):
+        if name.split('.')[0] in self.roots:
+            return importlib.machinery.ModuleSpec(name, self, is_package=True)
+    def create_module(self, spec):
+        return StubModule(spec.name)
+    def exec_module(self, module):
+        pass
+stubbed = [name for name in %r if importlib.util.find_spec(name) is None]
+sys.meta_path.insert(0, StubFinder(stubbed))
+'''
+IMPORT_RUNS = 5
+IMPORT_BUDGET = 0.05
+IMPORT_REPORT_TOP = 5
+LEGACY_SAMPLE = 20
+SAVE_BURST = 100
+SAVED_PLAYLIST_COUNT = 2000
+PLAYBACK_SECONDS = 600
+VLC_EVENT_INTERVAL = 50
+LEGACY_TIMER_INTERVAL = 100
+STATE_ACTIONS = 1000
+PUBLISHES_PER_ACTION = 3
+AUDIO_REQUESTS_PER_START = 3
+AUDIO_READY_MS = 230
+BROKEN_FILE_SECONDS = 60
+LEGACY_AUDIO_DELAY = 100
+LEGACY_AUDIO_POLL = 50
+TRACK_SWITCHES = 10000
+TRACK_LENGTH = 1000
+LEGACY_WIDGET_SETS = {'tray': 2, 'fullscreen_button': 2, 'control_dialog': 8}
+
+def make_paths(count, start=0):
+    return [f"C:/Videos/folder_{i // 500:04d}/clip_{i:06d}.mp4" for i in range(start, start + count)]
+
+class FakeBackend(MediaBackend):
+    def __init__(self, duration=None, default_duration=60000, cold_open=0, warm_open=0):
+        self.duration = duration or (lambda path: default_duration)
+        self.cold_open = cold_open
+        self.warm_open = warm_open
+        self.now = 0
+        self.paths = []
+        self.index = None
+        self.position = 0
+        self.playing = False
+        self.paused = False
+        self.repeat_mode = 'one'
+        self.volume = 100
+        self.muted = False
+        self.calls = 0
+        self.started = 0
+        self.listener = None
+        self.handed = 0
+        self.released = 0
+        self.prefetcher = MediaPrefetcher(lambda media: None, release=self.release_media, clock=lambda: self.now / 1000)
+
+    def release_media(self, media):
+        self.released += 1
+
+    def set_listener(self, listener):
+        self.listener = listener
+
+    def emit(self, kind, payload=None):
+        if self.listener is not None:
+            self.listener(kind, payload)
+
+    def set_playlist(self, paths):
+        self.calls += 1
+        current = self.paths[self.index] if self.index is not None and self.index < len(self.paths) else None
+        paths = list(paths)
+        if paths != self.paths:
+            self.prefetcher.clear()
+        self.paths = paths
+        if current is not None:
+            self.index = self.paths.index(current) if current in self.paths else None
+            if self.index is None and (self.playing or self.paused):
+                self.stop()
+
+    def count(self):
+        return len(self.paths)
+
+    def play_index(self, index):
+        self.calls += 1
+        if not 0 <= index < len(self.paths):
+            return
+        self.prefetcher.begin_switch(self.paths[index])
+        self.now += self.warm_open if self.paths[index] in self.prefetcher.prepared else self.cold_open
+        self.prefetcher.first_frame()
+        self.index = index
+        self.position = 0
+        self.playing = True
+        self.paused = False
+        self.started += 1
+        self.emit('playing')
+
+    def pause(self):
+        self.calls += 1
+        if self.playing:
+            self.playing = False
+            self.paused = True
+            self.emit('paused')
+
+    def resume(self):
+        self.calls += 1
+        if self.paused:
+            self.playing = True
+            self.paused = False
+            self.emit('playing')
+
+    def stop(self):
+        self.calls += 1
+        was_active = self.playing or self.paused
+        self.playing = False
+        self.paused = False
+        self.position = 0
+        if was_active:
+            self.emit('stopped')
+
+    def state(self):
+        if self.playing:
+            return STATE_PLAYING
+        if self.paused:
+            return STATE_PAUSED
+        return STATE_STOPPED
+
+    def current_path(self):
+        if self.index is None or not self.playing and not self.paused:
+            return None
+        return self.paths[self.index]
+
+    def set_repeat_mode(self, mode):
+        self.calls += 1
+        self.repeat_mode = mode
+
+    def set_volume(self, volume):
+        self.calls += 1
+        self.volume = volume
+
+    def set_mute(self, muted):
+        self.calls += 1
+        self.muted = muted
+
+    def prefetch(self, indices, upcoming):
+        items = [(self.paths[i], self.paths[i]) for i in indices if 0 <= i < len(self.paths)]
+        self.handed += len(items)
+        self.prefetcher.prepare(items)
+
+    def length(self):
+        if self.index is None:
+            return -1
+        return self.duration(self.paths[self.index])
+
+    def advance(self, ms):
+        while ms > 0:
+            if not self.playing:
+                self.now += ms
+                return
+            remaining = max(1, self.length() - self.position)
+            if ms < remaining:
+                self.position += ms
+                self.now += ms
+                return
+            self.now += remaining
+            ms -= remaining
+            self.emit('end_reached')
+            if self.repeat_mode == 'one':
+                self.play_index(self.index)
+            else:
+                self.play_index((self.index + 1) % len(self.paths))
+
+def legacy_is_duplicate_file(new_file, existing_files):
+    new_name = os.path.basename(new_file)
+    new_dir = os.path.dirname(new_file)
+    for existing_file in existing_files:
+        existing_name = os.path.basename(existing_file)
+        existing_dir = os.path.dirname(existing_file)
+        if new_name == existing_name and new_dir == existing_dir:
+            return True
+    return False
+
+class FakeMediaList:
+    def __init__(self):
+        self.items = []
+        self.calls = 0
+        self.locked = False
+
+    def lock(self):
+        self.locked = True
+
+    def unlock(self):
+        self.locked = False
+
+    def count(self):
+        return len(self.items)
+
+    def remove_index(self, index):
+        if not self.locked:
+            raise RuntimeError("media list modified without lock")
+        self.items.pop(index)
+        self.calls += 1
+
+    def insert_media(self, media, index):
+        if not self.locked:
+            raise RuntimeError("media list modified without lock")
+        self.items.insert(index, media)
+        self.calls += 1
+
+    def add_media(self, media):
+        self.items.append(media)
+        self.calls += 1
+
+def legacy_load_playlist(media_list, playlist):
+    media_list.lock()
+    while media_list.count() > 0:
+        media_list.remove_index(0)
+    media_list.unlock()
+    for path in playlist:
+        media_list.add_media(path_to_mrl(path))
+
+def legacy_find_playing_index(playlist, mrl):
+    media_path = os.path.normpath(mrl_to_path(mrl))
+    for i, path in enumerate(playlist):
+        if os.path.normpath(path) == media_path:
+            return i
+    return None
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def bench_playlist_dedup(size):
+    existing = make_paths(size)
+    dropped = make_paths(DROP_FILES, start=max(0, size - DROP_FILES // 2))
+    dropped += dropped[:DROP_FILES // 10]
+    sample = dropped[::len(dropped) // LEGACY_SAMPLE]
+    legacy_seconds, _ = timed(lambda: [f for f in sample if not legacy_is_duplicate_file(f, existing)])
+    legacy_estimated = legacy_seconds / len(sample) * len(dropped)
+    backend = FakeBackend()
+    core = PlaybackCore(backend)
+    core.set_playlist(PlaylistModel(existing))
+    original = core.playlist.copy()
+    fake = FakeMediaList()
+    media_sync = MediaListSync(fake, path_to_mrl)
+    media_sync.sync(core.playlist)
+    def drop():
+        new_files = core.playlist.add_many(dropped)
+        original.add_many(new_files)
+        media_sync.sync(core.playlist)
+        core.sync_playlist()
+        return new_files
+    seconds, added = timed(drop)
+    expected = size + DROP_FILES - min(size, DROP_FILES // 2)
+    if len(core.playlist) != expected or len(original) != expected or fake.count() != expected:
+        raise AssertionError("dropped files not merged into playlist")
+    return {
+        "dropped": len(dropped),
+        "added": len(added),
+        "legacy_seconds_estimated": legacy_estimated,
+        "drop_seconds": seconds,
+        "speedup": legacy_estimated / seconds if seconds else None,
+        "libvlc_calls": media_sync.last_call_count,
+    }
+
+def bench_media_list_sync(size):
+    playlist = make_paths(size)
+    legacy_list = FakeMediaList()
+    legacy_load_playlist(legacy_list, playlist)
+    legacy_list.calls = 0
+    legacy_seconds, _ = timed(legacy_load_playlist, legacy_list, playlist + make_paths(1, start=size))
+    model = PlaylistModel(playlist)
+    fake = FakeMediaList()
+    media_sync = MediaListSync(fake, path_to_mrl)
+    initial_seconds, _ = timed(media_sync.sync, model)
+    result = {
+        "legacy_append_seconds": legacy_seconds,
+        "legacy_append_libvlc_calls": legacy_list.calls,
+        "initial_seconds": initial_seconds,
+        "initial_libvlc_calls": media_sync.last_call_count,
+    }
+    edits = (
+        ("unchanged", lambda: None),
+        ("append", lambda: model.add(make_paths(1, start=size)[0])),
+        ("remove_middle", lambda: model.remove_at(len(model) // 2)),
+        ("move_far", lambda: model.move(0, len(model) - 1)),
+        ("shuffle", model.shuffle),
+    )
+    for name, edit in edits:
+        edit()
+        seconds, _ = timed(media_sync.sync, model)
+        if fake.items != [path_to_mrl(path) for path in model]:
+            raise AssertionError(f"media list out of sync after {name}")
+        result[f"{name}_seconds"] = seconds
+        result[f"{name}_libvlc_calls"] = media_sync.last_call_count
+    return result
+
+def bench_playing_lookup(size):
+    paths = make_paths(size)
+    backend = FakeBackend()
+    core = PlaybackCore(backend)
+    core.set_playlist(PlaylistModel(paths))
+    targets = list(range(0, size, max(1, size // 1000)))
+    sample = targets[::max(1, len(targets) // LEGACY_SAMPLE)]
+    legacy_seconds, legacy_found = timed(lambda: [legacy_find_playing_index(paths, path_to_mrl(paths[i])) for i in sample])
+    def lookups():
+        found = []
+        for index in targets:
+            backend.play_index(index)
+            found.append(core.handle_playing())
+        return found
+    seconds, found = timed(lookups)
+    if found != targets or legacy_found != sample:
+        raise AssertionError("playing lookup mismatch")
+    core.playlist.move(0, size - 1)
+    core.sync_playlist()
+    backend.play_index(size - 1)
+    stale_seconds, index = timed(core.handle_playing)
+    if index != size - 1:
+        raise AssertionError("playing lookup mismatch after move")
+    return {
+        "lookups": len(targets),
+        "legacy_seconds_per_lookup": legacy_seconds / len(sample),
+        "lookup_seconds": seconds / len(targets),
+        "lookup_after_edit_seconds": stale_seconds,
+    }
+
+def make_config(index):
+    return {
+        'current_video_index': index,
+        'repeat_mode': 'all',
+        'volume': 100,
+        'is_muted': False,
+        'last_video_dir': None,
+        'window_pos': {'x': 100, 'y': 100},
+        'window_size': {'width': 550, 'height': 250},
+        'playback_state': 'playing',
+        'saved_original_wallpaper': '',
+        'saved_original_bg_color': '0 0 0',
+    }
+
+def bench_config_save(size):
+    playlist = make_paths(size)
+    model = PlaylistModel(playlist)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        legacy_path = os.path.join(temp_dir, 'legacy.json')
+        def legacy_burst():
+            for i in range(SAVE_BURST):
+                with open(legacy_path, 'w', encoding='utf-8') as f:
+                    json.dump(dict(make_config(i), playlist=playlist), f)
+        legacy_seconds, _ = timed(legacy_burst)
+        legacy_bytes = os.path.getsize(legacy_path)
+        config_file = os.path.join(temp_dir, 'config.json')
+        playlist_file = os.path.join(temp_dir, 'playlist.json')
+        migrate_seconds, (_, entries, digest) = timed(read_config, legacy_path, playlist_file)
+        if entries != playlist:
+            raise AssertionError("legacy playlist was not migrated")
+        writer = ConfigWriter(config_file, playlist_file, delay=0.05)
+        writer.playlist_hash = digest
+        caller_seconds, _ = timed(lambda: [writer.save(make_config(i), model) for i in range(SAVE_BURST)])
+        close_seconds, _ = timed(writer.close)
+        state, entries, _ = read_config(config_file, playlist_file)
+        if state['current_video_index'] != SAVE_BURST - 1 or entries != playlist:
+            raise AssertionError("last save was not persisted")
+        session_bytes = os.path.getsize(config_file)
+        round_trip_writer = ConfigWriter(config_file, playlist_file)
+        def save_state_only():
+            for i in range(ROUND_TRIPS):
+                round_trip_writer.save(make_config(i), model)
+                round_trip_writer.flush()
+        def save_with_edits():
+            for i in range(ROUND_TRIPS):
+                model.swap(i, size - 1 - i)
+                round_trip_writer.save(make_config(i), model)
+                round_trip_writer.flush()
+        state_seconds, _ = timed(save_state_only)
+        edit_seconds, _ = timed(save_with_edits)
+        round_trip_writer.close()
+        load_seconds, (state, entries, _) = timed(read_config, config_file, playlist_file)
+        if state != make_config(ROUND_TRIPS - 1) or entries != model.to_list():
+            raise AssertionError("config round trip mismatch")
+        rebuild_seconds, _ = timed(PlaylistModel, entries)
+        playlist_bytes = os.path.getsize(playlist_file)
+    return {
+        "saves": SAVE_BURST,
+        "legacy_seconds": legacy_seconds,
+        "legacy_bytes_per_write": legacy_bytes,
+        "migrate_seconds": migrate_seconds,
+        "writer_caller_seconds": caller_seconds,
+        "writer_close_seconds": close_seconds,
+        "session_bytes_per_write": session_bytes,
+        "writes_requested": writer.writes_requested,
+        "writes_performed": writer.writes_performed,
+        "playlist_writes": writer.playlist_writes,
+        "round_trips": ROUND_TRIPS,
+        "save_state_only_seconds": state_seconds / ROUND_TRIPS,
+        "save_with_playlist_edit_seconds": edit_seconds / ROUND_TRIPS,
+        "load_seconds": load_seconds,
+        "model_rebuild_seconds": rebuild_seconds,
+        "round_trip_playlist_writes": round_trip_writer.playlist_writes,
+        "playlist_bytes": playlist_bytes,
+    }
+
+def bench_saved_playlist_load(size):
+    playlist = make_paths(size)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        json_path = os.path.join(temp_dir, 'playlist.json')
+        binary_path = os.path.join(temp_dir, 'playlist.ldbp')
+        write_saved_playlist(json_path, playlist)
+        write_saved_playlist(binary_path, playlist)
+        json_seconds, json_entries = timed(read_saved_playlist, json_path)
+        binary_seconds, binary_entries = timed(read_saved_playlist, binary_path)
+        if json_entries != playlist or binary_entries != playlist:
+            raise AssertionError("saved playlist round trip mismatch")
+        def peek():
+            with BinaryPlaylist(binary_path) as binary:
+                return len(binary), binary[size // 2:size // 2 + 50]
+        peek_seconds, (count, window) = timed(peek)
+        if count != size or window != playlist[size // 2:size // 2 + 50]:
+            raise AssertionError("binary playlist slice mismatch")
+        json_bytes = os.path.getsize(json_path)
+        binary_bytes = os.path.getsize(binary_path)
+    return {
+        "json_load_seconds": json_seconds,
+        "binary_load_seconds": binary_seconds,
+        "binary_count_and_slice_seconds": peek_seconds,
+        "json_bytes": json_bytes,
+        "binary_bytes": binary_bytes,
+    }
+
+class SlowPathValidator(PathValidator):
+    def _list_directory(self, directory, cached):
+        time.sleep(SLOW_LISTING_SECONDS)
+        return super()._list_directory(directory, cached)
+
+def bench_path_validation(size):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        playlist = [os.path.join(temp_dir, path[3:]) for path in make_paths(size)]
+        for path in playlist:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        for i, path in enumerate(playlist):
+            if i % 100:
+                open(path, 'wb').close()
+        expected = set(playlist[::100])
+        legacy_seconds, kept = timed(lambda: [path for path in playlist if os.path.exists(path)])
+        validator = PathValidator(os.path.join(temp_dir, 'paths.json'))
+        cold_seconds, (missing, unavailable) = timed(validator.validate_now, playlist)
+        warm_seconds, (warm_missing, _) = timed(PathValidator(validator.cache_file).validate_now, playlist)
+        if set(missing) != expected or set(warm_missing) != expected or unavailable or len(kept) != size - len(expected):
+            raise AssertionError("path validation mismatch")
+        slow_playlist = [os.path.join(temp_dir, 'slow', f"folder_{i:04d}", 'clip.mp4') for i in range(SLOW_DIRECTORIES)]
+        for path in slow_playlist:
+            os.makedirs(os.path.dirname(path))
+            open(path, 'wb').close()
+        slow = SlowPathValidator(max_workers=SLOW_WORKERS, root_timeout=SLOW_LISTING_SECONDS * 2)
+        slow_seconds, (slow_missing, slow_unavailable) = timed(slow.validate_now, slow_playlist)
+        if slow_missing or slow_unavailable:
+            raise AssertionError("slow but live volume reported as unavailable")
+    return {
+        "legacy_serial_seconds": legacy_seconds,
+        "validator_cold_seconds": cold_seconds,
+        "validator_cached_seconds": warm_seconds,
+        "missing": len(missing),
+        "slow_volume_seconds": slow_seconds,
+    }
+
+def bench_playlist_index(size):
+    entries = make_paths(size // SAVED_PLAYLIST_COUNT)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        playlist_dir = os.path.join(temp_dir, 'playlists')
+        os.makedirs(playlist_dir)
+        for i in range(SAVED_PLAYLIST_COUNT):
+            write_saved_playlist(os.path.join(playlist_dir, f"playlist_{i:05d}.json"), entries)
+        def legacy_counts():
+            return [len(read_saved_playlist(os.path.join(playlist_dir, file))) for file in os.listdir(playlist_dir)]
+        legacy_seconds, _ = timed(legacy_counts)
+        unknown_duration = lambda path: None
+        cold_seconds, records = timed(PlaylistIndex(playlist_dir, duration_lookup=unknown_duration).refresh)
+        warm_index = PlaylistIndex(playlist_dir, duration_lookup=unknown_duration)
+        warm_seconds, warm_records = timed(warm_index.refresh)
+        write_saved_playlist(os.path.join(playlist_dir, "playlist_00000.json"), entries + make_paths(1, size))
+        changed_index = PlaylistIndex(playlist_dir, duration_lookup=unknown_duration)
+        changed_seconds, changed_records = timed(changed_index.refresh)
+        if (len(records) != SAVED_PLAYLIST_COUNT or warm_records != records or warm_index.files_read != 0 or
+                changed_index.files_read != 1 or changed_records[0]['count'] != len(entries) + 1):
+            raise AssertionError("playlist index mismatch")
+    return {
+        "playlists": SAVED_PLAYLIST_COUNT,
+        "legacy_parse_all_seconds": legacy_seconds,
+        "index_cold_seconds": cold_seconds,
+        "index_warm_seconds": warm_seconds,
+        "index_one_changed_seconds": changed_seconds,
+    }
+
+def simulate_progress(length, active):
+    now = [0.0]
+    tracker = ProgressTracker(clock=lambda: now[0])
+    tracker.set_active(active)
+    refresh_at = 0 if tracker.push_length(length) else None
+    for ms in range(0, PLAYBACK_SECONDS * 1000, VLC_EVENT_INTERVAL):
+        now[0] = ms / 1000
+        if refresh_at is not None and ms >= refresh_at:
+            tracker.take()
+            refresh_at = None
+        woke = tracker.push_time(ms)
+        woke = tracker.push_position(ms / length) or woke
+        if woke:
+            refresh_at = ms + tracker.delay()
+    return tracker
+
+def bench_progress_updates(size):
+    length = size * 100
+    visible = simulate_progress(length, True)
+    hidden = simulate_progress(length, False)
+    return {
+        "video_length_seconds": length // 1000,
+        "playback_seconds": PLAYBACK_SECONDS,
+        "legacy_timer_wakeups_estimated": PLAYBACK_SECONDS * 1000 // LEGACY_TIMER_INTERVAL,
+        "vlc_events": visible.events_received,
+        "visible_refreshes": visible.refreshes,
+        "hidden_refreshes": hidden.refreshes,
+    }
+
+def make_state_actions(count, playlist_size):
+    state = PlayerState('stopped', False, True, 'clip_000000.mp4', 100, False, 'one', True)
+    for i in range(count):
+        kind = i % 5
+        if kind == 0:
+            state = state._replace(playback='playing', is_paused=False, video_name=f"clip_{i % playlist_size:06d}.mp4")
+        elif kind == 1:
+            state = state._replace(volume=max(0, state.volume - 5))
+        elif kind == 2:
+            state = state._replace(playback='paused', is_paused=True)
+        elif kind == 3:
+            state = state._replace(is_muted=not state.is_muted)
+        else:
+            state = state._replace(repeat_mode='all' if state.repeat_mode == 'one' else 'one')
+        yield state
+
+def bench_state_propagation(size):
+    store = StateStore()
+    updates = [0]
+    def counter(state, changed):
+        updates[0] += len(changed)
+    store.subscribe(('playback', 'has_playlist'), counter)
+    store.subscribe(('playback', 'has_playlist', 'fullscreen_enabled'), counter)
+    store.subscribe(('is_paused', 'is_muted', 'volume', 'repeat_mode', 'video_name'), counter)
+    def run():
+        for state in make_state_actions(STATE_ACTIONS, size):
+            for _ in range(PUBLISHES_PER_ACTION):
+                store.publish(state)
+    seconds, _ = timed(run)
+    legacy_updates = STATE_ACTIONS * PUBLISHES_PER_ACTION * sum(LEGACY_WIDGET_SETS.values())
+    return {
+        "actions": STATE_ACTIONS,
+        "legacy_widget_updates_estimated": legacy_updates,
+        "widget_updates": updates[0],
+        "deliveries": store.deliveries,
+        "publish_seconds": seconds,
+    }
+
+def legacy_audio_polls(ready_ms, horizon_ms):
+    polls = 0
+    applied_at = None
+    for _ in range(AUDIO_REQUESTS_PER_START):
+        at = LEGACY_AUDIO_DELAY
+        while at <= horizon_ms:
+            polls += 1
+            if ready_ms is not None and at >= ready_ms:
+                applied_at = at if applied_at is None else min(applied_at, at)
+                break
+            at += LEGACY_AUDIO_POLL
+    return polls, applied_at
+
+def bench_audio_apply(size):
+    starts = size // 1000
+    now = [0.0]
+    ready = [False]
+    applies = [0]
+    applier = AudioApplier(lambda: applies.__setitem__(0, applies[0] + 1), lambda: ready[0], clock=lambda: now[0])
+    for _ in range(starts):
+        now[0] += 10
+        ready[0] = False
+        for _ in range(AUDIO_REQUESTS_PER_START):
+            applier.request()
+        now[0] += AUDIO_READY_MS / 1000
+        ready[0] = True
+        applier.notify_ready()
+    now[0] += 10
+    ready[0] = False
+    applier.request()
+    now[0] += applier.timeout
+    applier.expire()
+    legacy_polls, legacy_applied_at = legacy_audio_polls(AUDIO_READY_MS, BROKEN_FILE_SECONDS * 1000)
+    broken_polls, _ = legacy_audio_polls(None, BROKEN_FILE_SECONDS * 1000)
+    return {
+        "playback_starts": starts,
+        "legacy_polls_per_start_estimated": legacy_polls,
+        "legacy_applies_per_start_estimated": AUDIO_REQUESTS_PER_START,
+        "legacy_latency_ms_estimated": legacy_applied_at,
+        "legacy_polls_broken_file_per_minute_estimated": broken_polls,
+        "applies": applies[0],
+        "deduplicated": applier.deduplicated,
+        "timeouts": applier.timeouts,
+        "latency_ms": round(max(applier.latencies) * 1000),
+    }
+
+def bench_event_bridge(size):
+    wake = threading.Event()
+    bridge = EventBridge(wake.set)
+    handled = {'progress': 0, 'playing': 0}
+    bridge.register('progress', lambda payload: handled.__setitem__('progress', handled['progress'] + 1), coalesce=True)
+    bridge.register('playing', lambda payload: handled.__setitem__('playing', handled['playing'] + 1))
+    done = threading.Event()
+    def consume():
+        while True:
+            wake.wait()
+            wake.clear()
+            bridge.drain()
+            if done.is_set() and not bridge._queue:
+                return
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    def produce():
+        for i in range(size):
+            bridge.post('progress', i)
+            if i % 1000 == 0:
+                bridge.post('playing')
+    seconds, _ = timed(produce)
+    done.set()
+    wake.set()
+    consumer.join()
+    bridge.drain()
+    if handled['playing'] != (size + 999) // 1000:
+        raise AssertionError("bridge dropped a non-coalesced event")
+    return {
+        "posted": bridge.posted,
+        "post_seconds": seconds,
+        "wakeups": bridge.wakeups,
+        "progress_handled": handled['progress'],
+        "coalesced": bridge.coalesced,
+        "progress_latency_ms": {str(bound): count for bound, count in bridge.histogram('progress').items() if count},
+    }
+
+def bench_playback_core(size):
+    backend = FakeBackend(default_duration=TRACK_LENGTH)
+    core = PlaybackCore(backend)
+    events = []
+    backend.set_listener(lambda kind, payload: events.append(kind))
+    playlist = make_paths(size)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        writer = ConfigWriter(os.path.join(temp_dir, 'config.json'), os.path.join(temp_dir, 'playlist.json'), delay=0.05)
+        core.on_change = lambda: writer.save(core.snapshot(), core.playlist)
+        load_seconds, _ = timed(core.set_playlist, PlaylistModel(playlist))
+        def switch():
+            for i in range(TRACK_SWITCHES):
+                if i % 3:
+                    core.play_next()
+                else:
+                    core.play_previous()
+                core.handle_playing()
+        switch_seconds, _ = timed(switch)
+        core.set_repeat_mode('all')
+        start = core.current_index
+        cycle_seconds, _ = timed(backend.advance, TRACK_SWITCHES * TRACK_LENGTH)
+        if core.handle_playing() != (start + TRACK_SWITCHES) % size:
+            raise AssertionError("repeat all cycling mismatch")
+        core.set_repeat_mode('one')
+        backend.advance(10 * TRACK_LENGTH)
+        if core.handle_playing() != (start + TRACK_SWITCHES) % size:
+            raise AssertionError("repeat one moved to another track")
+        for transition, expected in ((core.pause, STATE_PAUSED), (core.resume, STATE_PLAYING), (core.stop, STATE_STOPPED)):
+            transition()
+            writer.flush()
+            state, entries, _ = read_config(writer.path, writer.playlist_path)
+            if state['playback_state'] != expected:
+                raise AssertionError(f"{transition.__name__} was not persisted")
+        writer.close()
+        state, entries, _ = read_config(writer.path, writer.playlist_path)
+        if state != core.snapshot() or len(entries) != size:
+            raise AssertionError("persisted state mismatch")
+    return {
+        "load_seconds": load_seconds,
+        "switches": TRACK_SWITCHES,
+        "switch_seconds": switch_seconds,
+        "repeat_all_tracks": TRACK_SWITCHES,
+        "repeat_all_seconds": cycle_seconds,
+        "backend_events": len(events),
+        "saves_requested": writer.writes_requested,
+        "saves_written": writer.writes_performed,
+    }
+
+def bench_shuffle_move(size):
+    model = PlaylistModel(make_paths(size))
+    probe = model[size // 2]
+    def move_steps():
+        row = size // 2
+        for i in range(MOVE_STEPS):
+            target = row - 1 if i % 2 else row + 1
+            model.move(row, target)
+            row = target
+            if model.find(probe) is None:
+                raise AssertionError("moved row lost from index")
+    def far_moves():
+        for i in range(FAR_MOVES):
+            model.move(0, size - 1)
+            model.find(probe)
+    def shuffle():
+        model.shuffle()
+        return model.find(probe)
+    step_seconds, _ = timed(move_steps)
+    far_seconds, _ = timed(far_moves)
+    shuffle_seconds, index = timed(shuffle)
+    if model[index] != probe:
+        raise AssertionError("index stale after shuffle")
+    return {
+        "adjacent_moves": MOVE_STEPS,
+        "adjacent_move_seconds": step_seconds / MOVE_STEPS,
+        "far_moves": FAR_MOVES,
+        "far_move_seconds": far_seconds / FAR_MOVES,
+        "shuffle_seconds": shuffle_seconds,
+    }
+
+def bench_track_switch(size):
+    playlist = make_paths(size)
+    result = {"switches": MANUAL_SWITCHES * 2}
+    for label, prefetch in (("cold", False), ("prefetch", True)):
+        backend = FakeBackend(default_duration=TRACK_LENGTH, cold_open=COLD_OPEN_MS, warm_open=WARM_OPEN_MS)
+        if not prefetch:
+            backend.prefetch = lambda indices, upcoming: None
+        core = PlaybackCore(backend)
+        backend.set_listener(lambda kind, payload: core.handle_playing() if kind == 'playing' else None)
+        core.set_playlist(PlaylistModel(playlist))
+        core.set_repeat_mode('all')
+        core.play_index(0)
+        def switch():
+            for i in range(MANUAL_SWITCHES):
+                if i % 4:
+                    core.play_next()
+                else:
+                    core.play_previous()
+        seconds, _ = timed(switch)
+        backend.advance(MANUAL_SWITCHES * (TRACK_LENGTH + COLD_OPEN_MS))
+        core.playlist.add(make_paths(1, start=size)[0])
+        core.sync_playlist()
+        prefetcher = backend.prefetcher
+        latencies = prefetcher.warm_latencies + prefetcher.cold_latencies
+        if len(latencies) < MANUAL_SWITCHES * 2:
+            raise AssertionError("track switches not recorded")
+        if backend.handed != backend.released + len(prefetcher.prepared):
+            raise AssertionError(f"{backend.handed - backend.released - len(prefetcher.prepared)} pre-parsed media leaked")
+        result[f"{label}_switch_seconds"] = seconds
+        result[f"{label}_mean_first_frame_ms"] = sum(latencies) * 1000 / len(latencies)
+        result[f"{label}_prefetch_hits"] = prefetcher.hits
+        result[f"{label}_prefetch_misses"] = prefetcher.misses
+        result[f"{label}_parsed"] = prefetcher.parsed
+        result[f"{label}_discarded"] = prefetcher.discarded
+    return result
+
+def bench_metadata_probe(size):
+    def probe(path):
+        time.sleep(PROBE_SECONDS)
+        if path.endswith('0.mp4'):
+            raise ValueError("unsupported codec")
+        return {'duration': 1000 + len(path), 'video_codec': 'h264', 'width': 1920, 'height': 1080}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        playlist = [os.path.join(temp_dir, path[3:]) for path in make_paths(size)]
+        for path in playlist:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, 'wb').close()
+        cache_file = os.path.join(temp_dir, 'media.json')
+        prober = MetadataProber(probe, cache_file)
+        cold_seconds, results = timed(prober.probe_now, playlist)
+        prober.shutdown()
+        for path in playlist[:TOUCHED_FILES]:
+            with open(path, 'ab') as f:
+                f.write(b'x')
+        warm = MetadataProber(probe, cache_file)
+        warm_seconds, _ = timed(warm.probe_now, playlist)
+        delivered = []
+        session_seconds, _ = timed(warm.probe_paths, playlist, delivered.append)
+        warm.shutdown()
+        total, known = warm.total_duration(playlist)
+        unplayable = sum(1 for info in results.values() if info and info.get('error'))
+        if warm.probed != TOUCHED_FILES or warm.reused != size - TOUCHED_FILES or known != size - unplayable or delivered:
+            raise AssertionError("metadata cache mismatch")
+        attempts = {}
+        def flaky_probe(path):
+            attempts[path] = attempts.get(path, 0) + 1
+            if path.endswith('5.mp4') and attempts[path] == 1:
+                raise TimeoutError("Parse timeout")
+            return probe(path)
+        overlap_paths = playlist[:OVERLAP_PATHS]
+        timeouts = sum(1 for path in overlap_paths if path.endswith('5.mp4'))
+        overlap = MetadataProber(flaky_probe)
+        overlapped = set()
+        def wait_for(count):
+            deadline = time.monotonic() + OVERLAP_TIMEOUT
+            while len(overlapped) < count and time.monotonic() < deadline:
+                time.sleep(0.01)
+            return len(overlapped)
+        overlap.probe_paths(overlap_paths[:-1], overlapped.update)
+        time.sleep(PROBE_SECONDS * PROBE_CHUNK)
+        overlap.probe_paths(overlap_paths[-1:], overlapped.update)
+        first_pass = wait_for(len(overlap_paths) - timeouts)
+        overlap.probe_paths(overlap_paths, overlapped.update)
+        second_pass = wait_for(len(overlap_paths))
+        overlap.shutdown()
+        if first_pass != len(overlap_paths) - timeouts or second_pass != len(overlap_paths) or overlap.timed_out != timeouts:
+            raise AssertionError("overlapping probes dropped paths or kept timeouts")
+    return {
+        "serial_probe_seconds_estimated": size * PROBE_SECONDS,
+        "cold_seconds": cold_seconds,
+        "warm_seconds": warm_seconds,
+        "session_recheck_seconds": session_seconds,
+        "reprobed": warm.probed,
+        "unplayable": unplayable,
+        "total_duration_ms": total,
+        "overlap_delivered": second_pass,
+        "overlap_timeouts_retried": timeouts,
+    }
+
+def bench_thumbnails(size):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        playlist = [os.path.join(temp_dir, path[3:]) for path in make_paths(size)]
+        step = max(VISIBLE_ROWS, size // SCROLL_SCREENS)
+        screens = [playlist[start:start + VISIBLE_ROWS] for start in range(0, size, step)][:SCROLL_SCREENS]
+        for path in (path for screen in screens for path in screen):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, 'wb').close()
+        source = StubFrameSource(FRAME_SECONDS)
+        cache = ThumbnailCache(os.path.join(temp_dir, 'thumbnails'))
+        service = ThumbnailService(source, cache, max_pending=VISIBLE_ROWS * 2)
+        done = threading.Condition()
+        delivered = []
+        def deliver(path, file):
+            with done:
+                delivered.append(path)
+                done.notify_all()
+        def scroll(rows):
+            request_seconds = 0.0
+            for screen in rows:
+                expected = len(delivered) + len(screen)
+                seconds, _ = timed(lambda: [service.request(path, deliver) for path in screen])
+                request_seconds += seconds
+                with done:
+                    done.wait_for(lambda: len(delivered) >= expected, timeout=30)
+            return request_seconds
+        first_seconds, request_seconds = timed(scroll, screens)
+        cache.set_quota(cache.total * THUMBNAIL_QUOTA_ROWS // len(delivered))
+        generated = source.calls
+        revisit = screens[-THUMBNAIL_QUOTA_ROWS // VISIBLE_ROWS // 2:]
+        hits_before = cache.hits
+        revisit_seconds, _ = timed(scroll, revisit)
+        service.close()
+        if source.calls != generated or cache.hits - hits_before != sum(len(screen) for screen in revisit):
+            raise AssertionError("revisited thumbnails were regenerated")
+        if cache.total > cache.quota:
+            raise AssertionError("thumbnail cache exceeded its quota")
+        disk_bytes = sum(entry.stat().st_size for entry in os.scandir(cache.cache_dir))
+    return {
+        "rows_shown": sum(len(screen) for screen in screens),
+        "eager_seconds_estimated": size * FRAME_SECONDS,
+        "lazy_seconds": first_seconds,
+        "gui_request_seconds": request_seconds,
+        "frames_decoded": generated,
+        "revisit_seconds": revisit_seconds,
+        "cache_quota_bytes": cache.quota,
+        "cache_disk_bytes": disk_bytes,
+        "evictions": cache.evictions,
+    }
+
+class ReleaseServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, release):
+        super().__init__(('127.0.0.1', 0), ReleaseHandler)
+        self.body = json.dumps(release).encode('utf-8')
+        self.etag = f'"{hash(self.body) & 0xFFFFFFFF:08x}"'
+        self.failing = False
+        self.hits = 0
+        self.bytes_sent = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/repos/kakao90g/ldb_player/releases/latest"
+
+class ReleaseHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.hits += 1
+        time.sleep(RELEASE_LATENCY)
+        if server.failing:
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        elif self.headers.get('If-None-Match') == server.etag:
+            self.send_response(304)
+            self.send_header('ETag', server.etag)
+            self.end_headers()
+        else:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(server.body)))
+            self.send_header('ETag', server.etag)
+            self.end_headers()
+            self.wfile.write(server.body)
+            server.bytes_sent += len(server.body)
+
+    def log_message(self, format, *args):
+        pass
+
+def bench_update_check(size):
+    release = {'tag_name': 'v1.2.0', 'html_url': 'https://example.invalid/release',
+               'assets': [{'name': f'asset_{i}.bin', 'size': i} for i in range(size // 100)]}
+    server = ReleaseServer(release)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    now = [1000.0]
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            checker = UpdateChecker('1.0.0', os.path.join(temp_dir, 'update.json'), url=server.url, clock=lambda: now[0])
+            results = []
+            done = threading.Event()
+            def deliver(result):
+                results.append(result)
+                done.set()
+            gui_seconds, _ = timed(checker.check, deliver)
+            done.wait(10)
+            first_bytes = server.bytes_sent
+            conditional_seconds, _ = timed(lambda: [checker.check_now() for _ in range(UPDATE_CHECKS)])
+            restarted = UpdateChecker('1.0.0', checker.cache_file, url=server.url, clock=lambda: now[0])
+            restart_result = restarted.check_now()
+            server.failing = True
+            server.hits = 0
+            delays = []
+            for _ in range(UPDATE_CHECKS):
+                restarted.check_now()
+                retry_at = restarted._state['retry_at']
+                delays.append(retry_at - now[0])
+                now[0] += 1
+                restarted.check_now()
+                now[0] = retry_at
+            failing_hits = server.hits
+            restarted.check_now()
+            server.failing = False
+            blocked = restarted.check_now()
+            forced = restarted.check_now(force=True)
+            recovered = restarted.check_now()
+        if (not results or not results[0]['newer'] or checker.not_modified != UPDATE_CHECKS
+                or restarted.not_modified != 3 or not restart_result['newer'] or recovered['error']
+                or not blocked['error'] or forced['error'] or not forced['newer']):
+            raise AssertionError("update check mismatch")
+    finally:
+        server.shutdown()
+        server.server_close()
+    return {
+        "release_bytes": len(server.body),
+        "blocking_seconds_estimated": RELEASE_LATENCY,
+        "gui_call_seconds": gui_seconds,
+        "conditional_checks": UPDATE_CHECKS,
+        "conditional_seconds": conditional_seconds / UPDATE_CHECKS,
+        "bytes_first_check": first_bytes,
+        "bytes_conditional_checks": server.bytes_sent - first_bytes,
+        "failing_attempts": UPDATE_CHECKS * 2,
+        "failing_requests_sent": failing_hits,
+        "backoff_delays": delays,
+    }
+
+class FileServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, payload):
+        super().__init__(('127.0.0.1', 0), FileHandler)
+        self.payload = payload
+        self.files = {}
+        self.etag = f'"{hashlib.sha256(payload).hexdigest()[:16]}"'
+        self.drop_after = None
+        self.rate = None
+        self.latency = 0
+        self.bytes_sent = 0
+        self.requests = 0
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/LDBPlayer.exe"
+
+    def reset(self):
+        with self.lock:
+            self.bytes_sent = 0
+            self.requests = 0
+            self.max_active = 0
+
+class FileHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            self.send_payload(server)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def send_payload(self, server):
+        if server.latency:
+            time.sleep(server.latency)
+        if self.path in server.files:
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(server.files[self.path])))
+            self.end_headers()
+            self.wfile.write(server.files[self.path])
+            return
+        if self.path != '/LDBPlayer.exe':
+            self.send_error(404)
+            return
+        payload = server.payload
+        start = 0
+        end = len(payload) - 1
+        requested = self.headers.get('Range')
+        if requested and self.headers.get('If-Range') in (None, server.etag):
+            first, _, last = requested[len('bytes='):].partition('-')
+            start = int(first)
+            if last:
+                end = min(int(last), end)
+            if start >= len(payload):
+                self.send_response(416)
+                self.send_header('Content-Range', f"bytes */{len(payload)}")
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header('Content-Range', f"bytes {start}-{end}/{len(payload)}")
+        else:
+            self.send_response(200)
+        self.send_header('ETag', server.etag)
+        self.send_header('Content-Length', str(end + 1 - start))
+        self.end_headers()
+        body = payload[start:end + 1]
+        with server.lock:
+            if server.drop_after is not None and len(body) > server.drop_after:
+                body = body[:server.drop_after]
+                server.drop_after = None
+                self.close_connection = True
+            server.bytes_sent += len(body)
+        if server.rate:
+            for offset in range(0, len(body), LINK_BLOCK):
+                block = body[offset:offset + LINK_BLOCK]
+                self.wfile.write(block)
+                time.sleep(len(block) / server.rate)
+        else:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def bench_download(size):
+    import requests
+    from downloader import download_file, DownloadError
+    payload = os.urandom(size * DOWNLOAD_BYTES_PER_ENTRY)
+    expected = hashlib.sha256(payload).hexdigest()
+    server = FileServer(payload)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            legacy_path = os.path.join(temp_dir, 'legacy.exe')
+            def legacy():
+                response = requests.get(server.url, timeout=30, stream=True)
+                with open(legacy_path, 'wb') as f:
+                    f.write(response.content)
+            tracemalloc.start()
+            legacy_seconds, _ = timed(legacy)
+            legacy_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            path = os.path.join(temp_dir, 'LDBPlayer.exe')
+            updates = []
+            tracemalloc.start()
+            stream_seconds, sha256 = timed(download_file, server.url, path, None, expected, lambda done, total: updates.append(done))
+            stream_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            os.remove(path)
+            server.reset()
+            server.drop_after = len(payload) * 3 // 4
+            resume_seconds, resumed_sha256 = timed(download_file, server.url, path, None, expected)
+            resume_requests = server.requests
+            resume_bytes = server.bytes_sent
+            with open(path, 'rb') as f:
+                intact = f.read() == payload
+            os.remove(path)
+            try:
+                download_file(server.url, path, expected_sha256='0' * 64)
+                rejected = False
+            except DownloadError:
+                rejected = not os.path.exists(path) and not os.path.exists(f"{path}.part")
+        if sha256 != expected or resumed_sha256 != expected or not intact or not rejected or updates[-1] != len(payload):
+            raise AssertionError("download verification mismatch")
+    finally:
+        server.shutdown()
+        server.server_close()
+    return {
+        "payload_bytes": len(payload),
+        "legacy_seconds": legacy_seconds,
+        "legacy_peak_bytes": legacy_peak,
+        "stream_seconds": stream_seconds,
+        "stream_peak_bytes": stream_peak,
+        "progress_updates": len(updates),
+        "resume_seconds": resume_seconds,
+        "resume_requests": resume_requests,
+        "resume_bytes_sent": resume_bytes,
+    }
+
+def bench_segmented_download(size):
+    from downloader import download_file, download_segmented, MIN_SEGMENT_SIZE
+    payload = os.urandom(size * DOWNLOAD_BYTES_PER_ENTRY)
+    expected = hashlib.sha256(payload).hexdigest()
+    server = FileServer(payload)
+    server.rate = LINK_RATE
+    server.latency = LINK_LATENCY
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'LDBPlayer.exe')
+            single_seconds, single_sha256 = timed(download_file, server.url, path, None, expected)
+            os.remove(path)
+            server.reset()
+            segmented_seconds, segmented_sha256 = timed(download_segmented, server.url, path, None, expected)
+            segmented_requests = server.requests
+            segmented_connections = server.max_active
+            os.remove(path)
+            server.reset()
+            server.drop_after = MIN_SEGMENT_SIZE // 2
+            retry_seconds, retry_sha256 = timed(download_segmented, server.url, path, None, expected)
+            retry_requests = server.requests
+            retry_bytes = server.bytes_sent
+            with open(path, 'rb') as f:
+                intact = f.read() == payload
+            os.remove(path)
+            server.rate = None
+            server.latency = 0
+            server.reset()
+            unthrottled_seconds, unthrottled_sha256 = timed(download_segmented, server.url, path, None, expected)
+            unthrottled_connections = server.max_active
+        if (single_sha256, segmented_sha256, retry_sha256, unthrottled_sha256) != (expected,) * 4 or not intact:
+            raise AssertionError("segmented download verification mismatch")
+    finally:
+        server.shutdown()
+        server.server_close()
+    return {
+        "payload_bytes": len(payload),
+        "single_seconds": single_seconds,
+        "segmented_seconds": segmented_seconds,
+        "segmented_requests": segmented_requests,
+        "segmented_connections": segmented_connections,
+        "retry_seconds": retry_seconds,
+        "retry_requests": retry_requests,
+        "retry_bytes_sent": retry_bytes,
+        "unthrottled_seconds": unthrottled_seconds,
+        "unthrottled_connections": unthrottled_connections,
+    }
+
+def make_new_release(old):
+    length = len(old)
+    rewrite = length // 2
+    delete = length * 4 // 5
+    return (old[:length // 10] + os.urandom(DELTA_INSERT) + old[length // 10:rewrite]
+            + os.urandom(DELTA_REWRITE) + old[rewrite + DELTA_REWRITE:delete]
+            + old[delete + DELTA_DELETE:] + os.urandom(DELTA_APPEND))
+
+def bench_delta_update(size):
+    from downloader import download_segmented
+    from delta_update import build_block_index, download_delta, match_blocks
+    old = os.urandom(size * DOWNLOAD_BYTES_PER_ENTRY)
+    new = make_new_release(old)
+    expected = hashlib.sha256(new).hexdigest()
+    server = FileServer(new)
+    server.rate = LINK_RATE
+    server.latency = LINK_LATENCY
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            current_path = os.path.join(temp_dir, 'LDBPlayer.exe')
+            new_path = os.path.join(temp_dir, 'LDBPlayer_new.exe')
+            with open(current_path, 'wb') as f:
+                f.write(old)
+            with open(new_path, 'wb') as f:
+                f.write(new)
+            index_seconds, index = timed(build_block_index, new_path)
+            os.remove(new_path)
+            server.files['/LDBPlayer.exe.blocks'] = json.dumps(index).encode('utf-8')
+            match_seconds, found = timed(match_blocks, old, index)
+            full_seconds, full_sha256 = timed(download_segmented, server.url, new_path, None, expected)
+            full_bytes = server.bytes_sent
+            os.remove(new_path)
+            server.reset()
+            delta_seconds, delta = timed(download_delta, server.url, new_path, current_path, None, None, expected)
+            delta_requests = server.requests
+            delta_bytes = server.bytes_sent
+            with open(new_path, 'rb') as f:
+                intact = f.read() == new
+            os.remove(new_path)
+            del server.files['/LDBPlayer.exe.blocks']
+            server.reset()
+            fallback_seconds, fallback = timed(download_delta, server.url, new_path, current_path, None, None, expected)
+            fallback_bytes = server.bytes_sent
+            os.remove(new_path)
+            server.files['/LDBPlayer.exe.blocks'] = json.dumps(index).encode('utf-8')
+            with open(current_path, 'wb') as f:
+                f.write(os.urandom(len(old)))
+            server.reset()
+            unrelated_seconds, unrelated = timed(download_delta, server.url, new_path, current_path, None, None, expected)
+            unrelated_bytes = server.bytes_sent
+        if ((full_sha256, delta['sha256'], fallback['sha256'], unrelated['sha256']) != (expected,) * 4 or not intact
+                or not delta['delta'] or fallback['delta'] or unrelated['saved_bytes']):
+            raise AssertionError("delta update verification mismatch")
+    finally:
+        server.shutdown()
+        server.server_close()
+    return {
+        "payload_bytes": len(new),
+        "blocks": len(index['blocks']),
+        "reused_blocks": len(found),
+        "index_seconds": index_seconds,
+        "match_seconds": match_seconds,
+        "full_seconds": full_seconds,
+        "full_bytes_sent": full_bytes,
+        "delta_seconds": delta_seconds,
+        "delta_requests": delta_requests,
+        "delta_bytes_sent": delta_bytes,
+        "delta_saved_bytes": delta['saved_bytes'],
+        "fallback_seconds": fallback_seconds,
+        "fallback_bytes_sent": fallback_bytes,
+        "unrelated_seconds": unrelated_seconds,
+        "unrelated_bytes_sent": unrelated_bytes,
+        "unrelated_fell_back": not unrelated['delta'],
+    }
+
+def start_fake_player(seconds):
+    player = subprocess.Popen([sys.executable, '-c', f"import time; time.sleep({seconds})"])
+    threading.Thread(target=player.wait, daemon=True).start()
+    return player
+
+def bench_update_handshake(size):
+    results = {"legacy_seconds_estimated": LEGACY_UPDATER_SLEEPS}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        current_exe = os.path.join(temp_dir, 'LDBPlayer.exe')
+        new_exe = os.path.join(temp_dir, 'LDBPlayer_new.exe')
+        for seconds in PLAYER_EXIT_SECONDS:
+            with open(current_exe, 'wb') as f:
+                f.write(b'old')
+            with open(new_exe, 'wb') as f:
+                f.write(b'new')
+            player = start_fake_player(seconds)
+            started = time.perf_counter()
+            exited = wait_for_exit(player.pid)
+            replace_file(new_exe, current_exe)
+            elapsed = time.perf_counter() - started
+            with open(current_exe, 'rb') as f:
+                if not exited or f.read() != b'new':
+                    raise AssertionError("updater handshake mismatch")
+            results[f"player_exit_{int(seconds * 1000)}ms_seconds"] = elapsed
+        player = start_fake_player(HUNG_PLAYER_TIMEOUT * 10)
+        hung_seconds, exited = timed(wait_for_exit, player.pid, HUNG_PLAYER_TIMEOUT)
+        player.kill()
+        if exited:
+            raise AssertionError("updater handshake ignored a running player")
+        results["hung_player_seconds"] = hung_seconds
+    return results
+
+def measure_imports(modules):
+    root = os.path.dirname(os.path.abspath(__file__))
+    code = (IMPORT_STUBS % (PLATFORM_MODULES,) +
+            "preloaded = set(sys.modules)\n"
+            "started = time.perf_counter()\n"
+            f"import {', '.join(modules)}\n"
+            "seconds = time.perf_counter() - started\n"
+            f"loaded = [name for name in {LEGACY_STARTUP_IMPORTS!r} if name in sys.modules and name not in preloaded]\n"
+            "print(json.dumps([seconds, stubbed, loaded]))")
+    best = None
+    for _ in range(IMPORT_RUNS):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=root,
+                                capture_output=True, text=True, check=True)
+        seconds, stubbed, loaded = json.loads(result.stdout)
+        if best is None or seconds < best[0]:
+            best = (seconds, stubbed, loaded, result.stderr)
+    seconds, stubbed, loaded, report = best
+    reported = {name[:-3] for name in os.listdir(root) if name.endswith('.py')}
+    reported.update(LEGACY_STARTUP_IMPORTS + PLATFORM_MODULES)
+    reported.discard('ldb_player')
+    cumulative = {}
+    block = {}
+    for line in report.splitlines():
+        fields = line[len('import time:'):].split('|')
+        if not line.startswith('import time:') or not fields[1].strip().isdigit():
+            continue
+        name = fields[2].strip()
+        block[name] = int(fields[1])
+        if fields[2][1:2] != ' ':
+            if name in modules:
+                cumulative.update(block)
+            block = {}
+    top = sorted(((name, us) for name, us in cumulative.items() if name in reported), key=lambda item: -item[1])[:IMPORT_REPORT_TOP]
+    return seconds, stubbed, loaded, dict(top)
+
+def bench_import_time(size):
+    legacy_seconds, stubbed, legacy_loaded, legacy_top = measure_imports(('ldb_player',) + LEGACY_STARTUP_IMPORTS)
+    startup_seconds, stubbed, startup_loaded, startup_top = measure_imports(('ldb_player',))
+    if startup_loaded:
+        raise AssertionError(f"ldb_player imports {', '.join(startup_loaded)} at startup")
+    return {
+        "stubbed_modules": stubbed,
+        "legacy_seconds": legacy_seconds,
+        "legacy_top_imports_us": legacy_top,
+        "startup_seconds": startup_seconds,
+        "startup_deferred_loaded": startup_loaded,
+        "startup_top_imports_us": startup_top,
+        "budget_seconds": IMPORT_BUDGET,
+        "within_budget": startup_seconds <= IMPORT_BUDGET,
+    }
+
+BENCHMARKS = {
+    "playlist_dedup": bench_playlist_dedup,
+    "media_list_sync": bench_media_list_sync,
+    "playing_lookup": bench_playing_lookup,
+    "config_save": bench_config_save,
+    "saved_playlist_load": bench_saved_playlist_load,
+    "path_validation": bench_path_validation,
+    "playlist_index": bench_playlist_index,
+    "progress_updates": bench_progress_updates,
+    "state_propagation": bench_state_propagation,
+    "audio_apply": bench_audio_apply,
+    "event_bridge": bench_event_bridge,
+    "playback_core": bench_playback_core,
+    "shuffle_move": bench_shuffle_move,
+    "track_switch": bench_track_switch,
+    "metadata_probe": bench_metadata_probe,
+    "thumbnails": bench_thumbnails,
+    "update_check": bench_update_check,
+    "download": bench_download,
+    "segmented_download": bench_segmented_download,
+    "delta_update": bench_delta_update,
+    "update_handshake": bench_update_handshake,
+    "import_time": bench_import_time,
+}
+
+SIZE_INDEPENDENT = {"update_handshake", "import_time"}
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Headless LDB Player benchmarks")
+    parser.add_argument('names', nargs='*', help="benchmarks to run (default: all)")
+    parser.add_argument('--sizes', default=','.join(str(size) for size in SIZES), help="comma-separated playlist sizes")
+    parser.add_argument('--output', help="write JSON results to this file instead of stdout")
+    parser.add_argument('--list', action='store_true', help="list available benchmarks")
+    args = parser.parse_args(argv[1:])
+    if args.list:
+        print('\n'.join(BENCHMARKS))
+        return 0
+    names = args.names or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name}", file=sys.stderr)
+            return 1
+    try:
+        sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    except ValueError:
+        print(f"Invalid sizes: {args.sizes}", file=sys.stderr)
+        return 1
+    results = []
+    curves = {}
+    for name in names:
+        for size in [None] if name in SIZE_INDEPENDENT else sizes:
+            result = {"benchmark": name, "size": size}
+            result.update(BENCHMARKS[name](size))
+            results.append(result)
+            for key, value in result.items():
+                if size is not None and key.endswith('_seconds') and isinstance(value, float):
+                    curves.setdefault(name, {}).setdefault(key, {})[str(size)] = value
+    report = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "created": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "sizes": sizes,
+        "results": results,
+        "curves": curves,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,162 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+
+PLAYLIST_DOCUMENT_VERSION = 1
+
+def write_json_atomic(path, data):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+def playlist_hash(entries):
+    digest = hashlib.sha1()
+    for entry in entries:
+        digest.update(entry.encode('utf-8', 'surrogatepass'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def write_playlist_document(path, entries, digest=None):
+    if digest is None:
+        digest = playlist_hash(entries)
+    write_json_atomic(path, {'version': PLAYLIST_DOCUMENT_VERSION, 'hash': digest, 'entries': entries})
+    return digest
+
+def read_playlist_document(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            document = json.load(f)
+    except FileNotFoundError:
+        return [], None
+    except json.JSONDecodeError as e:
+        logging.error(f"Failed to read playlist document: {e}")
+        return [], None
+    if not isinstance(document, dict) or document.get('version', 0) > PLAYLIST_DOCUMENT_VERSION:
+        logging.error(f"Unsupported playlist document: {path}")
+        return [], None
+    return document.get('entries', []), document.get('hash')
+
+def read_config(config_file, playlist_file):
+    with open(config_file, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    if 'playlist' in state:
+        entries = state.pop('playlist')
+        digest = write_playlist_document(playlist_file, entries)
+        write_json_atomic(config_file, state)
+        return state, entries, digest
+    entries, digest = read_playlist_document(playlist_file)
+    return state, entries, digest
+
+class ConfigWriter:
+    def __init__(self, path, playlist_path, delay=0.5):
+        self.path = path
+        self.playlist_path = playlist_path
+        self.delay = delay
+        self.playlist_hash = None
+        self.writes_requested = 0
+        self.writes_performed = 0
+        self.playlist_writes = 0
+        self._pending = None
+        self._pending_playlist = None
+        self._pending_source = None
+        self._written_source = None
+        self._dirty_since = 0.0
+        self._writing = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="ConfigWriter", daemon=True)
+        self._thread.start()
+
+    def save(self, state, playlist=None):
+        entries = None
+        if playlist is not None and not self._playlist_current(playlist):
+            entries = playlist.to_list()
+        with self._condition:
+            self.writes_requested += 1
+            if entries is not None:
+                self._pending_playlist = entries
+                self._pending_source = (playlist, playlist.revision)
+            if self._closed:
+                self._take_and_write(state)
+                return
+            if self._pending is None:
+                self._dirty_since = time.monotonic()
+            self._pending = state
+            self._condition.notify_all()
+
+    def flush(self):
+        with self._condition:
+            while self._writing:
+                self._condition.wait()
+            if self._pending is not None:
+                self._take_and_write(self._pending)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self.flush()
+
+    def _playlist_current(self, playlist):
+        for source in (self._pending_source, self._written_source):
+            if source is not None and source[0] is playlist and source[1] == playlist.revision:
+                return True
+        return False
+
+    def _take_and_write(self, state):
+        entries = self._pending_playlist
+        source = self._pending_source
+        self._pending = None
+        self._pending_playlist = None
+        self._pending_source = None
+        self._write(state, entries, source)
+
+    def _run(self):
+        with self._condition:
+            while True:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                remaining = self._dirty_since + self.delay - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+                state = self._pending
+                entries = self._pending_playlist
+                source = self._pending_source
+                self._pending = None
+                self._pending_playlist = None
+                self._pending_source = None
+                self._writing = True
+                self._condition.release()
+                try:
+                    self._write(state, entries, source)
+                finally:
+                    self._condition.acquire()
+                    self._writing = False
+                    self._condition.notify_all()
+
+    def _write(self, state, entries, source=None):
+        try:
+            if entries is not None:
+                digest = playlist_hash(entries)
+                if digest != self.playlist_hash:
+                    write_playlist_document(self.playlist_path, entries, digest)
+                    self.playlist_hash = digest
+                    self.playlist_writes += 1
+                self._written_source = source
+        except Exception as e:
+            logging.error(f"Failed to write playlist: {e}")
+        try:
+            write_json_atomic(self.path, state)
+            self.writes_performed += 1
+        except Exception as e:
+            logging.error(f"Failed to write config: {e}")
@@ -0,0 +1,188 @@
+import os
+import sys
+import mmap
+import bisect
+import hashlib
+import logging
+import itertools
+
+import requests
+
+from config_store import write_json_atomic
+from downloader import (USER_AGENT, CHUNK_SIZE, DOWNLOAD_RETRIES, MAX_CONNECTIONS, DownloadError, SegmentedDownload,
+                        download_segmented, finish_partial, hash_partial, pooled_session, probe_ranges)
+
+BLOCK_INDEX_VERSION = 1
+DELTA_BLOCK_SIZE = 16 * 1024
+DELTA_MERGE_GAP = 64 * 1024
+DELTA_PROBE_BYTES = 1024 * 1024
+DELTA_MIN_MATCH = 0.1
+INDEX_SUFFIX = ".blocks"
+
+def weak_checksum(block):
+    return sum(block) & 0xFFFF, sum(itertools.accumulate(block)) & 0xFFFF
+
+def strong_checksum(block):
+    return hashlib.blake2b(block, digest_size=8).hexdigest()
+
+def build_block_index(path, block_size=DELTA_BLOCK_SIZE):
+    blocks = []
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+            size += len(block)
+            a, b = weak_checksum(block)
+            blocks.append([a | b << 16, strong_checksum(block)])
+    return {
+        'version': BLOCK_INDEX_VERSION,
+        'size': size,
+        'block_size': block_size,
+        'sha256': digest.hexdigest(),
+        'blocks': blocks,
+    }
+
+def write_block_index(path, index_path=None, block_size=DELTA_BLOCK_SIZE):
+    index = build_block_index(path, block_size)
+    write_json_atomic(index_path or path + INDEX_SUFFIX, index)
+    return index
+
+def match_blocks(data, index, probe_bytes=DELTA_PROBE_BYTES, min_match=DELTA_MIN_MATCH):
+    block_size = index['block_size']
+    blocks = index['blocks']
+    size = index['size']
+    full_blocks = size // block_size
+    length = len(data)
+    found = {}
+    aligned = []
+    for i in range(min(full_blocks, length // block_size)):
+        start = i * block_size
+        if strong_checksum(data[start:start + block_size]) == blocks[i][1]:
+            found[i] = start
+            aligned.append(start)
+    if full_blocks < len(blocks):
+        tail = size - full_blocks * block_size
+        if length >= tail and strong_checksum(data[length - tail:]) == blocks[full_blocks][1]:
+            found[full_blocks] = length - tail
+    candidates = {}
+    for i in range(full_blocks):
+        if i not in found:
+            candidates.setdefault(blocks[i][0], []).append(i)
+    matched = 0
+    checkpoint = probe_bytes
+    pos = 0
+    while pos + block_size <= length and len(found) < len(blocks):
+        k = bisect.bisect_left(aligned, pos)
+        if k < len(aligned) and aligned[k] == pos:
+            matched += block_size
+            pos += block_size
+            continue
+        stop = aligned[k] if k < len(aligned) else length
+        a, b = weak_checksum(data[pos:pos + block_size])
+        while True:
+            if pos >= checkpoint:
+                if matched < min_match * pos:
+                    raise DownloadError(f"Only {matched} of the first {pos} local bytes match the new release")
+                checkpoint = length
+            indices = candidates.get(a | b << 16)
+            if indices is not None:
+                strong = strong_checksum(data[pos:pos + block_size])
+                hits = [i for i in indices if blocks[i][1] == strong]
+                if hits:
+                    for i in hits:
+                        found.setdefault(i, pos)
+                    matched += block_size
+                    pos += block_size
+                    break
+            if pos + block_size >= length:
+                pos = length
+                break
+            if pos + 1 == stop:
+                pos = stop
+                break
+            out = data[pos]
+            a = (a - out + data[pos + block_size]) & 0xFFFF
+            b = (b - block_size * out + a) & 0xFFFF
+            pos += 1
+    return found
+
+def missing_ranges(found, count, block_size, size, merge_gap=DELTA_MERGE_GAP):
+    ranges = []
+    for i in range(count):
+        if i in found:
+            continue
+        start = i * block_size
+        end = min(start + block_size, size) - 1
+        if ranges and start - ranges[-1][1] - 1 <= merge_gap:
+            ranges[-1][1] = end
+        else:
+            ranges.append([start, end])
+    return [(start, end) for start, end in ranges]
+
+def download_delta(url, path, local_path, index_url=None, session=None, expected_sha256=None, progress=None,
+                   max_connections=MAX_CONNECTIONS, timeout=30, retries=DOWNLOAD_RETRIES):
+    partial_path = f"{path}.part"
+    own_session = session is None
+    if own_session:
+        session = pooled_session(max_connections)
+    try:
+        try:
+            return delta_to_partial(session, url, index_url or url + INDEX_SUFFIX, path, local_path,
+                                    expected_sha256, progress, max_connections, timeout, retries)
+        except (requests.RequestException, DownloadError, OSError, ValueError, KeyError, TypeError) as e:
+            logging.error(f"Delta update unavailable, downloading the full file: {e}")
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        sha256 = download_segmented(url, path, session, expected_sha256, progress, max_connections,
+                                    timeout=timeout, retries=retries)
+        size = os.path.getsize(path)
+        return {'sha256': sha256, 'size': size, 'downloaded_bytes': size, 'saved_bytes': 0, 'delta': False}
+    finally:
+        if own_session:
+            session.close()
+
+def delta_to_partial(session, url, index_url, path, local_path, expected_sha256, progress, max_connections, timeout, retries):
+    partial_path = f"{path}.part"
+    response = session.get(index_url, headers={"User-Agent": USER_AGENT}, timeout=timeout)
+    response.raise_for_status()
+    index = response.json()
+    downloaded = len(response.content)
+    if index.get('version') != BLOCK_INDEX_VERSION:
+        raise DownloadError(f"Unsupported block index version: {index.get('version')}")
+    size = index['size']
+    block_size = index['block_size']
+    if block_size <= 0 or len(index['blocks']) != -(-size // block_size):
+        raise DownloadError("Block index is inconsistent")
+    remote_size, validator = probe_ranges(session, url, timeout)
+    downloaded += 1
+    if remote_size != size:
+        raise DownloadError("Block index does not match the remote file")
+    with open(local_path, 'rb') as local, mmap.mmap(local.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        found = match_blocks(data, index)
+        with open(partial_path, 'wb') as f:
+            f.truncate(size)
+            for i, offset in sorted(found.items()):
+                f.seek(i * block_size)
+                f.write(data[offset:offset + min(block_size, size - i * block_size)])
+    ranges = missing_ranges(found, len(index['blocks']), block_size, size)
+    if ranges:
+        download = SegmentedDownload(session, url, partial_path, size, validator, progress, max_connections,
+                                     timeout=timeout, retries=retries, ranges=ranges)
+        download.run()
+        downloaded += download.done
+    sha256 = hash_partial(partial_path, CHUNK_SIZE).hexdigest()
+    if sha256 != index['sha256'] or (expected_sha256 and sha256 != expected_sha256.lower()):
+        raise DownloadError(f"Reassembled {os.path.basename(path)} failed verification")
+    finish_partial(partial_path, path, sha256, expected_sha256)
+    saved = max(0, size - downloaded)
+    logging.info(f"Delta update reused {len(found)} of {len(index['blocks'])} blocks from {os.path.basename(local_path)}, "
+                 f"downloaded {downloaded} bytes and saved {saved} of {size} bytes.")
+    return {'sha256': sha256, 'size': size, 'downloaded_bytes': downloaded, 'saved_bytes': saved, 'delta': True}
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(f"Usage: {sys.argv[0]} LDBPlayer.exe", file=sys.stderr)
+        sys.exit(1)
+    index = write_block_index(sys.argv[1])
+    print(f"Wrote {sys.argv[1]}{INDEX_SUFFIX}: {len(index['blocks'])} blocks of {index['block_size']} bytes.")
@@ -0,0 +1,322 @@
+import os
+import re
+import time
+import hashlib
+import logging
+import threading
+import collections
+
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = "Mozilla/5.0"
+CHUNK_SIZE = 256 * 1024
+DOWNLOAD_RETRIES = 3
+MIN_SEGMENT_SIZE = 1024 * 1024
+MAX_CONNECTIONS = 8
+INITIAL_CONNECTIONS = 2
+CONNECTION_GAIN = 1.25
+CONTENT_RANGE = re.compile(r'bytes (\d+)-(\d+)/(\d+|\*)')
+
+class DownloadError(Exception):
+    pass
+
+def asset_sha256(release, name):
+    for asset in (release or {}).get('assets', []):
+        digest = asset.get('digest') or ''
+        if asset.get('name') == name and digest.startswith('sha256:'):
+            return digest[len('sha256:'):]
+    return None
+
+def logging_progress(name, step=10):
+    reported = [-step]
+    def progress(done, total):
+        if not total:
+            return
+        percent = done * 100 // total
+        if percent >= reported[0] + step or done == total:
+            reported[0] = percent
+            logging.info(f"Downloading {name}: {percent}% ({done}/{total} bytes)")
+    return progress
+
+def hash_partial(path, chunk_size=CHUNK_SIZE):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest
+
+def download_file(url, path, session=None, expected_sha256=None, progress=None,
+                  chunk_size=CHUNK_SIZE, timeout=30, retries=DOWNLOAD_RETRIES):
+    partial_path = f"{path}.part"
+    own_session = session is None
+    if own_session:
+        session = requests.Session()
+    try:
+        attempt = 0
+        while True:
+            try:
+                digest = download_to_partial(session, url, partial_path, progress, chunk_size, timeout)
+                break
+            except (requests.RequestException, DownloadError) as e:
+                attempt += 1
+                if attempt > retries:
+                    raise
+                logging.error(f"Download interrupted, resuming ({attempt}/{retries}): {e}")
+    finally:
+        if own_session:
+            session.close()
+    return finish_partial(partial_path, path, digest.hexdigest(), expected_sha256)
+
+def finish_partial(partial_path, path, sha256, expected_sha256):
+    if expected_sha256 and sha256 != expected_sha256.lower():
+        os.remove(partial_path)
+        raise DownloadError(f"SHA-256 mismatch for {os.path.basename(path)}: expected {expected_sha256}, got {sha256}")
+    os.replace(partial_path, path)
+    if os.path.exists(f"{partial_path}.validator"):
+        os.remove(f"{partial_path}.validator")
+    return sha256
+
+def read_validator(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def download_to_partial(session, url, partial_path, progress, chunk_size, timeout):
+    validator_path = f"{partial_path}.validator"
+    offset = os.path.getsize(partial_path) if os.path.exists(partial_path) else 0
+    validator = read_validator(validator_path) if offset else None
+    headers = {"User-Agent": USER_AGENT}
+    if validator:
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = validator
+    else:
+        offset = 0
+    with session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+        if response.status_code == 416:
+            total = response.headers.get('Content-Range', '').rpartition('/')[2]
+            if offset and total.isdigit() and int(total) == offset:
+                return hash_partial(partial_path, chunk_size)
+            os.remove(partial_path)
+            raise DownloadError("Partial download does not match the remote file")
+        response.raise_for_status()
+        total = None
+        if response.status_code == 206:
+            match = CONTENT_RANGE.match(response.headers.get('Content-Range', ''))
+            if not match or int(match.group(1)) != offset:
+                os.remove(partial_path)
+                raise DownloadError("Server returned an unexpected range")
+            if match.group(3) != '*':
+                total = int(match.group(3))
+            digest = hash_partial(partial_path, chunk_size)
+            mode = 'ab'
+        else:
+            offset = 0
+            digest = hashlib.sha256()
+            mode = 'wb'
+            validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+            if validator:
+                with open(validator_path, 'w', encoding='utf-8') as f:
+                    f.write(validator)
+            elif os.path.exists(validator_path):
+                os.remove(validator_path)
+        length = response.headers.get('Content-Length')
+        if total is None and length is not None and length.isdigit():
+            total = offset + int(length)
+        done = offset
+        with open(partial_path, mode) as f:
+            for chunk in response.iter_content(chunk_size):
+                f.write(chunk)
+                digest.update(chunk)
+                done += len(chunk)
+                if progress is not None:
+                    progress(done, total)
+    if total is not None and done != total:
+        raise DownloadError(f"Download incomplete: {done} of {total} bytes")
+    if done == 0:
+        raise DownloadError("Download is empty")
+    return digest
+
+def pooled_session(max_connections=MAX_CONNECTIONS):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=max_connections)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def probe_ranges(session, url, timeout):
+    headers = {"User-Agent": USER_AGENT, "Range": "bytes=0-0"}
+    with session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        match = CONTENT_RANGE.match(response.headers.get('Content-Range', ''))
+        if response.status_code != 206 or not match or match.group(3) == '*':
+            return None, None
+        return int(match.group(3)), response.headers.get('ETag') or response.headers.get('Last-Modified')
+
+def download_segmented(url, path, session=None, expected_sha256=None, progress=None,
+                       max_connections=MAX_CONNECTIONS, segment_size=None, chunk_size=CHUNK_SIZE,
+                       timeout=30, retries=DOWNLOAD_RETRIES):
+    partial_path = f"{path}.part"
+    own_session = session is None
+    if own_session:
+        session = pooled_session(max_connections)
+    try:
+        size = None
+        if max_connections > 1 and not os.path.exists(f"{partial_path}.validator"):
+            try:
+                size, validator = probe_ranges(session, url, timeout)
+            except requests.RequestException as e:
+                logging.error(f"Failed to probe {os.path.basename(path)} for range support: {e}")
+        if size is None or size < 2 * MIN_SEGMENT_SIZE:
+            return download_file(url, path, session, expected_sha256, progress, chunk_size, timeout, retries)
+        download = SegmentedDownload(session, url, partial_path, size, validator, progress,
+                                     max_connections, segment_size, chunk_size, timeout, retries)
+        try:
+            with open(partial_path, 'wb') as f:
+                f.truncate(size)
+            download.run()
+        except (requests.RequestException, DownloadError, OSError) as e:
+            logging.error(f"Segmented download failed, falling back to a single connection: {e}")
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            return download_file(url, path, session, expected_sha256, progress, chunk_size, timeout, retries)
+        logging.info(f"Downloaded {os.path.basename(path)} in {download.segment_count} segments over "
+                     f"{download.connections} connections ({download.retried} retries).")
+        sha256 = hash_partial(partial_path, chunk_size).hexdigest()
+        return finish_partial(partial_path, path, sha256, expected_sha256)
+    finally:
+        if own_session:
+            session.close()
+
+class SegmentedDownload:
+    def __init__(self, session, url, partial_path, size, validator=None, progress=None,
+                 max_connections=MAX_CONNECTIONS, segment_size=None, chunk_size=CHUNK_SIZE,
+                 timeout=30, retries=DOWNLOAD_RETRIES, ranges=None, clock=time.monotonic):
+        self.session = session
+        self.url = url
+        self.partial_path = partial_path
+        self.size = size
+        self.validator = validator
+        self.progress = progress
+        self.max_connections = max_connections
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.retries = retries
+        self.clock = clock
+        if ranges is None:
+            ranges = [(0, size - 1)]
+        self.total = sum(end + 1 - start for start, end in ranges)
+        if segment_size is None:
+            segment_size = max(MIN_SEGMENT_SIZE, self.total // (max_connections * 4))
+        self.segments = collections.deque((offset, min(offset + segment_size - 1, end))
+                                          for start, end in ranges
+                                          for offset in range(start, end + 1, segment_size))
+        self.segment_count = len(self.segments)
+        self.connections = 0
+        self.retried = 0
+        self.done = 0
+        self.error = None
+        self._growing = True
+        self._best_rate = 0.0
+        self._mark = None
+        self._completed = 0
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def run(self):
+        with self._lock:
+            self._mark = (self.clock(), 0, 0)
+            self._start_workers(INITIAL_CONNECTIONS)
+        index = 0
+        while True:
+            with self._lock:
+                if index >= len(self._threads):
+                    break
+                thread = self._threads[index]
+            thread.join()
+            index += 1
+        if self.error is not None:
+            raise self.error
+        if self.done != self.total:
+            raise DownloadError(f"Download incomplete: {self.done} of {self.total} bytes")
+
+    def _start_workers(self, count):
+        count = min(count, self.max_connections - self.connections, len(self.segments))
+        for _ in range(count):
+            thread = threading.Thread(target=self._run, name=f"Download-{len(self._threads)}", daemon=True)
+            self._threads.append(thread)
+            self.connections += 1
+            thread.start()
+
+    def _adapt(self):
+        if not self._growing or self.connections >= self.max_connections or not self.segments:
+            return
+        started, done, completed = self._mark
+        if self._completed - completed < self.connections:
+            return
+        now = self.clock()
+        rate = (self.done - done) / max(now - started, 1e-6)
+        if rate > self._best_rate * CONNECTION_GAIN:
+            self._best_rate = rate
+            self._mark = (now, self.done, self._completed)
+            self._start_workers(self.connections)
+        else:
+            self._growing = False
+
+    def _run(self):
+        try:
+            with open(self.partial_path, 'r+b') as f:
+                while True:
+                    with self._lock:
+                        if self.error is not None or not self.segments:
+                            return
+                        start, end = self.segments.popleft()
+                    self._fetch(f, start, end)
+                    with self._lock:
+                        self._completed += 1
+                        self._adapt()
+        except Exception as e:
+            with self._lock:
+                if self.error is None:
+                    self.error = e
+
+    def _fetch(self, f, start, end):
+        attempt = 0
+        while True:
+            headers = {"User-Agent": USER_AGENT, "Range": f"bytes={start}-{end}"}
+            if self.validator:
+                headers["If-Range"] = self.validator
+            try:
+                with self.session.get(self.url, headers=headers, timeout=self.timeout, stream=True) as response:
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        raise DownloadError("Server ignored the range request")
+                    match = CONTENT_RANGE.match(response.headers.get('Content-Range', ''))
+                    if not match or int(match.group(1)) != start:
+                        raise DownloadError("Server returned an unexpected range")
+                    f.seek(start)
+                    for chunk in response.iter_content(self.chunk_size):
+                        chunk = chunk[:end + 1 - start]
+                        f.write(chunk)
+                        start += len(chunk)
+                        self._advance(len(chunk))
+                        if start > end or self.error is not None:
+                            break
+                if start > end or self.error is not None:
+                    return
+                raise DownloadError(f"Segment ended early at byte {start}")
+            except (requests.RequestException, DownloadError) as e:
+                attempt += 1
+                if attempt > self.retries or self.error is not None:
+                    raise
+                with self._lock:
+                    self.retried += 1
+                logging.error(f"Segment {start}-{end} interrupted, retrying ({attempt}/{self.retries}): {e}")
+
+    def _advance(self, count):
+        with self._lock:
+            self.done += count
+            if self.progress is not None:
+                self.progress(self.done, self.total)
@@ -0,0 +1,74 @@
+import time
+import logging
+import collections
+
+LATENCY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+class EventBridge:
+    def __init__(self, wake, clock=time.monotonic):
+        self.wake = wake
+        self.clock = clock
+        self.posted = 0
+        self.dispatched = 0
+        self.coalesced = 0
+        self.wakeups = 0
+        self.latencies = {}
+        self._queue = collections.deque()
+        self._latest = {}
+        self._handlers = {}
+        self._coalescing = set()
+        self._wake_pending = False
+
+    def register(self, kind, handler, coalesce=False):
+        self._handlers[kind] = handler
+        if coalesce:
+            self._coalescing.add(kind)
+
+    def post(self, kind, payload=None):
+        self.posted += 1
+        if kind in self._coalescing:
+            self._latest[kind] = payload
+        self._queue.append((kind, payload, self.clock()))
+        if not self._wake_pending:
+            self._wake_pending = True
+            self.wakeups += 1
+            self.wake()
+
+    def drain(self):
+        self._wake_pending = False
+        handled = 0
+        while True:
+            try:
+                kind, payload, enqueued_at = self._queue.popleft()
+            except IndexError:
+                break
+            if kind in self._coalescing:
+                if kind not in self._latest:
+                    self.coalesced += 1
+                    continue
+                payload = self._latest.pop(kind)
+            self._record(kind, enqueued_at)
+            handler = self._handlers.get(kind)
+            if handler is not None:
+                try:
+                    handler(payload)
+                except Exception as e:
+                    logging.error(f"Failed to handle {kind} event: {e}")
+            handled += 1
+        self.dispatched += handled
+        return handled
+
+    def histogram(self, kind):
+        return dict(zip(LATENCY_BUCKETS + (None,), self.latencies.get(kind, [0] * (len(LATENCY_BUCKETS) + 1))))
+
+    def _record(self, kind, enqueued_at):
+        counts = self.latencies.get(kind)
+        if counts is None:
+            counts = [0] * (len(LATENCY_BUCKETS) + 1)
+            self.latencies[kind] = counts
+        elapsed = (self.clock() - enqueued_at) * 1000
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if elapsed <= bound:
+                counts[i] += 1
+                return
+        counts[-1] += 1
@@ -6,22 +6,30 @@ import win32gui
 import win32con
 import winreg
 import win32api
-import requests
-import subprocess
+import bisect
+import collections
 from win32api import GetSystemMetrics
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QSlider, QSystemTrayIcon, QMenu, QFileDialog,
-    QDialog, QCheckBox, QLabel, QListWidget, QFrame, QLineEdit, QTableWidget, QTableWidgetItem
+    QDialog, QCheckBox, QLabel, QListWidget, QListWidgetItem, QListView, QFrame, QLineEdit, QTableWidget, QTableWidgetItem
 )
-from PyQt6.QtCore import Qt, QTimer, QEvent, QPoint, QSize, QRectF
-from PyQt6.QtGui import QIcon, QAction, QPainter, QPainterPath, QColor
+from PyQt6.QtCore import Qt, QTimer, QEvent, QPoint, QSize, QRectF, QAbstractListModel, QModelIndex, pyqtSignal
+from PyQt6.QtGui import QIcon, QAction, QPainter, QPainterPath, QColor, QPixmap
 import pathlib
 import ctypes
-import random
-import urllib.parse
 import logging
 import PyQt6.sip as sip
+from playlist_model import PlaylistModel
+from config_store import ConfigWriter, read_config
+from update_checker import UpdateChecker
+from update_handshake import handshake_environment
+from progress_tracker import ProgressTracker
+from player_state import PlayerState, StateStore
+from audio_applier import AudioApplier
+from event_bridge import EventBridge
+from playback_core import PlaybackCore
+from vlc_backend import VlcBackend
 
 def resource_path(relative_path):
     try:
@@ -30,9 +38,29 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
+icon_cache = {}
+
+def load_icon(name):
+    icon = icon_cache.get(name)
+    if icon is None:
+        icon = QIcon(resource_path(f"icons/{name}_icon.png"))
+        icon_cache[name] = icon
+    return icon
+
+def set_button_state(button, icon_name, tooltip=None):
+    if getattr(button, 'icon_name', None) != icon_name:
+        button.icon_name = icon_name
+        button.setIcon(load_icon(icon_name))
+    if tooltip is not None and button.toolTip() != tooltip:
+        button.setToolTip(tooltip)
+
 logging.basicConfig(level=logging.CRITICAL)
 
 VERSION = "1.0.0"
+CONFIG_WRITE_DELAY = 0.5
+AUDIO_APPLY_TIMEOUT = 3.0
+THUMBNAIL_ICON_SIZE = QSize(64, 36)
+THUMBNAIL_ICON_LIMIT = 500
 
 QSS_STYLE = """
 QMainWindow, QDialog {
@@ -58,7 +86,7 @@ QPushButton#settingsButton, QPushButton#aboutButton {
     border-radius: 24px;
 }
 QPushButton#okButton, QPushButton#cancelButton, QPushButton#addButton, QPushButton#removeButton,
-QPushButton#moveUpButton, QPushButton#moveDownButton, QPushButton#shuffleButton, QPushButton#clearButton,
+QPushButton#moveUpButton, QPushButton#moveDownButton, QPushButton#shuffleButton, QPushButton#sortButton, QPushButton#clearButton,
 QPushButton#saveButton, QPushButton#loadButton, QPushButton#manageButton, QPushButton#renameButton,
 QPushButton#deleteButton, QPushButton#playSelectedButton, QPushButton#hotkeysButton, QPushButton#checkUpdatesButton {
     width: 80px;
@@ -118,7 +146,7 @@ QCheckBox {
     background-color: #353535;
     color: white;
 }
-QListWidget, QInputDialog, QLineEdit {
+QListView, QInputDialog, QLineEdit {
     background-color: #252525;
     color: white;
 }
@@ -167,19 +195,17 @@ QPushButton#exitFullscreenButton:hover {
 }
 """
 
-class CustomEvent(QEvent):
+class BridgeEvent(QEvent):
     EVENT_TYPE = QEvent.Type(QEvent.registerEventType())
-    def __init__(self, video_name, index):
+    def __init__(self):
         super().__init__(self.EVENT_TYPE)
-        self.video_name = video_name
-        self.index = index
 
 class DialogBase(QDialog):
     def __init__(self, parent, title):
         super().__init__(parent)
         self.setWindowTitle(title)
         self.setWindowOpacity(0.9)
-        self.setWindowIcon(QIcon(resource_path("icons/tray_icon.png")))
+        self.setWindowIcon(load_icon("tray"))
         self.dragging = False
         self.drag_position = QPoint()
         self.list_widget = None
@@ -198,7 +224,7 @@ class DialogBase(QDialog):
     def keyPressEvent(self, event):
         if event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
             focused_widget = QApplication.focusWidget()
-            if not isinstance(focused_widget, (QLineEdit, QListWidget)):
+            if not isinstance(focused_widget, (QLineEdit, QListView)):
                 self.accept()
         elif event.key() == Qt.Key.Key_Escape:
             self.reject()
@@ -220,12 +246,11 @@ class DialogBase(QDialog):
     def eventFilter(self, obj, event):
         if event.type() == QEvent.Type.MouseButtonPress:
             if self.list_widget and obj is self.list_widget.viewport():
-                item = self.list_widget.itemAt(event.pos())
-                if not item:
+                if not self.list_widget.indexAt(event.pos()).isValid():
                     self.list_widget.clearSelection()
             elif obj is self:
                 widget = QApplication.widgetAt(event.globalPosition().toPoint())
-                if widget is self or not widget or not isinstance(widget, (QPushButton, QListWidget)):
+                if widget is self or not widget or not isinstance(widget, (QPushButton, QListView)):
                     if self.list_widget:
                         self.list_widget.clearSelection()
                     focused_widget = QApplication.focusWidget()
@@ -529,16 +554,48 @@ class AboutDialog(DialogBase):
         ok_button.clicked.connect(self.accept)
         self.content_layout.addWidget(ok_button)
 
+def format_duration(ms):
+    seconds = ms // 1000
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+def show_visible_thumbnails(list_widget, player):
+    viewport = list_widget.viewport()
+    first = list_widget.indexAt(QPoint(0, 0)).row()
+    last = list_widget.indexAt(QPoint(0, viewport.height() - 1)).row()
+    if last < 0:
+        last = list_widget.count() - 1
+    for row in range(max(first, 0), last + 1):
+        item = list_widget.item(row)
+        path = item.data(Qt.ItemDataRole.UserRole + 1) if item else None
+        if path:
+            icon = player.thumbnail_icon(path)
+            if icon is not None:
+                item.setIcon(icon)
+
+def playlist_record_text(record):
+    count = record['count']
+    text = f"{record['name']} ({count} video{'s' if count != 1 else ''}"
+    if record.get('duration'):
+        text += f", {format_duration(record['duration'])}"
+    return text + ")"
+
 class LoadPlaylistDialog(DialogBase):
     def __init__(self, parent, playlist_dir):
+        from saved_playlists import PlaylistIndex
         super().__init__(parent, "Load Playlist")
         self.playlist_dir = playlist_dir
+        self.parent_player = parent.parent
+        self.playlist_index = PlaylistIndex(playlist_dir, duration_lookup=self.parent_player.metadata_prober.duration)
         self.selected_file = None
         self.playlist_list = QListWidget()
         self.list_widget = self.playlist_list
         self.playlist_list.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         self.playlist_list.viewport().installEventFilter(self)
+        self.playlist_list.setIconSize(THUMBNAIL_ICON_SIZE)
+        self.playlist_list.verticalScrollBar().valueChanged.connect(self.show_thumbnails)
+        self.parent_player.thumbnail_ready.connect(self.show_thumbnails)
         self.update_playlist_list()
+        QTimer.singleShot(0, self.show_thumbnails)
         self.playlist_list.itemDoubleClicked.connect(self.accept)
         self.content_layout.addWidget(self.playlist_list)
         button_layout = QHBoxLayout()
@@ -568,21 +625,28 @@ class LoadPlaylistDialog(DialogBase):
     def update_playlist_list(self):
         selected_row = self.playlist_list.currentRow()
         self.playlist_list.clear()
-        try:
-            for file in os.listdir(self.playlist_dir):
-                if file.endswith('.json'):
-                    display_name = os.path.splitext(file)[0]
-                    self.playlist_list.addItem(display_name)
-            if selected_row >= 0 and selected_row < self.playlist_list.count():
-                self.playlist_list.setCurrentRow(selected_row)
-                self.playlist_list.setFocus()
-        except FileNotFoundError:
-            os.makedirs(self.playlist_dir, exist_ok=True)
+        for record in self.playlist_index.refresh():
+            item = QListWidgetItem(playlist_record_text(record))
+            item.setData(Qt.ItemDataRole.UserRole, record['file'])
+            item.setData(Qt.ItemDataRole.UserRole + 1, record.get('first'))
+            item.setIcon(self.parent_player.thumbnail_placeholder)
+            self.playlist_list.addItem(item)
+        if selected_row >= 0 and selected_row < self.playlist_list.count():
+            self.playlist_list.setCurrentRow(selected_row)
+            self.playlist_list.setFocus()
+        self.show_thumbnails()
+
+    def show_thumbnails(self, *args):
+        show_visible_thumbnails(self.playlist_list, self.parent_player)
+
+    def done(self, result):
+        self.parent_player.thumbnail_ready.disconnect(self.show_thumbnails)
+        super().done(result)
 
     def accept(self):
         if self.playlist_list.selectedItems():
             selected = self.playlist_list.currentItem()
-            self.selected_file = os.path.join(self.playlist_dir, selected.text() + '.json')
+            self.selected_file = os.path.join(self.playlist_dir, selected.data(Qt.ItemDataRole.UserRole))
             super().accept()
         else:
             return
@@ -592,14 +656,21 @@ class LoadPlaylistDialog(DialogBase):
 
 class PlaylistManager(DialogBase):
     def __init__(self, parent, playlist_dir):
+        from saved_playlists import PlaylistIndex
         super().__init__(parent, "Playlist Manager")
         self.parent = parent
         self.playlist_dir = playlist_dir
+        self.parent_player = parent.parent
+        self.playlist_index = PlaylistIndex(playlist_dir, duration_lookup=self.parent_player.metadata_prober.duration)
         self.playlist_list = QListWidget()
         self.list_widget = self.playlist_list
         self.playlist_list.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         self.playlist_list.viewport().installEventFilter(self)
+        self.playlist_list.setIconSize(THUMBNAIL_ICON_SIZE)
+        self.playlist_list.verticalScrollBar().valueChanged.connect(self.show_thumbnails)
+        self.parent_player.thumbnail_ready.connect(self.show_thumbnails)
         self.update_playlist_list()
+        QTimer.singleShot(0, self.show_thumbnails)
         self.playlist_list.clearSelection()
         self.content_layout.addWidget(self.playlist_list)
         button_layout1 = QHBoxLayout()
@@ -643,35 +714,47 @@ class PlaylistManager(DialogBase):
     def update_playlist_list(self):
         selected_row = self.playlist_list.currentRow()
         self.playlist_list.clear()
-        try:
-            for file in os.listdir(self.playlist_dir):
-                if file.endswith('.json'):
-                    display_name = os.path.splitext(file)[0]
-                    self.playlist_list.addItem(display_name)
-            if selected_row >= 0 and selected_row < self.playlist_list.count():
-                self.playlist_list.setCurrentRow(selected_row)
-                self.playlist_list.setFocus()
-        except FileNotFoundError:
-            os.makedirs(self.playlist_dir, exist_ok=True)
+        for record in self.playlist_index.refresh():
+            item = QListWidgetItem(playlist_record_text(record))
+            item.setData(Qt.ItemDataRole.UserRole, record['file'])
+            item.setData(Qt.ItemDataRole.UserRole + 1, record.get('first'))
+            item.setIcon(self.parent_player.thumbnail_placeholder)
+            self.playlist_list.addItem(item)
+        if selected_row >= 0 and selected_row < self.playlist_list.count():
+            self.playlist_list.setCurrentRow(selected_row)
+            self.playlist_list.setFocus()
+        self.show_thumbnails()
+
+    def show_thumbnails(self, *args):
+        show_visible_thumbnails(self.playlist_list, self.parent_player)
+
+    def done(self, result):
+        self.parent_player.thumbnail_ready.disconnect(self.show_thumbnails)
+        super().done(result)
 
     def rename_playlist(self):
+        from saved_playlists import convert_playlist, playlist_file_name
         if self.playlist_list.count() == 0 or not self.playlist_list.selectedItems():
             return
         selected = self.playlist_list.currentItem()
         selected_row = self.playlist_list.currentRow()
         if selected:
-            old_name = selected.text()
+            old_file = selected.data(Qt.ItemDataRole.UserRole)
+            old_name = os.path.splitext(old_file)[0]
             dialog = RenamePlaylistDialog(self, old_name)
             result = dialog.exec()
             if result == QDialog.DialogCode.Accepted:
                 new_name = dialog.get_name()
                 if new_name:
-                    new_name = new_name + '.json' if not new_name.endswith('.json') else new_name
+                    new_name = playlist_file_name(new_name, os.path.splitext(old_file)[1])
+                    old_path = os.path.join(self.playlist_dir, old_file)
+                    new_path = os.path.join(self.playlist_dir, new_name)
                     try:
-                        os.rename(
-                            os.path.join(self.playlist_dir, old_name + '.json'),
-                            os.path.join(self.playlist_dir, new_name)
-                        )
+                        if os.path.splitext(new_name)[1].lower() == os.path.splitext(old_file)[1].lower():
+                            os.rename(old_path, new_path)
+                        else:
+                            convert_playlist(old_path, new_path)
+                            os.remove(old_path)
                         self.update_playlist_list()
                         if self.playlist_list.count() > 0:
                             new_row = min(selected_row, self.playlist_list.count() - 1)
@@ -691,11 +774,11 @@ class PlaylistManager(DialogBase):
         selected = self.playlist_list.currentItem()
         selected_row = self.playlist_list.currentRow()
         if selected:
-            dialog = ConfirmDialog(self, "Confirm Delete", f"Are you sure you want to delete {selected.text()}?")
+            dialog = ConfirmDialog(self, "Confirm Delete", f"Are you sure you want to delete {os.path.splitext(selected.data(Qt.ItemDataRole.UserRole))[0]}?")
             result = dialog.exec()
             if result == QDialog.DialogCode.Accepted:
                 try:
-                    os.remove(os.path.join(self.playlist_dir, selected.text() + '.json'))
+                    os.remove(os.path.join(self.playlist_dir, selected.data(Qt.ItemDataRole.UserRole)))
                     self.update_playlist_list()
                     if self.playlist_list.count() > 0:
                         new_row = min(selected_row, self.playlist_list.count() - 1)
@@ -712,20 +795,136 @@ class PlaylistManager(DialogBase):
     def accept(self):
         super().accept()
 
+class PlaylistListModel(QAbstractListModel):
+    def __init__(self, playlist, parent=None, info_lookup=None, thumbnail_lookup=None):
+        super().__init__(parent)
+        self.playlist = playlist
+        self.info_lookup = info_lookup
+        self.thumbnail_lookup = thumbnail_lookup
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.playlist)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.DecorationRole):
+            return None
+        row = index.row()
+        if row >= len(self.playlist):
+            return None
+        file = self.playlist[row]
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self.thumbnail_lookup(file) if self.thumbnail_lookup else None
+        text = f"{row + 1}. {os.path.basename(file)} ({os.path.dirname(file)})"
+        info = self.info_lookup(file) if self.info_lookup else None
+        if info:
+            if info.get('error'):
+                text += " [unplayable]"
+            elif info.get('duration'):
+                text += f" [{format_duration(info['duration'])}]"
+        return text
+
+    def set_playlist(self, playlist):
+        self.beginResetModel()
+        self.playlist = playlist
+        self.endResetModel()
+
+    def add_files(self, files):
+        new_files = self.playlist.new_paths(files)
+        if not new_files:
+            return []
+        first = len(self.playlist)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_files) - 1)
+        self.playlist.add_many(new_files)
+        self.endInsertRows()
+        return new_files
+
+    def remove_row(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.playlist.remove_at(row)
+        self.endRemoveRows()
+        if row < len(self.playlist):
+            self.dataChanged.emit(self.index(row), self.index(len(self.playlist) - 1), [Qt.ItemDataRole.DisplayRole])
+
+    def move_row(self, row, target):
+        if row == target:
+            return
+        destination = target if target < row else target + 1
+        if not self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), destination):
+            return
+        self.playlist.move(row, target)
+        self.endMoveRows()
+        self.dataChanged.emit(self.index(min(row, target)), self.index(max(row, target)), [Qt.ItemDataRole.DisplayRole])
+
+    def shuffle(self):
+        self.beginResetModel()
+        self.playlist.shuffle()
+        self.endResetModel()
+
+    def remove_paths(self, paths):
+        self.beginResetModel()
+        removed = self.playlist.remove_paths(paths)
+        self.endResetModel()
+        return removed
+
+    def sort_by_length(self):
+        def length(path):
+            info = self.info_lookup(path) if self.info_lookup else None
+            duration = info.get('duration') if info else None
+            return (duration is None, duration or 0)
+        self.beginResetModel()
+        self.playlist.sort(length)
+        self.endResetModel()
+
+    def thumbnail_ready(self, path):
+        row = self.playlist.find(path)
+        if row is not None:
+            self.dataChanged.emit(self.index(row), self.index(row), [Qt.ItemDataRole.DecorationRole])
+
+    def refresh_metadata(self):
+        if self.playlist:
+            self.dataChanged.emit(self.index(0), self.index(len(self.playlist) - 1), [Qt.ItemDataRole.DisplayRole])
+
+    def clear(self):
+        self.beginResetModel()
+        self.playlist.clear()
+        self.endResetModel()
+
 class PlaylistDialog(DialogBase):
+    paths_validated = pyqtSignal(object, object)
+
     def __init__(self, parent):
         super().__init__(parent, "Playlist")
         self.setModal(True)
         self.parent = parent
+        self.paths_validated.connect(self.drop_missing_paths)
         self.temp_playlist = self.parent.playlist.copy()
+        self.loaded_file = None
+        self.loaded_revision = None
         self.setAcceptDrops(True)
-        self.playlist_widget = QListWidget()
+        self.playlist_model = PlaylistListModel(self.temp_playlist, self, self.parent.metadata_prober.info, self.parent.thumbnail_or_placeholder)
+        self.durations = {}
+        self.total_duration = 0
+        self.playlist_model.rowsInserted.connect(self.rows_inserted)
+        self.playlist_model.rowsAboutToBeRemoved.connect(self.rows_removed)
+        self.playlist_model.rowsRemoved.connect(self.update_summary)
+        self.playlist_model.modelReset.connect(self.playlist_changed)
+        self.parent.metadata_probed.connect(self.update_metadata)
+        self.parent.thumbnail_ready.connect(self.playlist_model.thumbnail_ready)
+        self.summary_label = QLabel()
+        self.summary_label.setObjectName("playlistSummaryLabel")
+        self.content_layout.addWidget(self.summary_label)
+        self.playlist_widget = QListView()
+        self.playlist_widget.setModel(self.playlist_model)
+        self.playlist_widget.setUniformItemSizes(True)
+        self.playlist_widget.setIconSize(THUMBNAIL_ICON_SIZE)
+        self.playlist_widget.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
         self.list_widget = self.playlist_widget
         self.playlist_widget.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         self.playlist_widget.viewport().installEventFilter(self)
-        self.update_playlist_display()
         self.playlist_widget.clearSelection()
-        self.playlist_widget.itemDoubleClicked.connect(self.play_selected)
+        self.playlist_widget.doubleClicked.connect(self.play_selected)
         self.content_layout.addWidget(self.playlist_widget)
         button_layout1 = QHBoxLayout()
         button_layout1.setSpacing(10)
@@ -751,8 +950,7 @@ class PlaylistDialog(DialogBase):
         self.move_down_button.clicked.connect(self.move_down)
         self.play_selected_button = QPushButton()
         self.play_selected_button.setObjectName("playSelectedButton")
-        self.play_selected_button.setIcon(QIcon(resource_path("icons/play_icon.png")))
-        self.play_selected_button.setToolTip("Play Selected (Ctrl+P)")
+        set_button_state(self.play_selected_button, "play", "Play Selected (Ctrl+P)")
         self.play_selected_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.play_selected_button.clicked.connect(self.play_selected)
         button_layout1.addWidget(self.add_button)
@@ -768,6 +966,11 @@ class PlaylistDialog(DialogBase):
         self.shuffle_button.setToolTip("Shuffle (Ctrl+R)")
         self.shuffle_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.shuffle_button.clicked.connect(self.shuffle_playlist)
+        self.sort_button = QPushButton("Sort")
+        self.sort_button.setObjectName("sortButton")
+        self.sort_button.setToolTip("Sort by Length (Ctrl+L)")
+        self.sort_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.sort_button.clicked.connect(self.sort_playlist)
         self.clear_button = QPushButton("Clear")
         self.clear_button.setObjectName("clearButton")
         self.clear_button.setToolTip("Clear (Ctrl+E)")
@@ -789,6 +992,7 @@ class PlaylistDialog(DialogBase):
         self.manage_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.manage_button.clicked.connect(self.open_playlist_manager)
         button_layout2.addWidget(self.shuffle_button)
+        button_layout2.addWidget(self.sort_button)
         button_layout2.addWidget(self.clear_button)
         button_layout2.addWidget(self.save_button)
         button_layout2.addWidget(self.load_button)
@@ -809,16 +1013,61 @@ class PlaylistDialog(DialogBase):
         button_layout3.addWidget(self.ok_button)
         button_layout3.addWidget(self.cancel_button)
         self.content_layout.addLayout(button_layout3)
+        self.playlist_changed()
+
+    def playlist_changed(self):
+        self.durations = {}
+        self.total_duration = 0
+        self.count_durations(self.temp_playlist)
+        self.update_summary()
+        self.parent.metadata_prober.probe_paths(self.temp_playlist.to_list(), self.parent.metadata_probed.emit)
+
+    def rows_inserted(self, parent, first, last):
+        paths = self.temp_playlist[first:last + 1]
+        self.count_durations(paths)
+        self.update_summary()
+        self.parent.metadata_prober.probe_paths(paths, self.parent.metadata_probed.emit)
+
+    def rows_removed(self, parent, first, last):
+        for path in self.temp_playlist[first:last + 1]:
+            self.total_duration -= self.durations.pop(path, 0)
+
+    def count_durations(self, paths):
+        for path in paths:
+            duration = self.parent.metadata_prober.duration(path)
+            if duration:
+                self.durations[path] = duration
+                self.total_duration += duration
+
+    def update_metadata(self, results):
+        for path, info in results.items():
+            if path not in self.temp_playlist:
+                continue
+            duration = info.get('duration') if info else None
+            self.total_duration -= self.durations.pop(path, 0)
+            if duration:
+                self.durations[path] = duration
+                self.total_duration += duration
+        self.playlist_model.refresh_metadata()
+        self.update_summary()
+
+    def update_summary(self, *args):
+        count = len(self.temp_playlist)
+        known = len(self.durations)
+        text = f"{count} video{'s' if count != 1 else ''}, {format_duration(self.total_duration)}"
+        if known < count:
+            text += f" ({count - known} unknown)"
+        self.summary_label.setText(text)
 
     def handle_ok(self):
-        if self.playlist_widget.selectedItems():
+        if self.has_selection():
             self.play_selected()
         else:
             self.accept()
 
     def keyPressEvent(self, event):
         if event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
-            if self.playlist_widget.selectedItems():
+            if self.has_selection():
                 self.play_selected()
             else:
                 self.accept()
@@ -836,6 +1085,8 @@ class PlaylistDialog(DialogBase):
             self.play_selected()
         elif event.modifiers() & Qt.KeyboardModifier.ControlModifier and event.key() == Qt.Key.Key_R:
             self.shuffle_playlist()
+        elif event.modifiers() & Qt.KeyboardModifier.ControlModifier and event.key() == Qt.Key.Key_L:
+            self.sort_playlist()
         elif event.modifiers() & Qt.KeyboardModifier.ControlModifier and event.key() == Qt.Key.Key_E:
             self.clear_playlist()
         elif event.modifiers() & Qt.KeyboardModifier.ControlModifier and event.key() == Qt.Key.Key_S:
@@ -847,31 +1098,22 @@ class PlaylistDialog(DialogBase):
         else:
             super().keyPressEvent(event)
 
-    def update_playlist_display(self):
-        selected_row = self.playlist_widget.currentRow()
-        has_selection = bool(self.playlist_widget.selectedItems())
-        self.playlist_widget.clear()
-        for i, file in enumerate(self.temp_playlist, start=1):
-            filename = os.path.basename(file)
-            directory = os.path.dirname(file)
-            self.playlist_widget.addItem(f"{i}. {filename} ({directory})")
-        if has_selection and selected_row >= 0 and selected_row < len(self.temp_playlist):
-            self.playlist_widget.setCurrentRow(selected_row)
-            self.playlist_widget.setFocus()
-        self.adjustSize()
-
-    def is_duplicate_file(self, new_file, existing_files):
-        new_name = os.path.basename(new_file)
-        new_dir = os.path.dirname(new_file)
-        for existing_file in existing_files:
-            existing_name = os.path.basename(existing_file)
-            existing_dir = os.path.dirname(existing_file)
-            if new_name == existing_name and new_dir == existing_dir:
-                return True
-        return False
+    def current_row(self):
+        return self.playlist_widget.currentIndex().row()
+
+    def has_selection(self):
+        return self.playlist_widget.selectionModel().hasSelection()
+
+    def select_row(self, row):
+        self.playlist_widget.setCurrentIndex(self.playlist_model.index(row))
+        self.playlist_widget.setFocus()
+
+    def restore_selection(self, selected_row):
+        if self.has_selection() and selected_row >= 0 and selected_row < len(self.temp_playlist):
+            self.select_row(selected_row)
 
     def add_files(self):
-        selected_row = self.playlist_widget.currentRow()
+        selected_row = self.current_row()
         default_dir = self.parent.last_video_dir if self.parent.last_video_dir else os.path.join(self.parent.config_dir, 'playlists')
         files, _ = QFileDialog.getOpenFileNames(
             self,
@@ -882,61 +1124,51 @@ class PlaylistDialog(DialogBase):
         if files:
             self.parent.last_video_dir = os.path.dirname(files[0])
             self.parent.save_config()
-            new_files = [f for f in files if not self.is_duplicate_file(f, self.temp_playlist)]
-            self.temp_playlist.extend(new_files)
-            self.update_playlist_display()
+            self.playlist_model.add_files(files)
         else:
-            if self.playlist_widget.selectedItems() and selected_row >= 0 and selected_row < len(self.temp_playlist):
-                self.update_playlist_display()
-                self.playlist_widget.setCurrentRow(selected_row)
-                self.playlist_widget.setFocus()
+            self.restore_selection(selected_row)
 
     def remove_file(self):
-        if not self.temp_playlist or not self.playlist_widget.selectedItems():
+        if not self.temp_playlist or not self.has_selection():
             return
-        selected = self.playlist_widget.currentRow()
+        selected = self.current_row()
         if selected >= 0:
-            self.temp_playlist.pop(selected)
-            self.update_playlist_display()
+            self.playlist_model.remove_row(selected)
             if self.temp_playlist:
-                new_row = min(selected, len(self.temp_playlist) - 1)
-                self.playlist_widget.setCurrentRow(new_row)
-                self.playlist_widget.setFocus()
+                self.select_row(min(selected, len(self.temp_playlist) - 1))
 
     def move_up(self):
-        if not self.temp_playlist or not self.playlist_widget.selectedItems():
+        if not self.temp_playlist or not self.has_selection():
             return
-        selected = self.playlist_widget.currentRow()
+        selected = self.current_row()
         if selected > 0:
-            self.temp_playlist[selected], self.temp_playlist[selected - 1] = self.temp_playlist[selected - 1], self.temp_playlist[selected]
-            self.update_playlist_display()
-            self.playlist_widget.setCurrentRow(selected - 1)
-            self.playlist_widget.setFocus()
+            self.playlist_model.move_row(selected, selected - 1)
+            self.select_row(selected - 1)
 
     def move_down(self):
-        if not self.temp_playlist or not self.playlist_widget.selectedItems():
+        if not self.temp_playlist or not self.has_selection():
             return
-        selected = self.playlist_widget.currentRow()
+        selected = self.current_row()
         if selected >= 0 and selected < len(self.temp_playlist) - 1:
-            self.temp_playlist[selected], self.temp_playlist[selected + 1] = self.temp_playlist[selected + 1], self.temp_playlist[selected]
-            self.update_playlist_display()
-            self.playlist_widget.setCurrentRow(selected + 1)
-            self.playlist_widget.setFocus()
+            self.playlist_model.move_row(selected, selected + 1)
+            self.select_row(selected + 1)
 
     def shuffle_playlist(self):
-        random.shuffle(self.temp_playlist)
-        self.update_playlist_display()
+        self.playlist_model.shuffle()
+
+    def sort_playlist(self):
+        self.playlist_model.sort_by_length()
 
     def clear_playlist(self):
-        self.temp_playlist = []
-        self.update_playlist_display()
+        self.playlist_model.clear()
 
     def save_playlist(self):
+        from saved_playlists import write_saved_playlist, playlist_file_name
         if not self.temp_playlist:
             dialog = MessageDialog(self, "Save Playlist", "No videos in playlist to save.")
             dialog.exec()
             return
-        selected_row = self.playlist_widget.currentRow()
+        selected_row = self.current_row()
         dialog = SavePlaylistDialog(self)
         result = dialog.exec()
         if result == QDialog.DialogCode.Accepted:
@@ -944,31 +1176,25 @@ class PlaylistDialog(DialogBase):
             if name:
                 playlist_dir = os.path.join(self.parent.config_dir, 'playlists')
                 os.makedirs(playlist_dir, exist_ok=True)
-                file_path = os.path.join(playlist_dir, name + '.json' if not name.endswith('.json') else name)
+                file_path = os.path.join(playlist_dir, playlist_file_name(name))
                 if os.path.exists(file_path):
                     confirm_dialog = ConfirmDialog(self, "Confirm Overwrite", f"Playlist '{name}' already exists. Overwrite?")
                     confirm_result = confirm_dialog.exec()
                     if confirm_result != QDialog.DialogCode.Accepted:
-                        if self.playlist_widget.selectedItems() and selected_row >= 0 and selected_row < len(self.temp_playlist):
-                            self.update_playlist_display()
-                            self.playlist_widget.setCurrentRow(selected_row)
-                            self.playlist_widget.setFocus()
+                        self.restore_selection(selected_row)
                         return
                 try:
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        json.dump(self.temp_playlist, f)
+                    write_saved_playlist(file_path, self.temp_playlist.to_list())
                     dialog = MessageDialog(self, "Success", "Playlist saved successfully.")
                     dialog.exec()
                 except Exception as e:
                     dialog = MessageDialog(self, "Error", f"Failed to save playlist: {str(e)}")
                     dialog.exec()
-        if self.playlist_widget.selectedItems() and selected_row >= 0 and selected_row < len(self.temp_playlist):
-            self.update_playlist_display()
-            self.playlist_widget.setCurrentRow(selected_row)
-            self.playlist_widget.setFocus()
+        self.restore_selection(selected_row)
 
     def load_playlist(self):
-        selected_row = self.playlist_widget.currentRow()
+        from saved_playlists import read_saved_playlist
+        selected_row = self.current_row()
         playlist_dir = os.path.join(self.parent.config_dir, 'playlists')
         dialog = LoadPlaylistDialog(self, playlist_dir)
         result = dialog.exec()
@@ -976,33 +1202,35 @@ class PlaylistDialog(DialogBase):
             file = dialog.get_selected_file()
             if file:
                 try:
-                    with open(file, 'r', encoding='utf-8') as f:
-                        self.temp_playlist = json.load(f)
-                        self.temp_playlist = [f for f in self.temp_playlist if os.path.exists(f)]
-                    self.update_playlist_display()
+                    self.temp_playlist = PlaylistModel(read_saved_playlist(file))
+                    self.loaded_file = file
+                    self.loaded_revision = self.temp_playlist.revision
+                    self.playlist_model.set_playlist(self.temp_playlist)
+                    self.parent.path_validator.validate(self.temp_playlist.to_list(), self.paths_validated.emit)
                 except Exception as e:
                     dialog = MessageDialog(self, "Error", f"Failed to load playlist: {str(e)}")
                     dialog.exec()
         else:
-            if self.playlist_widget.selectedItems() and selected_row >= 0 and selected_row < len(self.temp_playlist):
-                self.update_playlist_display()
-                self.playlist_widget.setCurrentRow(selected_row)
-                self.playlist_widget.setFocus()
+            self.restore_selection(selected_row)
+
+    def drop_missing_paths(self, missing, unavailable):
+        if not missing:
+            return
+        selected_row = self.current_row()
+        if self.playlist_model.remove_paths(missing) and selected_row >= 0 and self.temp_playlist:
+            self.select_row(min(selected_row, len(self.temp_playlist) - 1))
 
     def open_playlist_manager(self):
-        selected_row = self.playlist_widget.currentRow()
+        selected_row = self.current_row()
         playlist_dir = os.path.join(self.parent.config_dir, 'playlists')
         dialog = PlaylistManager(self, playlist_dir)
         dialog.exec()
-        if self.playlist_widget.selectedItems() and selected_row >= 0 and selected_row < len(self.temp_playlist):
-            self.update_playlist_display()
-            self.playlist_widget.setCurrentRow(selected_row)
-            self.playlist_widget.setFocus()
+        self.restore_selection(selected_row)
 
     def play_selected(self):
-        if not self.temp_playlist or not self.playlist_widget.selectedItems():
+        if not self.temp_playlist or not self.has_selection():
             return
-        selected = self.playlist_widget.currentRow()
+        selected = self.current_row()
         self.parent.playlist = self.temp_playlist.copy()
         self.parent.original_playlist = self.temp_playlist.copy()
         self.parent.save_config()
@@ -1011,13 +1239,11 @@ class PlaylistDialog(DialogBase):
         if not hasattr(self.parent, 'video_window') or not self.parent.video_window or sip.isdeleted(self.parent.video_window):
             self.parent.setup_video_window(is_fullscreen=self.parent.is_fullscreen)
         self.parent.video_window.show()
-        self.parent.list_player.play_item_at_index(selected)
-        self.parent.play_pause_button.setIcon(QIcon(resource_path("icons/pause_icon.png")))
-        self.parent.play_pause_button.setToolTip("Pause (Space)")
+        self.parent.core.play_index(selected)
+        set_button_state(self.parent.play_pause_button, "pause", "Pause (Space)")
         video_name = os.path.basename(self.temp_playlist[selected])
         self.parent.current_video_label.setText(self.parent.truncate_label_text(video_name))
-        QTimer.singleShot(100, self.parent.ensure_playing_and_set_audio)
-        self.parent.skip_audio_poll = True
+        self.parent.request_audio_settings()
         self.accept()
 
     def accept(self):
@@ -1038,31 +1264,35 @@ class PlaylistDialog(DialogBase):
             if not hasattr(self.parent, 'video_window') or not self.parent.video_window or sip.isdeleted(self.parent.video_window):
                 self.parent.setup_video_window(is_fullscreen=self.parent.is_fullscreen)
             self.parent.video_window.show()
-            self.parent.list_player.play_item_at_index(new_index)
-            self.parent.play_pause_button.setIcon(QIcon(resource_path("icons/pause_icon.png")))
-            self.parent.play_pause_button.setToolTip("Pause (Space)")
+            self.parent.core.play_index(new_index)
+            set_button_state(self.parent.play_pause_button, "pause", "Pause (Space)")
             video_name = os.path.basename(self.temp_playlist[new_index])
             self.parent.current_video_label.setText(self.parent.truncate_label_text(video_name))
-            if not self.parent.skip_audio_poll:
-                QTimer.singleShot(100, self.parent.ensure_playing_and_set_audio)
+            self.parent.request_audio_settings()
         else:
             self.parent.current_video_index = 0
             if not hasattr(self.parent, 'video_window') or not self.parent.video_window or sip.isdeleted(self.parent.video_window):
                 self.parent.setup_video_window(is_fullscreen=self.parent.is_fullscreen)
             self.parent.video_window.show()
-            self.parent.list_player.play_item_at_index(0)
-            self.parent.play_pause_button.setIcon(QIcon(resource_path("icons/pause_icon.png")))
-            self.parent.play_pause_button.setToolTip("Pause (Space)")
+            self.parent.core.play_index(0)
+            set_button_state(self.parent.play_pause_button, "pause", "Pause (Space)")
             video_name = os.path.basename(self.temp_playlist[0]) if self.temp_playlist else "Playlist is empty"
             self.parent.current_video_label.setText(self.parent.truncate_label_text(video_name))
-            if not self.parent.skip_audio_poll:
-                QTimer.singleShot(100, self.parent.ensure_playing_and_set_audio)
-        self.parent.skip_audio_poll = False
+            self.parent.request_audio_settings()
         super().accept()
 
     def reject(self):
         super().reject()
 
+    def done(self, result):
+        self.parent.metadata_probed.disconnect(self.update_metadata)
+        self.parent.thumbnail_ready.disconnect(self.playlist_model.thumbnail_ready)
+        if self.loaded_file and self.temp_playlist.revision == self.loaded_revision:
+            from saved_playlists import PlaylistIndex
+            PlaylistIndex(os.path.dirname(self.loaded_file)).update_duration(os.path.basename(self.loaded_file),
+                                                                             self.total_duration, len(self.durations))
+        super().done(result)
+
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
             supported_extensions = ('.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm', '.mpeg', '.mpg', '.m4v')
@@ -1089,9 +1319,7 @@ class PlaylistDialog(DialogBase):
         if files:
             self.parent.last_video_dir = os.path.dirname(files[0])
             self.parent.save_config()
-            new_files = [f for f in files if not self.is_duplicate_file(f, self.temp_playlist)]
-            self.temp_playlist.extend(new_files)
-            self.update_playlist_display()
+            self.playlist_model.add_files(files)
             event.acceptProposedAction()
         else:
             event.ignore()
@@ -1103,7 +1331,7 @@ class FullscreenControlDialog(QWidget):
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.Window | Qt.WindowType.WindowStaysOnTopHint)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.setWindowOpacity(0.9)
-        self.setWindowIcon(QIcon(resource_path("icons/tray_icon.png")))
+        self.setWindowIcon(load_icon("tray"))
         self.parent = parent
         self.hide_timer = QTimer(self)
         self.hide_timer.setSingleShot(True)
@@ -1120,6 +1348,8 @@ class FullscreenControlDialog(QWidget):
             self.adjust_position()
             self.show()
             self.raise_()
+            self.parent.update_progress_activity()
+            self.parent.publish_state()
             QTimer.singleShot(3000, self.start_hide_timer)
 
     def start_hide_timer(self):
@@ -1131,6 +1361,7 @@ class FullscreenControlDialog(QWidget):
             self.is_visible = False
             self.initial_show = False
             super().hide()
+            self.parent.update_progress_activity()
 
     def init_ui(self):
         main_layout = QVBoxLayout(self)
@@ -1189,7 +1420,7 @@ class FullscreenControlDialog(QWidget):
             if hasattr(self.parent, 'was_playing_before_drag') and self.parent.was_playing_before_drag:
                 self.parent.list_player.play()
                 self.parent.is_paused = False
-                QTimer.singleShot(100, self.parent.ensure_playing_and_set_audio)
+                self.parent.request_audio_settings()
             self.parent.was_playing_before_drag = False
 
         self.slider.mousePressEvent = slider_mouse_press_event
@@ -1203,56 +1434,49 @@ class FullscreenControlDialog(QWidget):
         self.playlist_button = QPushButton()
         self.playlist_button.setObjectName("playlistButton")
         self.playlist_button.setFixedSize(48, 48)
-        self.playlist_button.setIcon(QIcon(resource_path("icons/playlist_icon.png")))
-        self.playlist_button.setToolTip("Playlist (Q)")
+        set_button_state(self.playlist_button, "playlist", "Playlist (Q)")
         self.playlist_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.playlist_button.clicked.connect(self.parent.open_playlist)
         control_layout.addWidget(self.playlist_button)
         self.play_pause_button = QPushButton()
         self.play_pause_button.setObjectName("playButton")
         self.play_pause_button.setFixedSize(48, 48)
-        self.play_pause_button.setIcon(QIcon(resource_path("icons/play_icon.png")))
-        self.play_pause_button.setToolTip("Play (Space)")
+        set_button_state(self.play_pause_button, "play", "Play (Space)")
         self.play_pause_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.play_pause_button.clicked.connect(self.parent.play_pause)
         control_layout.addWidget(self.play_pause_button)
         self.stop_button = QPushButton()
         self.stop_button.setObjectName("stopButton")
         self.stop_button.setFixedSize(48, 48)
-        self.stop_button.setIcon(QIcon(resource_path("icons/stop_icon.png")))
-        self.stop_button.setToolTip("Stop (S)")
+        set_button_state(self.stop_button, "stop", "Stop (S)")
         self.stop_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.stop_button.clicked.connect(self.parent.stop)
         control_layout.addWidget(self.stop_button)
         self.prev_button = QPushButton()
         self.prev_button.setObjectName("prevButton")
         self.prev_button.setFixedSize(48, 48)
-        self.prev_button.setIcon(QIcon(resource_path("icons/prev_icon.png")))
-        self.prev_button.setToolTip("Previous (P)")
+        set_button_state(self.prev_button, "prev", "Previous (P)")
         self.prev_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.prev_button.clicked.connect(self.parent.play_previous)
         control_layout.addWidget(self.prev_button)
         self.next_button = QPushButton()
         self.next_button.setObjectName("nextButton")
         self.next_button.setFixedSize(48, 48)
-        self.next_button.setIcon(QIcon(resource_path("icons/next_icon.png")))
-        self.next_button.setToolTip("Next (N)")
+        set_button_state(self.next_button, "next", "Next (N)")
         self.next_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.next_button.clicked.connect(self.parent.play_next)
         control_layout.addWidget(self.next_button)
         self.repeat_button = QPushButton()
         self.repeat_button.setObjectName("repeatButton")
         self.repeat_button.setFixedSize(48, 48)
-        self.repeat_button.setIcon(QIcon(resource_path(f"icons/repeat_{self.parent.repeat_mode}_icon.png")))
-        self.repeat_button.setToolTip("Loop (L)")
+        set_button_state(self.repeat_button, f"repeat_{self.parent.repeat_mode}", "Loop (L)")
         self.repeat_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.repeat_button.clicked.connect(lambda: self.parent.toggle_repeat(None))
         control_layout.addWidget(self.repeat_button)
         self.mute_button = QPushButton()
         self.mute_button.setObjectName("muteButton")
         self.mute_button.setFixedSize(48, 48)
-        self.mute_button.setIcon(QIcon(resource_path("icons/mute_icon.png" if self.parent.is_muted else "icons/unmute_icon.png")))
-        self.mute_button.setToolTip("Mute (M)")
+        set_button_state(self.mute_button, "mute" if self.parent.is_muted else "unmute", "Mute (M)")
         self.mute_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.mute_button.clicked.connect(self.parent.toggle_mute)
         control_layout.addWidget(self.mute_button)
@@ -1298,8 +1522,7 @@ class FullscreenControlDialog(QWidget):
         self.exit_fullscreen_button = QPushButton()
         self.exit_fullscreen_button.setObjectName("exitFullscreenButton")
         self.exit_fullscreen_button.setFixedSize(48, 48)
-        self.exit_fullscreen_button.setIcon(QIcon(resource_path("icons/exit_fullscreen_icon.png")))
-        self.exit_fullscreen_button.setToolTip("Exit Fullscreen (F)")
+        set_button_state(self.exit_fullscreen_button, "exit_fullscreen", "Exit Fullscreen (F)")
         self.exit_fullscreen_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.exit_fullscreen_button.clicked.connect(self.parent.toggle_fullscreen)
         self.exit_fullscreen_button.setEnabled(bool(self.parent.playlist))
@@ -1348,7 +1571,7 @@ class VideoWindow(QWidget):
         super().__init__()
         self.parent = parent
         self.setStyleSheet("background-color: black;")
-        self.setWindowIcon(QIcon(resource_path("icons/tray_icon.png")))
+        self.setWindowIcon(load_icon("tray"))
         self.setMouseTracking(True)
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
         self.hide_timer = QTimer(self)
@@ -1444,36 +1667,93 @@ class VideoWindow(QWidget):
             event.accept()
 
 class LDBPlayer(QMainWindow):
+    paths_validated = pyqtSignal(object, object)
+    metadata_probed = pyqtSignal(object)
+    thumbnail_ready = pyqtSignal(str)
+    thumbnail_created = pyqtSignal(str, str)
+    update_checked = pyqtSignal(object)
+
+    @property
+    def playlist(self):
+        return self.core.playlist
+
+    @playlist.setter
+    def playlist(self, playlist):
+        self.core.playlist = playlist
+
+    @property
+    def current_video_index(self):
+        return self.core.current_index
+
+    @current_video_index.setter
+    def current_video_index(self, index):
+        self.core.current_index = index
+
+    @property
+    def repeat_mode(self):
+        return self.core.repeat_mode
+
+    @repeat_mode.setter
+    def repeat_mode(self, mode):
+        self.core.repeat_mode = mode
+
+    @property
+    def is_paused(self):
+        return self.core.is_paused
+
+    @is_paused.setter
+    def is_paused(self, paused):
+        self.core.is_paused = paused
+
     def __init__(self):
         super().__init__()
-        self.setWindowIcon(QIcon(resource_path("icons/tray_icon.png")))
+        self.setWindowIcon(load_icon("tray"))
         self.setWindowTitle("LDB Player")
         self.setWindowOpacity(0.9)
         self.original_wallpaper = self.get_current_wallpaper()
         self.original_bg_color = self.get_current_bg_color()
-        self.repeat_mode = 'one'
         self.is_muted = False
-        self.original_playlist = []
+        self.original_playlist = PlaylistModel()
         self.last_video_dir = None
         instance_args = "--no-plugins-cache --quiet"
-        self.instance = vlc.Instance(instance_args)
-        self.media_list = self.instance.media_list_new()
-        self.list_player = self.instance.media_list_player_new()
-        self.player = self.list_player.get_media_player()
-        self.list_player.set_playback_mode(vlc.PlaybackMode.repeat)
-        self.playlist = []
-        self.current_video_index = 0
-        self.is_paused = False
+        self.backend = VlcBackend(instance_args)
+        self.instance = self.backend.instance
+        self.media_list = self.backend.media_list
+        self.list_player = self.backend.list_player
+        self.player = self.backend.player
+        self.core = PlaybackCore(self.backend)
         self.is_fullscreen = False
         self.fullscreen_enabled = False
         self.config_dir = os.path.join(pathlib.Path.home(), 'AppData', 'Local', 'LDBPlayer')
         self.config_file = os.path.join(self.config_dir, 'ldb_player_config.json')
+        self.playlist_file = os.path.join(self.config_dir, 'ldb_player_playlist.json')
+        self.config_writer = ConfigWriter(self.config_file, self.playlist_file, CONFIG_WRITE_DELAY)
+        QApplication.instance().aboutToQuit.connect(self.config_writer.close)
+        QApplication.instance().commitDataRequest.connect(self.commit_session)
+        self._path_validator = None
+        self.paths_validated.connect(self.drop_missing_paths)
+        self._metadata_prober = None
+        self._thumbnails = None
+        self._thumbnail_placeholder = None
+        self.thumbnail_settings = {}
+        self.thumbnail_icons = collections.OrderedDict()
+        self.thumbnail_created.connect(self.store_thumbnail)
+        self.update_checker = UpdateChecker(VERSION, os.path.join(self.config_dir, 'ldb_player_update.json'))
+        self.update_checked.connect(self.handle_update_result)
         self.volume_debounce_timer = QTimer(self)
         self.volume_debounce_timer.setSingleShot(True)
-        self.skip_audio_poll = False
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_slider)
-        self.timer.start(100)
+        self.audio_applier = AudioApplier(self.apply_audio_settings, self.is_audio_ready, AUDIO_APPLY_TIMEOUT)
+        self.progress_tracker = ProgressTracker()
+        self.progress_events_attached = False
+        self.event_bridge = EventBridge(lambda: QApplication.postEvent(self, BridgeEvent()))
+        self.event_bridge.register('playing', self.handle_playing_event)
+        self.event_bridge.register('stopped', self.handle_stop_event)
+        self.event_bridge.register('error', self.handle_error_event)
+        self.event_bridge.register('end_reached', self.handle_end_reached_event)
+        self.event_bridge.register('audio_ready', self.handle_audio_ready, coalesce=True)
+        self.event_bridge.register('progress', self.schedule_progress_refresh, coalesce=True)
+        self.state_store = StateStore()
+        self.elided_text = None
         self.dragging = False
         self.drag_position = QPoint()
         self.setAcceptDrops(True)
@@ -1486,27 +1766,81 @@ class LDBPlayer(QMainWindow):
         self.init_ui()
         self.installEventFilter(self)
         self.central_frame.installEventFilter(self)
-        self.init_system_tray()
+        QTimer.singleShot(0, self.init_system_tray)
+        self.state_store.subscribe(('playback', 'has_playlist'), self.apply_tray_state)
+        self.state_store.subscribe(('playback', 'has_playlist', 'fullscreen_enabled'), self.apply_fullscreen_button_state)
+        self.state_store.subscribe(('is_paused', 'is_muted', 'volume', 'repeat_mode', 'video_name'), self.apply_control_dialog_state)
         self.load_config()
-        self.session = requests.Session()
-        self.update_tray_actions()
+        self.core.on_change = self.save_config
+        self._session = None
+        self.publish_state()
         if self.current_wallpaper == "" and self.playback_state in ['playing', 'paused']:
             self.original_wallpaper = self.saved_original_wallpaper
             self.original_bg_color = self.saved_original_bg_color
         self.event_manager = self.player.event_manager()
-        self.event_manager.event_attach(vlc.EventType.MediaPlayerPlaying, lambda event: self.handle_playing_event(event))
-        self.event_manager.event_attach(vlc.EventType.MediaPlayerStopped, lambda event: self.handle_stop_event(event))
-        self.event_manager.event_attach(vlc.EventType.MediaPlayerEncounteredError, lambda event: self.handle_error_event(event))
-        self.event_manager.event_attach(vlc.EventType.MediaPlayerEndReached, lambda event: self.handle_end_reached_event(event))
-        self.update_tray_actions()
-        if self.fullscreen_enabled:
-            self.fullscreen_control_dialog = FullscreenControlDialog(self)
-            self.fullscreen_control_dialog.hide()
+        self.event_manager.event_attach(vlc.EventType.MediaPlayerPlaying, lambda event: self.event_bridge.post('playing'))
+        self.event_manager.event_attach(vlc.EventType.MediaPlayerStopped, lambda event: self.event_bridge.post('stopped'))
+        self.event_manager.event_attach(vlc.EventType.MediaPlayerEncounteredError, lambda event: self.event_bridge.post('error'))
+        self.backend.on_end_reached = lambda event: self.event_bridge.post('end_reached')
+        self.event_manager.event_attach(vlc.EventType.MediaPlayerESAdded, lambda event: self.event_bridge.post('audio_ready'))
+        self.update_progress_activity()
+        self.publish_state()
         self.autoplay_last_video()
-        self.update_tray_actions()
+        self.publish_state()
         if '--autostart' not in sys.argv:
             QTimer.singleShot(50, self.bring_to_front)
 
+    @property
+    def session(self):
+        if self._session is None:
+            from downloader import pooled_session
+            self._session = pooled_session()
+        return self._session
+
+    @property
+    def path_validator(self):
+        if self._path_validator is None:
+            from path_validator import PathValidator
+            self._path_validator = PathValidator(os.path.join(self.config_dir, 'ldb_player_paths.json'))
+        return self._path_validator
+
+    @property
+    def metadata_prober(self):
+        if self._metadata_prober is None:
+            from metadata_prober import MetadataProber
+            self._metadata_prober = MetadataProber(self.backend.probe_media, os.path.join(self.config_dir, 'ldb_player_media.json'))
+        return self._metadata_prober
+
+    @property
+    def thumbnails(self):
+        if self._thumbnails is None:
+            from thumbnails import ThumbnailCache, ThumbnailService, THUMBNAIL_TIME, THUMBNAIL_QUOTA
+            quota = self.thumbnail_settings.get('thumbnail_cache_mb', THUMBNAIL_QUOTA // (1024 * 1024)) * 1024 * 1024
+            self.thumbnail_cache = ThumbnailCache(os.path.join(self.config_dir, 'thumbnails'), quota)
+            self._thumbnails = ThumbnailService(self.backend.grab_frame, self.thumbnail_cache,
+                                                timestamp=self.thumbnail_settings.get('thumbnail_time', THUMBNAIL_TIME),
+                                                duration_lookup=self.metadata_prober.duration)
+        return self._thumbnails
+
+    @property
+    def thumbnail_placeholder(self):
+        if self._thumbnail_placeholder is None:
+            placeholder = QPixmap(THUMBNAIL_ICON_SIZE)
+            placeholder.fill(Qt.GlobalColor.transparent)
+            self._thumbnail_placeholder = QIcon(placeholder)
+        return self._thumbnail_placeholder
+
+    def validate_playlist(self):
+        if self.original_playlist:
+            self.path_validator.validate(self.original_playlist.to_list(), self.paths_validated.emit)
+
+    def ensure_control_dialog(self):
+        if self.fullscreen_enabled and not hasattr(self, 'fullscreen_control_dialog'):
+            self.fullscreen_control_dialog = FullscreenControlDialog(self)
+            self.fullscreen_control_dialog.hide()
+            self.state_store.resend(self.apply_control_dialog_state)
+            self.state_store.resend(self.apply_fullscreen_button_state)
+
     def bring_to_front(self):
         self.show()
         self.raise_()
@@ -1514,24 +1848,72 @@ class LDBPlayer(QMainWindow):
         self.setFocus()
 
     def truncate_label_text(self, text):
-        font_metrics = self.current_video_label.fontMetrics()
         available_width = self.current_video_label.width()
+        if self.elided_text is not None and self.elided_text[:2] == (text, available_width):
+            return self.elided_text[2]
+        font_metrics = self.current_video_label.fontMetrics()
         truncated_text = font_metrics.elidedText(text, Qt.TextElideMode.ElideRight, available_width)
         if font_metrics.horizontalAdvance(text) > available_width:
             self.current_video_label.setToolTip(text)
         else:
             self.current_video_label.setToolTip("")
+        self.elided_text = (text, available_width, truncated_text)
         return truncated_text
 
-    def is_duplicate_file(self, new_file, existing_files):
-        new_name = os.path.basename(new_file)
-        new_dir = os.path.dirname(new_file)
-        for existing_file in existing_files:
-            existing_name = os.path.basename(existing_file)
-            existing_dir = os.path.dirname(existing_file)
-            if new_name == existing_name and new_dir == existing_dir:
-                return True
-        return False
+    def snapshot_state(self):
+        state = self.player.get_state()
+        if state == vlc.State.Playing:
+            playback = 'playing'
+        elif state == vlc.State.Paused:
+            playback = 'paused'
+        else:
+            playback = 'stopped'
+        if self.playlist and 0 <= self.current_video_index < len(self.playlist):
+            video_name = os.path.basename(self.playlist[self.current_video_index])
+        else:
+            video_name = None
+        return PlayerState(
+            playback=playback,
+            is_paused=self.is_paused,
+            has_playlist=bool(self.playlist),
+            video_name=video_name,
+            volume=self.volume_slider.value(),
+            is_muted=self.is_muted,
+            repeat_mode=self.repeat_mode,
+            fullscreen_enabled=self.fullscreen_enabled,
+        )
+
+    def publish_state(self):
+        return self.state_store.publish(self.snapshot_state())
+
+    def apply_tray_state(self, state, changed):
+        if getattr(self, 'play_action', None) and getattr(self, 'stop_action', None):
+            self.play_action.setEnabled(state.has_playlist and state.playback != 'playing')
+            self.stop_action.setEnabled(state.has_playlist and state.playback in ('playing', 'paused'))
+
+    def apply_fullscreen_button_state(self, state, changed):
+        if not state.fullscreen_enabled:
+            return
+        is_playable = state.has_playlist and state.playback in ('playing', 'paused')
+        self.fullscreen_button.setEnabled(is_playable)
+        if hasattr(self, 'fullscreen_control_dialog') and not sip.isdeleted(self.fullscreen_control_dialog):
+            self.fullscreen_control_dialog.exit_fullscreen_button.setEnabled(is_playable)
+
+    def apply_control_dialog_state(self, state, changed):
+        if not hasattr(self, 'fullscreen_control_dialog') or sip.isdeleted(self.fullscreen_control_dialog):
+            return
+        dialog = self.fullscreen_control_dialog
+        if 'is_paused' in changed:
+            set_button_state(dialog.play_pause_button, "play" if state.is_paused else "pause", "Play (Space)" if state.is_paused else "Pause (Space)")
+        if 'is_muted' in changed:
+            set_button_state(dialog.mute_button, "mute" if state.is_muted else "unmute", "Unmute (M)" if state.is_muted else "Mute (M)")
+        if 'volume' in changed:
+            dialog.volume_slider.setValue(state.volume)
+            dialog.volume_label.setText(self.volume_label.text())
+        if 'repeat_mode' in changed:
+            set_button_state(dialog.repeat_button, f"repeat_{state.repeat_mode}")
+        if 'video_name' in changed and state.video_name is not None:
+            dialog.current_video_label.setText(self.truncate_label_text(state.video_name))
 
     def dragEnterEvent(self, event):
         if QApplication.activeModalWidget():
@@ -1572,9 +1954,8 @@ class LDBPlayer(QMainWindow):
             was_playing = state in (vlc.State.Playing, vlc.State.Paused)
             was_paused = state == vlc.State.Paused
             was_empty = not self.playlist
-            new_files = [f for f in files if not self.is_duplicate_file(f, self.playlist)]
-            self.playlist.extend(new_files)
-            self.original_playlist.extend(new_files)
+            new_files = self.playlist.add_many(files)
+            self.original_playlist.add_many(new_files)
             self.save_config()
             self.load_playlist()
             if was_empty:
@@ -1582,30 +1963,27 @@ class LDBPlayer(QMainWindow):
                 if not hasattr(self, 'video_window') or not self.video_window or sip.isdeleted(self.video_window):
                     self.setup_video_window(is_fullscreen=self.is_fullscreen)
                 self.video_window.show()
-                self.list_player.play_item_at_index(self.current_video_index)
-                self.play_pause_button.setIcon(QIcon(resource_path("icons/pause_icon.png")))
-                self.play_pause_button.setToolTip("Pause (Space)")
+                self.core.play_index(self.current_video_index)
+                set_button_state(self.play_pause_button, "pause", "Pause (Space)")
                 self.is_paused = False
                 video_name = os.path.basename(self.playlist[self.current_video_index])
                 self.current_video_label.setText(self.truncate_label_text(video_name))
-                QTimer.singleShot(100, self.ensure_playing_and_set_audio)
+                self.request_audio_settings()
             elif was_playing:
                 if was_paused:
-                    self.play_pause_button.setIcon(QIcon(resource_path("icons/play_icon.png")))
-                    self.play_pause_button.setToolTip("Play (Space)")
+                    set_button_state(self.play_pause_button, "play", "Play (Space)")
                     self.is_paused = True
                     video_name = os.path.basename(self.playlist[self.current_video_index])
                     self.current_video_label.setText(self.truncate_label_text(video_name))
                 else:
-                    self.play_pause_button.setIcon(QIcon(resource_path("icons/pause_icon.png")))
-                    self.play_pause_button.setToolTip("Pause (Space)")
+                    set_button_state(self.play_pause_button, "pause", "Pause (Space)")
                     self.is_paused = False
                     video_name = os.path.basename(self.playlist[self.current_video_index])
                     self.current_video_label.setText(self.truncate_label_text(video_name))
-                    QTimer.singleShot(100, self.ensure_playing_and_set_audio)
+                    self.request_audio_settings()
                 self.video_window.show()
             event.acceptProposedAction()
-            self.update_control_dialog()
+            self.publish_state()
         else:
             event.ignore()
 
@@ -1698,7 +2076,7 @@ class LDBPlayer(QMainWindow):
             if hasattr(self, 'was_playing_before_drag') and self.was_playing_before_drag:
                 self.list_player.play()
                 self.is_paused = False
-                QTimer.singleShot(100, self.ensure_playing_and_set_audio)
+                self.request_audio_settings()
             self.was_playing_before_drag = False
 
         from functools import partial
@@ -1713,43 +2091,37 @@ class LDBPlayer(QMainWindow):
         self.playlist_button = QPushButton()
         self.playlist_button.setObjectName("playlistButton")
         self.playlist_button.setFixedSize(48, 48)
-        self.playlist_button.setIcon(QIcon(resource_path("icons/playlist_icon.png")))
-        self.playlist_button.setToolTip("Playlist (Q)")
+        set_button_state(self.playlist_button, "playlist", "Playlist (Q)")
         self.playlist_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.playlist_button.clicked.connect(self.open_playlist)
         self.play_pause_button = QPushButton()
         self.play_pause_button.setObjectName("playButton")
         self.play_pause_button.setFixedSize(48, 48)
-        self.play_pause_button.setIcon(QIcon(resource_path("icons/play_icon.png")))
-        self.play_pause_button.setToolTip("Play (Space)")
+        set_button_state(self.play_pause_button, "play", "Play (Space)")
         self.play_pause_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.play_pause_button.clicked.connect(self.play_pause)
         self.stop_button = QPushButton()
         self.stop_button.setObjectName("stopButton")
         self.stop_button.setFixedSize(48, 48)
-        self.stop_button.setIcon(QIcon(resource_path("icons/stop_icon.png")))
-        self.stop_button.setToolTip("Stop (S)")
+        set_button_state(self.stop_button, "stop", "Stop (S)")
         self.stop_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.stop_button.clicked.connect(self.stop)
         self.prev_button = QPushButton()
         self.prev_button.setObjectName("prevButton")
         self.prev_button.setFixedSize(48, 48)
-        self.prev_button.setIcon(QIcon(resource_path("icons/prev_icon.png")))
-        self.prev_button.setToolTip("Previous (P)")
+        set_button_state(self.prev_button, "prev", "Previous (P)")
         self.prev_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.prev_button.clicked.connect(self.play_previous)
         self.next_button = QPushButton()
         self.next_button.setObjectName("nextButton")
         self.next_button.setFixedSize(48, 48)
-        self.next_button.setIcon(QIcon(resource_path("icons/next_icon.png")))
-        self.next_button.setToolTip("Next (N)")
+        set_button_state(self.next_button, "next", "Next (N)")
         self.next_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.next_button.clicked.connect(self.play_next)
         self.repeat_button = QPushButton()
         self.repeat_button.setObjectName("repeatButton")
         self.repeat_button.setFixedSize(48, 48)
-        self.repeat_button.setIcon(QIcon(resource_path(f"icons/repeat_{self.repeat_mode}_icon.png")))
-        self.repeat_button.setToolTip("Loop (L)")
+        set_button_state(self.repeat_button, f"repeat_{self.repeat_mode}", "Loop (L)")
         self.repeat_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.repeat_button.clicked.connect(lambda: self.toggle_repeat(None))
         control_layout.addWidget(self.playlist_button)
@@ -1764,8 +2136,7 @@ class LDBPlayer(QMainWindow):
         self.mute_button = QPushButton()
         self.mute_button.setObjectName("muteButton")
         self.mute_button.setFixedSize(48, 48)
-        self.mute_button.setIcon(QIcon(resource_path("icons/mute_icon.png" if self.is_muted else "icons/unmute_icon.png")))
-        self.mute_button.setToolTip("Mute (M)")
+        set_button_state(self.mute_button, "mute" if self.is_muted else "unmute", "Mute (M)")
         self.mute_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.mute_button.clicked.connect(self.toggle_mute)
         self.volume_slider = QSlider(Qt.Orientation.Horizontal)
@@ -1805,8 +2176,7 @@ class LDBPlayer(QMainWindow):
         self.fullscreen_button = QPushButton()
         self.fullscreen_button.setObjectName("fullscreenButton")
         self.fullscreen_button.setFixedSize(48, 48)
-        self.fullscreen_button.setIcon(QIcon(resource_path("icons/fullscreen_icon.png")))
-        self.fullscreen_button.setToolTip("Fullscreen (F)")
+        set_button_state(self.fullscreen_button, "fullscreen", "Fullscreen (F)")
         self.fullscreen_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.fullscreen_button.clicked.connect(self.toggle_fullscreen)
         self.fullscreen_button.setEnabled(bool(self.playlist))
@@ -1814,15 +2184,13 @@ class LDBPlayer(QMainWindow):
         settings_button = QPushButton()
         settings_button.setObjectName("settingsButton")
         settings_button.setFixedSize(48, 48)
-        settings_button.setIcon(QIcon(resource_path("icons/settings_icon.png")))
-        settings_button.setToolTip("Settings (F12)")
+        set_button_state(settings_button, "settings", "Settings (F12)")
         settings_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         settings_button.clicked.connect(self.open_settings)
         about_button = QPushButton()
         about_button.setObjectName("aboutButton")
         about_button.setFixedSize(48, 48)
-        about_button.setIcon(QIcon(resource_path("icons/about_icon.png")))
-        about_button.setToolTip("About (F1)")
+        set_button_state(about_button, "about", "About (F1)")
         about_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         about_button.clicked.connect(self.open_about)
         volume_layout.addWidget(self.mute_button)
@@ -1840,16 +2208,6 @@ class LDBPlayer(QMainWindow):
         self.setMinimumSize(550, 250)
         QTimer.singleShot(0, self.adjustSize)
 
-    def update_fullscreen_button_state(self):
-        if not self.fullscreen_enabled:
-            return
-        state = self.player.get_state()
-        has_playlist = bool(self.playlist)
-        is_playable = has_playlist and state in (vlc.State.Playing, vlc.State.Paused)
-        self.fullscreen_button.setEnabled(is_playable)
-        if hasattr(self, 'fullscreen_control_dialog') and not sip.isdeleted(self.fullscreen_control_dialog):
-            self.fullscreen_control_dialog.exit_fullscreen_button.setEnabled(is_playable)
-
     def eventFilter(self, obj, event):
         if event.type() == QEvent.Type.MouseButtonPress:
             if obj in (self, self.central_frame):
@@ -1907,8 +2265,8 @@ class LDBPlayer(QMainWindow):
         super().keyPressEvent(event)
 
     def customEvent(self, event):
-        if event.type() == CustomEvent.EVENT_TYPE:
-            self.update_ui(event.video_name, event.index)
+        if event.type() == BridgeEvent.EVENT_TYPE:
+            self.event_bridge.drain()
 
     def init_system_tray(self):
         self.tray_icon = QSystemTrayIcon(self)
@@ -1946,37 +2304,25 @@ class LDBPlayer(QMainWindow):
         quit_action = QAction("Quit", self)
         quit_action.triggered.connect(self.quit_application)
         tray_menu.addAction(quit_action)
-        self.tray_icon.setIcon(QIcon(resource_path("icons/tray_icon.png")))
+        self.tray_icon.setIcon(load_icon("tray"))
         self.tray_icon.setContextMenu(tray_menu)
         self.tray_icon.activated.connect(self.tray_activated)
         self.tray_icon.show()
+        self.state_store.resend(self.apply_tray_state)
 
     def tray_play(self):
-        if not self.playlist or self.media_list.count() == 0:
+        if not self.core.can_play():
             return
         if not hasattr(self, 'video_window') or not self.video_window or sip.isdeleted(self.video_window):
             self.setup_video_window(is_fullscreen=self.is_fullscreen)
         self.video_window.show()
         if self.is_paused or self.player.get_state() != vlc.State.Playing:
-            self.list_player.play_item_at_index(self.current_video_index)
-            self.play_pause_button.setIcon(QIcon(resource_path("icons/pause_icon.png")))
-            self.play_pause_button.setToolTip("Pause (Space)")
-            self.is_paused = False
+            self.core.play_index(self.current_video_index)
+            set_button_state(self.play_pause_button, "pause", "Pause (Space)")
             video_name = os.path.basename(self.playlist[self.current_video_index])
             self.current_video_label.setText(self.truncate_label_text(video_name))
-            QTimer.singleShot(100, self.ensure_playing_and_set_audio)
-        self.save_config()
-        self.update_tray_actions()
-        self.update_control_dialog()
-        self.update_fullscreen_button_state()
-
-    def update_tray_actions(self):
-        if self.play_action and self.stop_action:
-            state = self.player.get_state()
-            has_playlist = bool(self.playlist)
-            is_playing = state == vlc.State.Playing
-            self.play_action.setEnabled(has_playlist and not is_playing)
-            self.stop_action.setEnabled(has_playlist and (is_playing or state == vlc.State.Paused))
+            self.request_audio_settings()
+        self.publish_state()
 
     def restore_window(self):
         if self.isMinimized():
@@ -2053,6 +2399,7 @@ class LDBPlayer(QMainWindow):
     def toggle_fullscreen(self):
         if not self.fullscreen_enabled:
             return
+        self.ensure_control_dialog()
         if hasattr(self, 'is_toggling') and self.is_toggling:
             return
         self.is_toggling = True
@@ -2080,21 +2427,17 @@ class LDBPlayer(QMainWindow):
                 if was_paused:
                     self.list_player.pause()
                     self.is_paused = True
-                    self.play_pause_button.setIcon(QIcon(resource_path("icons/play_icon.png")))
-                    self.play_pause_button.setToolTip("Play (Space)")
+                    set_button_state(self.play_pause_button, "play", "Play (Space)")
                 else:
                     self.is_paused = False
-                    self.play_pause_button.setIcon(QIcon(resource_path("icons/pause_icon.png")))
-                    self.play_pause_button.setToolTip("Pause (Space)")
-                QTimer.singleShot(100, self.ensure_playing_and_set_audio)
+                    set_button_state(self.play_pause_button, "pause", "Pause (Space)")
+                self.request_audio_settings()
                 self.current_video_label.setText(self.truncate_label_text(video_name))
             else:
-                self.play_pause_button.setIcon(QIcon(resource_path("icons/play_icon.png")))
-                self.play_pause_button.setToolTip("Play (Space)")
+                set_button_state(self.play_pause_button, "play", "Play (Space)")
                 self.is_paused = False
                 self.current_video_label.setText(self.truncate_label_text("No video playing" if self.playlist else "Playlist is empty"))
-            self.fullscreen_button.setIcon(QIcon(resource_path("icons/exit_fullscreen_icon.png" if self.is_fullscreen else "icons/fullscreen_icon.png")))
-            self.fullscreen_button.setToolTip("Exit Fullscreen (F)" if self.is_fullscreen else "Fullscreen (F)")
+            set_button_state(self.fullscreen_button, "exit_fullscreen" if self.is_fullscreen else "fullscreen", "Exit Fullscreen (F)" if self.is_fullscreen else "Fullscreen (F)")
             self._finalize_toggle()
         finally:
             self.is_toggling = False
@@ -2111,82 +2454,58 @@ class LDBPlayer(QMainWindow):
                 self.fullscreen_control_dialog.hide()
             self.show()
 
-    def update_control_dialog(self):
-        if not self.fullscreen_enabled:
-            return
-        if hasattr(self, 'is_toggling_fullscreen') and self.is_toggling_fullscreen:
-            return
-        if hasattr(self, 'fullscreen_control_dialog') and not sip.isdeleted(self.fullscreen_control_dialog) and self.is_fullscreen:
-            try:
-                self.fullscreen_control_dialog.slider.setValue(int(self.player.get_position() * 1000))
-                self.fullscreen_control_dialog.play_pause_button.setIcon(
-                    QIcon(resource_path("icons/play_icon.png" if self.is_paused else "icons/pause_icon.png"))
-                )
-                self.fullscreen_control_dialog.play_pause_button.setToolTip(
-                    "Play (Space)" if self.is_paused else "Pause (Space)"
-                )
-                self.fullscreen_control_dialog.mute_button.setIcon(
-                    QIcon(resource_path("icons/mute_icon.png" if self.is_muted else "icons/unmute_icon.png"))
-                )
-                self.fullscreen_control_dialog.mute_button.setToolTip(
-                    "Unmute (M)" if self.is_muted else "Mute (M)"
-                )
-                self.fullscreen_control_dialog.volume_slider.setValue(self.volume_slider.value())
-                self.fullscreen_control_dialog.volume_label.setText(self.volume_label.text())
-                self.fullscreen_control_dialog.duration_label.setText(self.duration_label.text())
-                self.fullscreen_control_dialog.repeat_button.setIcon(
-                    QIcon(resource_path(f"icons/repeat_{self.repeat_mode}_icon.png"))
-                )
-                video_name = os.path.basename(self.playlist[self.current_video_index])
-                self.fullscreen_control_dialog.current_video_label.setText(self.truncate_label_text(video_name))
-            except Exception:
-                pass
-
     def load_config(self):
         os.makedirs(self.config_dir, exist_ok=True)
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                self.original_playlist = [f for f in config.get('playlist', []) if os.path.exists(f)]
-                self.playlist = self.original_playlist.copy()
-                self.current_video_index = config.get('current_video_index', 0)
-                self.repeat_mode = config.get('repeat_mode', 'one')
-                self.last_video_dir = config.get('last_video_dir', None)
-                volume = config.get('volume', 100)
-                self.volume_slider.setValue(volume)
-                self.volume_label.setText(f"{volume}%")
-                self.is_muted = config.get('is_muted', False)
-                self.mute_button.setIcon(QIcon(resource_path("icons/mute_icon.png" if self.is_muted else "icons/unmute_icon.png")))
-                self.mute_button.setToolTip("Mute (M)" if not self.is_muted else "Unmute (M)")
-                self.repeat_button.setIcon(QIcon(resource_path(f"icons/repeat_{self.repeat_mode}_icon.png")))
-                try:
-                    self.player.audio_set_mute(self.is_muted)
-                except:
-                    pass
-                window_pos = config.get('window_pos', None)
-                window_size = config.get('window_size', None)
-                if window_pos and window_size:
-                    self.resize(QSize(window_size['width'], window_size['height']))
-                    self.move(QPoint(window_pos['x'], window_pos['y']))
-                    self.adjust_position()
-                self.playback_state = config.get('playback_state', 'stopped')
-                self.saved_original_wallpaper = config.get('saved_original_wallpaper', self.original_wallpaper)
-                self.saved_original_bg_color = config.get('saved_original_bg_color', self.original_bg_color)
-                if self.repeat_mode not in ['one', 'all']:
-                    self.repeat_mode = 'one'
-                if self.current_video_index >= len(self.playlist):
-                    self.current_video_index = 0
-                self.load_playlist()
-                if self.repeat_mode == 'one':
-                    self.list_player.set_playback_mode(vlc.PlaybackMode.repeat)
-                else:
-                    self.list_player.set_playback_mode(vlc.PlaybackMode.loop)
+            config, entries, digest = read_config(self.config_file, self.playlist_file)
+            self.config_writer.playlist_hash = digest
+            self.original_playlist = PlaylistModel(entries)
+            self.playlist = self.original_playlist.copy()
+            self.core.restore(config)
+            self.last_video_dir = config.get('last_video_dir', None)
+            self.thumbnail_settings = {key: config[key] for key in ('thumbnail_time', 'thumbnail_cache_mb') if key in config}
+            volume = config.get('volume', 100)
+            self.volume_slider.setValue(volume)
+            self.volume_label.setText(f"{volume}%")
+            self.is_muted = config.get('is_muted', False)
+            set_button_state(self.mute_button, "mute" if self.is_muted else "unmute", "Mute (M)" if not self.is_muted else "Unmute (M)")
+            set_button_state(self.repeat_button, f"repeat_{self.repeat_mode}")
+            try:
+                self.player.audio_set_mute(self.is_muted)
+            except:
+                pass
+            window_pos = config.get('window_pos', None)
+            window_size = config.get('window_size', None)
+            if window_pos and window_size:
+                self.resize(QSize(window_size['width'], window_size['height']))
+                self.move(QPoint(window_pos['x'], window_pos['y']))
+                self.adjust_position()
+            self.playback_state = config.get('playback_state', 'stopped')
+            self.saved_original_wallpaper = config.get('saved_original_wallpaper', self.original_wallpaper)
+            self.saved_original_bg_color = config.get('saved_original_bg_color', self.original_bg_color)
+            self.load_playlist()
+            QTimer.singleShot(0, self.validate_playlist)
         except (FileNotFoundError, json.JSONDecodeError):
-            self.repeat_mode = 'one'
+            self.core.set_repeat_mode('one')
             self.playback_state = 'stopped'
-            self.list_player.set_playback_mode(vlc.PlaybackMode.repeat)
             self.current_video_label.setText(self.truncate_label_text("Playlist is empty"))
 
+    def drop_missing_paths(self, missing, unavailable):
+        if unavailable:
+            logging.error(f"Could not check {len(unavailable)} playlist entries, volume not responding")
+        if not missing:
+            return
+        if self.player.get_state() in (vlc.State.Playing, vlc.State.Paused) and 0 <= self.current_video_index < len(self.playlist):
+            current = self.playlist[self.current_video_index]
+            missing = [path for path in missing if path != current]
+        removed = self.playlist.remove_paths(missing)
+        self.original_playlist.remove_paths(missing)
+        if not removed:
+            return
+        self.current_video_index -= bisect.bisect_left(removed, self.current_video_index)
+        self.load_playlist()
+        self.save_config()
+
     def save_config(self):
         state = self.player.get_state()
         if state == vlc.State.Playing:
@@ -2196,7 +2515,6 @@ class LDBPlayer(QMainWindow):
         else:
             playback_state = 'stopped'
         config = {
-            'playlist': self.original_playlist,
             'current_video_index': self.current_video_index,
             'repeat_mode': self.repeat_mode,
             'volume': self.volume_slider.value(),
@@ -2208,8 +2526,17 @@ class LDBPlayer(QMainWindow):
             'saved_original_wallpaper': self.original_wallpaper,
             'saved_original_bg_color': self.original_bg_color,
         }
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            json.dump(config, f)
+        if self._thumbnails is not None:
+            self.thumbnail_settings = {
+                'thumbnail_time': self._thumbnails.timestamp,
+                'thumbnail_cache_mb': self.thumbnail_cache.quota // (1024 * 1024),
+            }
+        config.update(self.thumbnail_settings)
+        self.config_writer.save(config, self.original_playlist)
+
+    def commit_session(self, manager):
+        self.save_config()
+        self.config_writer.flush()
 
     def adjust_position(self):
         screen = QApplication.primaryScreen().availableGeometry()
@@ -2224,12 +2551,19 @@ class LDBPlayer(QMainWindow):
             window_rect.moveTop(screen.top())
         self.setGeometry(window_rect)
 
-    def ensure_playing_and_set_audio(self):
-        if self.player.get_state() in (vlc.State.Playing, vlc.State.Paused):
-            self.set_volume(self.volume_slider.value())
-            self.player.audio_set_mute(self.is_muted)
-        else:
-            QTimer.singleShot(50, self.ensure_playing_and_set_audio)
+    def request_audio_settings(self):
+        if self.audio_applier.request():
+            QTimer.singleShot(int(AUDIO_APPLY_TIMEOUT * 1000), self.audio_applier.expire)
+
+    def is_audio_ready(self):
+        return self.player.get_state() in (vlc.State.Playing, vlc.State.Paused)
+
+    def apply_audio_settings(self):
+        self.set_volume(self.volume_slider.value())
+        self.player.audio_set_mute(self.is_muted)
+
+    def handle_audio_ready(self, payload=None):
+        self.audio_applier.notify_ready()
 
     def autoplay_last_video(self):
         if (self.playback_state in ['playing', 'paused'] and self.repeat_mode in ['one', 'all'] and
@@ -2240,17 +2574,16 @@ class LDBPlayer(QMainWindow):
             if not hasattr(self, 'video_window') or not self.video_window or sip.isdeleted(self.video_window):
                 self.setup_video_window(is_fullscreen=self.is_fullscreen)
             self.video_window.show()
-            QTimer.singleShot(200, lambda: self.list_player.play_item_at_index(self.current_video_index))
-            self.play_pause_button.setIcon(QIcon(resource_path("icons/pause_icon.png")))
-            self.play_pause_button.setToolTip("Pause (Space)")
+            QTimer.singleShot(200, lambda: self.core.play_index(self.current_video_index))
+            set_button_state(self.play_pause_button, "pause", "Pause (Space)")
             self.is_paused = False
             video_name = os.path.basename(self.playlist[self.current_video_index])
             self.current_video_label.setText(self.truncate_label_text(video_name))
-            QTimer.singleShot(300, self.ensure_playing_and_set_audio)
+            self.request_audio_settings()
         else:
             if hasattr(self, 'video_window') and self.video_window:
                 self.video_window.hide()
-            self.update_tray_actions()
+            self.publish_state()
 
     def open_settings(self):
         try:
@@ -2262,24 +2595,17 @@ class LDBPlayer(QMainWindow):
             dialog.exec()
 
     def check_for_updates(self):
-        url = "https://api.github.com/repos/kakao90g/ldb_player/releases/latest"
-        try:
-            response = self.session.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            latest_version = data['tag_name'].lstrip('v')
-            current_version = VERSION
-            if latest_version == current_version:
-                dialog = MessageDialog(self, "Update Check", "Version is up to date.")
-                dialog.exec()
-            elif tuple(map(int, latest_version.split("."))) > tuple(map(int, current_version.split("."))):
-                self.show_update_dialog(latest_version)
-            else:
-                dialog = MessageDialog(self, "Update Check", "Version is up to date.")
-                dialog.exec()
-        except Exception as e:
-            logging.error(f"Failed to check for updates: {str(e)}")
-            dialog = MessageDialog(self, "Update Check", "Unable to check for updates.")
+        if not self.update_checker.running:
+            self.update_checker.check(self.update_checked.emit, force=True)
+
+    def handle_update_result(self, result):
+        if result['error']:
+            dialog = MessageDialog(self, "Update Check", f"Unable to check for updates: {result['error']}")
+            dialog.exec()
+        elif result['newer']:
+            self.show_update_dialog(result['version'])
+        else:
+            dialog = MessageDialog(self, "Update Check", "Version is up to date.")
             dialog.exec()
 
     def show_update_dialog(self, new_version):
@@ -2288,10 +2614,15 @@ class LDBPlayer(QMainWindow):
             dialog = LinkMessageDialog(self, "Update Check", "Please download the latest release from:", link="https://github.com/kakao90g/ldb_player/releases")
             dialog.exec()
             return
+        import subprocess
+        from downloader import download_segmented, asset_sha256, logging_progress
         updater_path = os.path.join(os.path.dirname(current_exe), "updater.exe")
         github_link = "https://github.com/kakao90g/ldb_player/releases"
+        release = self.update_checker.release()
         def run_updater():
-            subprocess.Popen([updater_path, new_version])
+            expected_sha256 = asset_sha256(release, "LDBPlayer.exe")
+            subprocess.Popen([updater_path, new_version] + ([expected_sha256] if expected_sha256 else []),
+                             env=handshake_environment())
             self.quit_application()
         def on_no():
             dialog = LinkMessageDialog(self, "Update", "Please download from:", link=github_link)
@@ -2306,14 +2637,9 @@ class LDBPlayer(QMainWindow):
             def download_and_run():
                 try:
                     updater_url = f"https://github.com/kakao90g/ldb_player/releases/latest/download/updater.exe"
-                    response = self.session.get(updater_url, headers={"User-Agent": "Mozilla/5.0"}, timeout=30, stream=True)
-                    response.raise_for_status()
-                    with open(updater_path, "wb") as f:
-                        f.write(response.content)
-                    if os.path.getsize(updater_path) > 0:
-                        run_updater()
-                    else:
-                        raise ValueError("Updater download is empty")
+                    download_segmented(updater_url, updater_path, session=self.session,
+                                       expected_sha256=asset_sha256(release, "updater.exe"), progress=logging_progress("updater.exe"))
+                    run_updater()
                 except Exception as e:
                     logging.error(f"Failed to download updater: {str(e)}")
                     dialog = LinkMessageDialog(self, "Update Error", "Failed to download updater. Please get it from:", link=github_link)
@@ -2342,36 +2668,41 @@ class LDBPlayer(QMainWindow):
             dialog = MessageDialog(self, "Error", f"Failed to open Playlist dialog: {str(e)}")
             dialog.exec()
 
+    def thumbnail_icon(self, path):
+        icon = self.thumbnail_icons.get(path)
+        if icon is not None:
+            self.thumbnail_icons.move_to_end(path)
+            return icon
+        self.thumbnails.request(path, self.thumbnail_created.emit)
+        return None
+
+    def thumbnail_or_placeholder(self, path):
+        icon = self.thumbnail_icon(path)
+        return icon if icon is not None else self.thumbnail_placeholder
+
+    def store_thumbnail(self, path, file):
+        self.thumbnail_icons[path] = QIcon(file)
+        self.thumbnail_icons.move_to_end(path)
+        while len(self.thumbnail_icons) > THUMBNAIL_ICON_LIMIT:
+            self.thumbnail_icons.popitem(last=False)
+        self.thumbnail_ready.emit(path)
+
     def load_playlist(self):
-        self.media_list.lock()
-        while self.media_list.count() > 0:
-            self.media_list.remove_index(0)
-        self.media_list.unlock()
-        for path in self.playlist:
-            if os.path.exists(path):
-                file_url = urllib.parse.quote(path, safe='/:')
-                file_url = f"file:///{file_url}"
-                media = self.instance.media_new(file_url)
-                self.media_list.add_media(media)
-        self.list_player.set_media_list(self.media_list)
-        state = self.player.get_state()
-        if state in (vlc.State.Playing, vlc.State.Paused) and self.playlist and 0 <= self.current_video_index < len(self.playlist):
-            video_name = os.path.basename(self.playlist[self.current_video_index])
+        self.core.sync_playlist()
+        if self.core.playback_state() != 'stopped' and self.core.current_path() is not None:
+            video_name = os.path.basename(self.core.current_path())
             self.current_video_label.setText(self.truncate_label_text(video_name))
         else:
-            self.current_video_index = min(self.current_video_index, len(self.playlist) - 1) if self.playlist else 0
             self.current_video_label.setText(self.truncate_label_text("No video playing" if self.playlist else "Playlist is empty"))
-        self.update_fullscreen_button_state()
+        self.publish_state()
 
     def play_pause(self):
-        if self.list_player.is_playing():
-            self.list_player.pause()
-            self.play_pause_button.setIcon(QIcon(resource_path("icons/play_icon.png")))
-            self.play_pause_button.setToolTip("Play (Space)")
-            self.is_paused = True
+        if self.backend.is_playing():
+            self.core.pause()
+            set_button_state(self.play_pause_button, "play", "Play (Space)")
         else:
-            if not self.playlist or self.media_list.count() == 0:
-                self.update_fullscreen_button_state()
+            if not self.core.can_play():
+                self.publish_state()
                 return
             if not hasattr(self, 'video_window') or not self.video_window or sip.isdeleted(self.video_window):
                 self.setup_video_window(is_fullscreen=self.is_fullscreen)
@@ -2379,28 +2710,21 @@ class LDBPlayer(QMainWindow):
             if self.is_paused:
                 if hasattr(self, 'just_toggled_fullscreen') and self.just_toggled_fullscreen and self.last_known_position > 0:
                     self.player.set_position(self.last_known_position)
-                self.list_player.pause()
-                self.play_pause_button.setIcon(QIcon(resource_path("icons/pause_icon.png")))
-                self.play_pause_button.setToolTip("Pause (Space)")
-                self.is_paused = False
+                self.core.resume()
+                set_button_state(self.play_pause_button, "pause", "Pause (Space)")
                 self.just_toggled_fullscreen = False
-                QTimer.singleShot(100, self.ensure_playing_and_set_audio)
+                self.request_audio_settings()
             else:
-                self.list_player.play_item_at_index(self.current_video_index)
-                self.play_pause_button.setIcon(QIcon(resource_path("icons/pause_icon.png")))
-                self.play_pause_button.setToolTip("Pause (Space)")
-                self.is_paused = False
+                self.core.play_index(self.current_video_index)
+                set_button_state(self.play_pause_button, "pause", "Pause (Space)")
                 self.just_toggled_fullscreen = False
                 video_name = os.path.basename(self.playlist[self.current_video_index])
                 self.current_video_label.setText(self.truncate_label_text(video_name))
-                QTimer.singleShot(100, self.ensure_playing_and_set_audio)
-        self.save_config()
-        self.update_control_dialog()
-        self.update_fullscreen_button_state()
-        self.update_tray_actions()
+                self.request_audio_settings()
+        self.publish_state()
 
     def stop(self):
-        self.list_player.stop()
+        self.core.stop()
         if hasattr(self, 'video_window') and self.video_window and not sip.isdeleted(self.video_window):
             self.player.set_hwnd(0)
             self.video_window.hide()
@@ -2409,9 +2733,7 @@ class LDBPlayer(QMainWindow):
             del self.video_window
             self.video_window = None
         self.slider.setValue(0)
-        self.play_pause_button.setIcon(QIcon(resource_path("icons/play_icon.png")))
-        self.play_pause_button.setToolTip("Play (Space)")
-        self.is_paused = False
+        set_button_state(self.play_pause_button, "play", "Play (Space)")
         self.current_video_label.setText(self.truncate_label_text("No video playing" if self.playlist else "Playlist is empty"))
         self.duration_label.setText("--:-- / --:--")
         if self.original_bg_color:
@@ -2420,10 +2742,8 @@ class LDBPlayer(QMainWindow):
             self.set_wallpaper(self.original_wallpaper)
         if self.fullscreen_enabled and self.is_fullscreen:
             self.toggle_fullscreen()
-        self.save_config()
-        self.update_control_dialog()
-        self.update_fullscreen_button_state()
-        self.update_tray_actions()
+            self.save_config()
+        self.publish_state()
 
     def toggle_mute(self):
         self.is_muted = not self.is_muted
@@ -2436,9 +2756,8 @@ class LDBPlayer(QMainWindow):
                 self.player.audio_set_volume(self.volume_slider.value())
         except:
             pass
-        self.mute_button.setIcon(QIcon(resource_path("icons/mute_icon.png" if self.is_muted else "icons/unmute_icon.png")))
-        self.mute_button.setToolTip("Unmute (M)" if self.is_muted else "Mute (M)")
-        self.update_control_dialog()
+        set_button_state(self.mute_button, "mute" if self.is_muted else "unmute", "Unmute (M)" if self.is_muted else "Mute (M)")
+        self.publish_state()
 
     def set_volume(self, value):
         self.volume_slider.setValue(value)
@@ -2451,7 +2770,7 @@ class LDBPlayer(QMainWindow):
                     self.player.audio_set_volume(0)
             except:
                 pass
-        self.update_control_dialog()
+        self.publish_state()
 
     def adjust_volume_by_wheel(self, delta):
         current_volume = self.volume_slider.value()
@@ -2465,55 +2784,39 @@ class LDBPlayer(QMainWindow):
             event.accept()
 
     def toggle_repeat(self, mode):
-        modes = ['one', 'all']
-        if mode is None:
-            current_index = modes.index(self.repeat_mode) if self.repeat_mode in modes else 0
-            self.repeat_mode = modes[(current_index + 1) % len(modes)]
-        else:
-            self.repeat_mode = mode
-        self.repeat_button.setIcon(QIcon(resource_path(f"icons/repeat_{self.repeat_mode}_icon.png")))
-        self.repeat_button.setToolTip("Loop")
-        self.list_player.set_playback_mode(vlc.PlaybackMode.repeat if self.repeat_mode == 'one' else vlc.PlaybackMode.loop)
-        self.save_config()
+        self.core.set_repeat_mode(mode)
+        set_button_state(self.repeat_button, f"repeat_{self.repeat_mode}", "Loop")
 
     def play_next(self):
-        if not self.playlist or self.media_list.count() == 0:
+        if not self.core.can_play():
             return
-        self.current_video_index = (self.current_video_index + 1) % len(self.playlist)
         if not hasattr(self, 'video_window') or not self.video_window or sip.isdeleted(self.video_window):
             self.setup_video_window(is_fullscreen=self.is_fullscreen)
         self.video_window.show()
-        self.list_player.play_item_at_index(self.current_video_index)
-        self.play_pause_button.setIcon(QIcon(resource_path("icons/pause_icon.png")))
-        self.play_pause_button.setToolTip("Pause (Space)")
-        self.is_paused = False
+        self.core.play_next()
+        set_button_state(self.play_pause_button, "pause", "Pause (Space)")
         video_name = os.path.basename(self.playlist[self.current_video_index])
         self.current_video_label.setText(self.truncate_label_text(video_name))
-        QTimer.singleShot(100, self.ensure_playing_and_set_audio)
-        self.save_config()
-        self.update_control_dialog()
+        self.request_audio_settings()
+        self.publish_state()
 
     def play_previous(self):
-        if not self.playlist or self.media_list.count() == 0:
+        if not self.core.can_play():
             return
-        self.current_video_index = (self.current_video_index - 1) % len(self.playlist)
         if not hasattr(self, 'video_window') or not self.video_window or sip.isdeleted(self.video_window):
             self.setup_video_window(is_fullscreen=self.is_fullscreen)
         self.video_window.show()
-        self.list_player.play_item_at_index(self.current_video_index)
-        self.play_pause_button.setIcon(QIcon(resource_path("icons/pause_icon.png")))
-        self.play_pause_button.setToolTip("Pause (Space)")
-        self.is_paused = False
+        self.core.play_previous()
+        set_button_state(self.play_pause_button, "pause", "Pause (Space)")
         video_name = os.path.basename(self.playlist[self.current_video_index])
         self.current_video_label.setText(self.truncate_label_text(video_name))
-        QTimer.singleShot(100, self.ensure_playing_and_set_audio)
-        self.save_config()
-        self.update_control_dialog()
+        self.request_audio_settings()
+        self.publish_state()
 
     def seek(self, position):
         pos = position / 1000.0
         self.player.set_position(pos)
-        self.update_control_dialog()
+        self.publish_state()
 
     def format_time(self, ms):
         if ms < 0:
@@ -2529,42 +2832,98 @@ class LDBPlayer(QMainWindow):
     def update_slider(self):
         state = self.player.get_state()
         if state in (vlc.State.Playing, vlc.State.Buffering, vlc.State.Paused):
-            pos = self.player.get_position() * 1000
-            self.slider.setValue(min(int(pos), 1000))
-            current_time = self.player.get_time()
-            total_time = self.player.get_length()
-            current_str = self.format_time(current_time)
-            total_str = self.format_time(total_time)
-            self.duration_label.setText(f"{current_str} / {total_str}")
-            if state == vlc.State.Paused:
-                self.last_known_position = self.player.get_position()
-            self.update_control_dialog()
-        elif state == vlc.State.Stopped:
+            self.progress_tracker.push_position(self.player.get_position())
+            self.progress_tracker.push_time(self.player.get_time())
+            self.progress_tracker.push_length(self.player.get_length())
+        else:
+            self.progress_tracker.reset()
+        self.refresh_progress()
+        self.publish_state()
+
+    def is_progress_visible(self):
+        if self.isVisible() and not self.isMinimized():
+            return True
+        dialog = getattr(self, 'fullscreen_control_dialog', None)
+        return dialog is not None and not sip.isdeleted(dialog) and dialog.is_visible
+
+    def update_progress_activity(self):
+        if not hasattr(self, 'event_manager'):
+            return
+        active = self.is_progress_visible()
+        if not self.progress_tracker.set_active(active):
+            return
+        events = (
+            (vlc.EventType.MediaPlayerTimeChanged, self.handle_time_changed_event),
+            (vlc.EventType.MediaPlayerPositionChanged, self.handle_position_changed_event),
+            (vlc.EventType.MediaPlayerLengthChanged, self.handle_length_changed_event),
+        )
+        if active and not self.progress_events_attached:
+            for event_type, callback in events:
+                self.event_manager.event_attach(event_type, callback)
+            self.progress_events_attached = True
+            self.update_slider()
+        elif not active and self.progress_events_attached:
+            for event_type, _ in events:
+                self.event_manager.event_detach(event_type)
+            self.progress_events_attached = False
+
+    def handle_time_changed_event(self, event):
+        if self.progress_tracker.push_time(event.u.new_time):
+            self.event_bridge.post('progress')
+
+    def handle_position_changed_event(self, event):
+        if self.progress_tracker.push_position(event.u.new_position):
+            self.event_bridge.post('progress')
+
+    def handle_length_changed_event(self, event):
+        if self.progress_tracker.push_length(event.u.new_length):
+            self.event_bridge.post('progress')
+
+    def schedule_progress_refresh(self, payload=None):
+        QTimer.singleShot(self.progress_tracker.delay(), self.refresh_progress)
+
+    def refresh_progress(self):
+        current_time, position, length = self.progress_tracker.take()
+        if current_time < 0:
             self.slider.setValue(0)
             self.duration_label.setText("--:-- / --:--")
             self.last_known_position = 0.0
-            self.update_control_dialog()
+        else:
+            self.slider.setValue(min(int(position * 1000), 1000))
+            self.duration_label.setText(f"{self.format_time(current_time)} / {self.format_time(length)}")
+            if self.is_paused:
+                self.last_known_position = position
+        if self.fullscreen_enabled and self.is_fullscreen and not self.is_toggling_fullscreen:
+            dialog = getattr(self, 'fullscreen_control_dialog', None)
+            if dialog is not None and not sip.isdeleted(dialog) and dialog.is_visible:
+                dialog.slider.setValue(self.slider.value())
+                dialog.duration_label.setText(self.duration_label.text())
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_progress_activity()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_progress_activity()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.update_progress_activity()
 
     def handle_playing_event(self, event):
+        self.audio_applier.notify_ready()
         if self.player.get_state() != vlc.State.Playing:
             return
-        current_media = self.player.get_media()
-        if current_media and self.media_list.count() > 0:
-            media_path = urllib.parse.unquote(current_media.get_mrl().replace('file:///', ''))
-            media_path = os.path.normpath(media_path)
-            for i, path in enumerate(self.playlist):
-                if os.path.normpath(path) == media_path:
-                    self.current_video_index = i
-                    break
-            else:
+        if self.media_list.count() > 0:
+            if self.core.handle_playing() is None:
                 self.current_video_index = 0
-                self.list_player.stop()
+                self.core.stop()
                 self.current_video_label.setText(self.truncate_label_text("No video playing"))
                 self.video_window.hide()
-                self.play_pause_button.setIcon(QIcon(resource_path("icons/play_icon.png")))
-                self.play_pause_button.setToolTip("Play (Space)")
+                set_button_state(self.play_pause_button, "play", "Play (Space)")
                 self.is_paused = False
-                self.save_config()
                 return
         if not self.playlist:
             video_name = "Playlist is empty"
@@ -2575,20 +2934,21 @@ class LDBPlayer(QMainWindow):
             video_name = "No video playing"
             self.current_video_index = 0
         self.current_video_label.setText(self.truncate_label_text(video_name))
-        QApplication.postEvent(self, CustomEvent(video_name, self.current_video_index))
-        self.update_tray_actions()
+        self.update_ui(video_name, self.current_video_index)
+        self.publish_state()
 
     def update_ui(self, video_name, index):
         if self.player.get_state() == vlc.State.Playing:
             self.current_video_index = index
             self.current_video_label.setText(self.truncate_label_text(video_name))
             self.video_window.show()
-            self.play_pause_button.setIcon(QIcon(resource_path("icons/pause_icon.png")))
-            self.play_pause_button.setToolTip("Pause (Space)")
+            set_button_state(self.play_pause_button, "pause", "Pause (Space)")
             self.is_paused = False
-            self.update_fullscreen_button_state()
+            self.publish_state()
 
     def handle_stop_event(self, event):
+        if self.progress_tracker.reset():
+            self.schedule_progress_refresh()
         if hasattr(self, 'video_window') and self.video_window and not sip.isdeleted(self.video_window):
             self.video_window.hide()
         self.current_video_label.setText(self.truncate_label_text("No video playing" if self.playlist else "Playlist is empty"))
@@ -2597,7 +2957,7 @@ class LDBPlayer(QMainWindow):
             self.set_bg_color(self.original_bg_color)
         if self.original_wallpaper:
             self.set_wallpaper(self.original_wallpaper)
-        self.update_tray_actions()
+        self.publish_state()
 
     def handle_error_event(self, event):
         dialog = MessageDialog(self, "Playback Error", "An error occurred during playback.")
@@ -2613,11 +2973,16 @@ class LDBPlayer(QMainWindow):
         if self.original_wallpaper:
             self.set_wallpaper(self.original_wallpaper)
         self.stop()
+        self.config_writer.close()
+        if self._metadata_prober is not None:
+            self._metadata_prober.shutdown()
+        if self._thumbnails is not None:
+            self._thumbnails.close()
         QApplication.quit()
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
-    app.setWindowIcon(QIcon(resource_path("icons/tray_icon.png")))
+    app.setWindowIcon(load_icon("tray"))
     app.setStyleSheet(QSS_STYLE)
     ex = LDBPlayer()
     sys.exit(app.exec())
\ No newline at end of file
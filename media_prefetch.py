@@ -0,0 +1,81 @@
+import time
+import logging
+import threading
+
+class MediaPrefetcher:
+    def __init__(self, parse, discard=None, release=None, clock=time.monotonic):
+        self.parse = parse
+        self.discard = discard
+        self.release = release
+        self.clock = clock
+        self.prepared = {}
+        self.parsed = 0
+        self.discarded = 0
+        self.hits = 0
+        self.misses = 0
+        self.warm_latencies = []
+        self.cold_latencies = []
+        self._switch = None
+        self._lock = threading.Lock()
+
+    def prepare(self, items):
+        items = list(items)
+        wanted = {path for path, _ in items}
+        for path in list(self.prepared):
+            if path not in wanted:
+                self._discard(path)
+        for path, media in items:
+            if path in self.prepared:
+                self._release(path, media)
+                continue
+            try:
+                self.parse(media)
+            except Exception as e:
+                logging.error(f"Failed to pre-parse {path}: {e}")
+                self._release(path, media)
+                continue
+            self.prepared[path] = media
+            self.parsed += 1
+
+    def clear(self):
+        for path in list(self.prepared):
+            self._discard(path)
+
+    def begin_switch(self, path):
+        with self._lock:
+            warm = path in self.prepared
+            if warm:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._switch = (self.clock(), warm)
+
+    def first_frame(self):
+        with self._lock:
+            if self._switch is None:
+                return None
+            started, warm = self._switch
+            self._switch = None
+            latency = self.clock() - started
+            if warm:
+                self.warm_latencies.append(latency)
+            else:
+                self.cold_latencies.append(latency)
+            return latency
+
+    def _discard(self, path):
+        media = self.prepared.pop(path)
+        self.discarded += 1
+        if self.discard is not None:
+            try:
+                self.discard(media)
+            except Exception as e:
+                logging.error(f"Failed to discard pre-parsed {path}: {e}")
+        self._release(path, media)
+
+    def _release(self, path, media):
+        if self.release is not None:
+            try:
+                self.release(media)
+            except Exception as e:
+                logging.error(f"Failed to release pre-parsed {path}: {e}")
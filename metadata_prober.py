@@ -0,0 +1,171 @@
+import os
+import json
+import logging
+import threading
+import concurrent.futures
+
+from config_store import write_json_atomic
+from path_validator import WorkerPool
+
+PROBE_BATCH = 200
+PROBE_CHUNK = 32
+TIMED_OUT = object()
+
+class MetadataProber:
+    def __init__(self, probe, cache_file=None, max_workers=4):
+        self.probe = probe
+        self.cache_file = cache_file
+        self.max_workers = max_workers
+        self.probed = 0
+        self.reused = 0
+        self.failed = 0
+        self.timed_out = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._cache = None
+        self._checked = set()
+        self._queued = set()
+        self._pool = None
+
+    def info(self, path):
+        with self._lock:
+            return self._load().get(path)
+
+    def duration(self, path):
+        info = self.info(path)
+        return info.get('duration') if info else None
+
+    def total_duration(self, paths):
+        with self._lock:
+            cache = self._load()
+            durations = [cache[path].get('duration') for path in paths if path in cache]
+        known = [value for value in durations if value]
+        return sum(known), len(known)
+
+    def probe_paths(self, paths, callback, recheck=False):
+        with self._lock:
+            paths = [path for path in dict.fromkeys(paths)
+                     if path not in self._queued and (recheck or path not in self._checked)]
+            self._queued.update(paths)
+        if not paths:
+            return
+        def run():
+            try:
+                self.probe_now(paths, callback)
+            except Exception as e:
+                logging.error(f"Failed to probe media metadata: {e}")
+            finally:
+                with self._lock:
+                    self._queued.difference_update(paths)
+        threading.Thread(target=run, name="MetadataProber", daemon=True).start()
+
+    def probe_now(self, paths, callback=None):
+        with self._lock:
+            cache = dict(self._load())
+            pool = self._get_pool()
+        paths = list(dict.fromkeys(paths))
+        jobs = [pool.submit(self._probe_chunk, paths[i:i + PROBE_CHUNK], cache)
+                for i in range(0, len(paths), PROBE_CHUNK)]
+        results = {}
+        batch = {}
+        try:
+            for job in concurrent.futures.as_completed(jobs):
+                for path, info in job.result():
+                    if info is TIMED_OUT:
+                        self.timed_out += 1
+                        continue
+                    if info is None:
+                        self.failed += 1
+                    elif info is cache.get(path):
+                        self.reused += 1
+                    else:
+                        self.probed += 1
+                    results[path] = info
+                    batch[path] = info
+                if callback is not None and len(batch) >= PROBE_BATCH:
+                    self._deliver(callback, batch)
+                    batch = {}
+        finally:
+            for job in jobs:
+                job.cancel()
+            self._store(results)
+        if callback is not None and batch:
+            self._deliver(callback, batch)
+        return results
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def _probe_chunk(self, paths, cache):
+        results = []
+        for path in paths:
+            try:
+                results.append((path, self._probe_entry(path, cache.get(path))))
+            except TimeoutError as e:
+                logging.error(f"Timed out probing {path}, retrying on the next probe: {e}")
+                results.append((path, TIMED_OUT))
+            except OSError:
+                results.append((path, None))
+        return results
+
+    def _probe_entry(self, path, cached):
+        stat = os.stat(path)
+        if cached and cached.get('size') == stat.st_size and cached.get('mtime') == stat.st_mtime_ns:
+            return cached
+        try:
+            info = dict(self.probe(path))
+        except TimeoutError:
+            raise
+        except Exception as e:
+            info = {'error': str(e)}
+        info['size'] = stat.st_size
+        info['mtime'] = stat.st_mtime_ns
+        return info
+
+    def _deliver(self, callback, batch):
+        try:
+            callback(batch)
+        except Exception as e:
+            logging.error(f"Failed to deliver media metadata: {e}")
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = WorkerPool(self.max_workers, "MetadataProber")
+        return self._pool
+
+    def _load(self):
+        if self._cache is None:
+            self._cache = {}
+            if self.cache_file:
+                try:
+                    with open(self.cache_file, 'r', encoding='utf-8') as f:
+                        self._cache = json.load(f)
+                except FileNotFoundError:
+                    pass
+                except (OSError, ValueError) as e:
+                    logging.error(f"Failed to read media metadata cache: {e}")
+        return self._cache
+
+    def _store(self, results):
+        with self._lock:
+            cache = self._load()
+            changed = False
+            for path, info in results.items():
+                self._checked.add(path)
+                if info is None:
+                    if cache.pop(path, None) is not None:
+                        changed = True
+                elif cache.get(path) is not info:
+                    cache[path] = info
+                    changed = True
+            if not changed or not self.cache_file:
+                return
+            snapshot = dict(cache)
+        with self._write_lock:
+            try:
+                write_json_atomic(self.cache_file, snapshot)
+            except OSError as e:
+                logging.error(f"Failed to write media metadata cache: {e}")
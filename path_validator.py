@@ -0,0 +1,172 @@
+import os
+import json
+import time
+import queue
+import logging
+import threading
+import concurrent.futures
+
+from config_store import write_json_atomic
+
+def volume_root(path):
+    drive, rest = os.path.splitdrive(path)
+    if drive:
+        return drive + os.sep
+    parts = [part for part in rest.replace('\\', '/').split('/') if part]
+    if rest.startswith(('/', '\\')) and len(parts) > 1:
+        return '/' + parts[0]
+    return os.path.abspath(os.curdir) if not rest.startswith(('/', '\\')) else '/'
+
+class WorkerPool:
+    def __init__(self, max_workers, name="PathValidator"):
+        self._jobs = queue.Queue()
+        self._threads = []
+        for i in range(max_workers):
+            thread = threading.Thread(target=self._run, name=f"{name}-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, func, *args):
+        future = concurrent.futures.Future()
+        self._jobs.put((future, func, args))
+        return future
+
+    def shutdown(self):
+        for _ in self._threads:
+            self._jobs.put(None)
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            future, func, args = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+class PathValidator:
+    def __init__(self, cache_file=None, max_workers=8, root_timeout=3.0):
+        self.cache_file = cache_file
+        self.max_workers = max_workers
+        self.root_timeout = root_timeout
+        self._lock = threading.Lock()
+        self._cache = None
+
+    def validate(self, paths, callback):
+        paths = list(paths)
+        def run():
+            missing, unavailable = self.validate_now(paths)
+            try:
+                callback(missing, unavailable)
+            except Exception as e:
+                logging.error(f"Failed to deliver path validation result: {e}")
+        threading.Thread(target=run, name="PathValidator", daemon=True).start()
+
+    def validate_now(self, paths):
+        groups = {}
+        for path in paths:
+            directory, name = os.path.split(path)
+            groups.setdefault(volume_root(path), {}).setdefault(directory, []).append((path, os.path.normcase(name)))
+        missing = []
+        unavailable = []
+        if not groups:
+            return missing, unavailable
+        pool = WorkerPool(min(self.max_workers, max(len(groups), sum(len(dirs) for dirs in groups.values()))))
+        try:
+            deadline = time.monotonic() + self.root_timeout
+            root_jobs = {root: pool.submit(os.stat, root) for root in groups}
+            live_roots = []
+            for root, directories in groups.items():
+                try:
+                    root_jobs[root].result(timeout=max(0.0, deadline - time.monotonic()))
+                    live_roots.append(root)
+                except FileNotFoundError:
+                    missing.extend(path for entries in directories.values() for path, _ in entries)
+                except (concurrent.futures.TimeoutError, OSError) as e:
+                    logging.error(f"Volume {root} is not responding: {e}")
+                    unavailable.extend(path for entries in directories.values() for path, _ in entries)
+            cache = self._load_cache()
+            started = {}
+            activity = [time.monotonic()]
+            def list_directory(directory, cached):
+                started[directory] = activity[0] = time.monotonic()
+                return self._list_directory(directory, cached)
+            dir_jobs = {root: {directory: pool.submit(list_directory, directory, cache.get(directory))
+                               for directory in groups[root]} for root in live_roots}
+            listings = {}
+            for root in live_roots:
+                root_dead = False
+                for directory, job in dir_jobs[root].items():
+                    entries = groups[root][directory]
+                    if root_dead:
+                        unavailable.extend(path for path, _ in entries)
+                        continue
+                    try:
+                        listing = self._wait_listing(job, directory, started, activity)
+                    except (FileNotFoundError, NotADirectoryError):
+                        missing.extend(path for path, _ in entries)
+                        continue
+                    except (concurrent.futures.TimeoutError, OSError) as e:
+                        logging.error(f"Volume {root} is not responding: {e}")
+                        root_dead = True
+                        unavailable.extend(path for path, _ in entries)
+                        continue
+                    listings[directory] = listing
+                    names = set(listing[1])
+                    missing.extend(path for path, name in entries if name not in names)
+            self._store_cache(listings)
+        finally:
+            pool.shutdown()
+        return missing, unavailable
+
+    def _wait_listing(self, job, directory, started, activity):
+        waiting = time.monotonic()
+        while True:
+            start = started.get(directory)
+            if start is None:
+                start = max(waiting, activity[0])
+            remaining = start + self.root_timeout - time.monotonic()
+            if remaining <= 0:
+                raise concurrent.futures.TimeoutError(f"Listing {directory} took longer than {self.root_timeout}s")
+            try:
+                return job.result(timeout=remaining)
+            except concurrent.futures.TimeoutError:
+                if job.done():
+                    raise
+
+    def _list_directory(self, directory, cached):
+        mtime = os.stat(directory or os.curdir).st_mtime_ns
+        if cached and cached[0] == mtime:
+            return cached
+        with os.scandir(directory or os.curdir) as entries:
+            return [mtime, [os.path.normcase(entry.name) for entry in entries]]
+
+    def _load_cache(self):
+        with self._lock:
+            if self._cache is None:
+                self._cache = {}
+                if self.cache_file:
+                    try:
+                        with open(self.cache_file, 'r', encoding='utf-8') as f:
+                            self._cache = json.load(f)
+                    except FileNotFoundError:
+                        pass
+                    except (OSError, ValueError) as e:
+                        logging.error(f"Failed to read path cache: {e}")
+            return dict(self._cache)
+
+    def _store_cache(self, listings):
+        with self._lock:
+            changed = {directory: listing for directory, listing in listings.items() if self._cache.get(directory) != listing}
+            if not changed:
+                return
+            self._cache.update(changed)
+            if self.cache_file:
+                try:
+                    write_json_atomic(self.cache_file, self._cache)
+                except OSError as e:
+                    logging.error(f"Failed to write path cache: {e}")
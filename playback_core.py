@@ -0,0 +1,181 @@
+from abc import ABC, abstractmethod
+
+from playlist_model import PlaylistModel
+
+STATE_STOPPED = 'stopped'
+STATE_PLAYING = 'playing'
+STATE_PAUSED = 'paused'
+REPEAT_MODES = ('one', 'all')
+
+class MediaBackend(ABC):
+    @abstractmethod
+    def set_playlist(self, paths):
+        raise NotImplementedError
+
+    @abstractmethod
+    def count(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def play_index(self, index):
+        raise NotImplementedError
+
+    @abstractmethod
+    def pause(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def resume(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def stop(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def state(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def current_path(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_repeat_mode(self, mode):
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_volume(self, volume):
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_mute(self, muted):
+        raise NotImplementedError
+
+    def prefetch(self, indices, upcoming):
+        pass
+
+class PlaybackCore:
+    def __init__(self, backend, on_change=None):
+        self.backend = backend
+        self.on_change = on_change
+        self.playlist = PlaylistModel()
+        self.current_index = 0
+        self.repeat_mode = 'one'
+        self.is_paused = False
+        self.switches = 0
+        self.changes = 0
+
+    def changed(self):
+        self.changes += 1
+        if self.on_change is not None:
+            self.on_change()
+
+    def current_path(self):
+        if self.playlist and 0 <= self.current_index < len(self.playlist):
+            return self.playlist[self.current_index]
+        return None
+
+    def can_play(self):
+        return bool(self.playlist) and self.backend.count() > 0
+
+    def sync_playlist(self):
+        self.backend.set_playlist(self.playlist)
+        if self.backend.state() not in (STATE_PLAYING, STATE_PAUSED) or not 0 <= self.current_index < len(self.playlist):
+            self.current_index = min(self.current_index, len(self.playlist) - 1) if self.playlist else 0
+        else:
+            self.prefetch()
+
+    def set_playlist(self, playlist):
+        self.playlist = playlist
+        self.sync_playlist()
+        self.changed()
+
+    def play_index(self, index):
+        if not self.can_play():
+            return False
+        self.current_index = index
+        self.backend.play_index(index)
+        self.is_paused = False
+        self.switches += 1
+        self.changed()
+        return True
+
+    def play_next(self):
+        if not self.can_play():
+            return False
+        return self.play_index((self.current_index + 1) % len(self.playlist))
+
+    def play_previous(self):
+        if not self.can_play():
+            return False
+        return self.play_index((self.current_index - 1) % len(self.playlist))
+
+    def pause(self):
+        self.backend.pause()
+        self.is_paused = True
+        self.changed()
+
+    def resume(self):
+        self.backend.resume()
+        self.is_paused = False
+        self.changed()
+
+    def stop(self):
+        self.backend.stop()
+        self.is_paused = False
+        self.changed()
+
+    def set_repeat_mode(self, mode=None):
+        if mode is None:
+            current = REPEAT_MODES.index(self.repeat_mode) if self.repeat_mode in REPEAT_MODES else 0
+            mode = REPEAT_MODES[(current + 1) % len(REPEAT_MODES)]
+        elif mode not in REPEAT_MODES:
+            mode = 'one'
+        self.repeat_mode = mode
+        self.backend.set_repeat_mode(mode)
+        if self.playback_state() != STATE_STOPPED:
+            self.prefetch()
+        self.changed()
+        return mode
+
+    def handle_playing(self):
+        path = self.backend.current_path()
+        if path is None:
+            return self.current_index
+        index = self.playlist.find(path)
+        if index is not None:
+            changed = index != self.current_index
+            self.current_index = index
+            self.prefetch()
+            if changed:
+                self.changed()
+        return index
+
+    def prefetch(self):
+        if not self.can_play():
+            return
+        count = len(self.playlist)
+        index = self.current_index
+        upcoming = index if self.repeat_mode == 'one' else (index + 1) % count
+        self.backend.prefetch(sorted({(index - 1) % count, index, (index + 1) % count}), upcoming)
+
+    def playback_state(self):
+        state = self.backend.state()
+        return state if state in (STATE_PLAYING, STATE_PAUSED) else STATE_STOPPED
+
+    def snapshot(self):
+        return {
+            'current_video_index': self.current_index,
+            'repeat_mode': self.repeat_mode,
+            'playback_state': self.playback_state(),
+        }
+
+    def restore(self, state):
+        self.current_index = state.get('current_video_index', 0)
+        mode = state.get('repeat_mode', 'one')
+        self.repeat_mode = mode if mode in REPEAT_MODES else 'one'
+        if self.current_index >= len(self.playlist):
+            self.current_index = 0
+        self.backend.set_repeat_mode(self.repeat_mode)
+        self.changed()
@@ -0,0 +1,46 @@
+import collections
+
+PlayerState = collections.namedtuple('PlayerState', [
+    'playback',
+    'is_paused',
+    'has_playlist',
+    'video_name',
+    'volume',
+    'is_muted',
+    'repeat_mode',
+    'fullscreen_enabled',
+])
+
+class StateStore:
+    def __init__(self):
+        self.state = None
+        self.published = 0
+        self.changes = 0
+        self.deliveries = 0
+        self._subscribers = []
+
+    def subscribe(self, fields, callback):
+        self._subscribers.append((frozenset(fields), callback))
+
+    def publish(self, state):
+        self.published += 1
+        previous = self.state
+        if previous == state:
+            return frozenset()
+        self.state = state
+        if previous is None:
+            changed = frozenset(PlayerState._fields)
+        else:
+            changed = frozenset(field for field, old, new in zip(PlayerState._fields, previous, state) if old != new)
+        self.changes += 1
+        for fields, callback in self._subscribers:
+            relevant = fields & changed
+            if relevant:
+                self.deliveries += 1
+                callback(state, relevant)
+        return changed
+
+    def resend(self, callback, fields=PlayerState._fields):
+        if self.state is not None:
+            self.deliveries += 1
+            callback(self.state, frozenset(fields))
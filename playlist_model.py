@@ -0,0 +1,228 @@
+import os
+import difflib
+import urllib.parse
+
+def playlist_key(path):
+    return os.path.normcase(os.path.normpath(path)).casefold()
+
+class PlaylistModel:
+    def __init__(self, paths=None):
+        self._paths = []
+        self._keys = []
+        self._index = {}
+        self._stale_from = None
+        self.revision = 0
+        if paths:
+            self.add_many(paths)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __bool__(self):
+        return bool(self._paths)
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def __getitem__(self, index):
+        return self._paths[index]
+
+    def __contains__(self, path):
+        return playlist_key(path) in self._index
+
+    def __eq__(self, other):
+        if isinstance(other, PlaylistModel):
+            return self._paths == other._paths
+        if isinstance(other, list):
+            return self._paths == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"PlaylistModel({len(self._paths)} entries)"
+
+    def copy(self):
+        model = PlaylistModel()
+        model._paths = self._paths.copy()
+        model._keys = self._keys.copy()
+        model._index = self._index.copy()
+        model._stale_from = self._stale_from
+        model.revision = self.revision
+        return model
+
+    def to_list(self):
+        return self._paths.copy()
+
+    def _mark_stale(self, index):
+        if index < len(self._paths) and (self._stale_from is None or index < self._stale_from):
+            self._stale_from = index
+
+    def _refresh_index(self):
+        if self._stale_from is None:
+            return
+        keys = self._keys
+        index = self._index
+        for i in range(self._stale_from, len(keys)):
+            index[keys[i]] = i
+        self._stale_from = None
+
+    def find(self, path):
+        return self.find_key(playlist_key(path))
+
+    def find_key(self, key):
+        if key not in self._index:
+            return None
+        self._refresh_index()
+        return self._index[key]
+
+    def index(self, path):
+        index = self.find(path)
+        if index is None:
+            raise ValueError(f"{path} is not in playlist")
+        return index
+
+    def add(self, path):
+        key = playlist_key(path)
+        if key in self._index:
+            return False
+        self._index[key] = len(self._paths)
+        self._paths.append(path)
+        self._keys.append(key)
+        self.revision += 1
+        return True
+
+    def add_many(self, paths):
+        added = []
+        for path in paths:
+            if self.add(path):
+                added.append(path)
+        return added
+
+    def new_paths(self, paths):
+        seen = set()
+        result = []
+        for path in paths:
+            key = playlist_key(path)
+            if key not in self._index and key not in seen:
+                seen.add(key)
+                result.append(path)
+        return result
+
+    def remove_at(self, index):
+        if index < 0:
+            index += len(self._paths)
+        path = self._paths.pop(index)
+        del self._index[self._keys.pop(index)]
+        self._mark_stale(index)
+        self.revision += 1
+        return path
+
+    def remove_paths(self, paths):
+        keys = {playlist_key(path) for path in paths}
+        keys.intersection_update(self._index)
+        if not keys:
+            return []
+        removed = [i for i, key in enumerate(self._keys) if key in keys]
+        self._paths = [path for path, key in zip(self._paths, self._keys) if key not in keys]
+        self._keys = [key for key in self._keys if key not in keys]
+        for key in keys:
+            del self._index[key]
+        self._mark_stale(removed[0])
+        self.revision += 1
+        return removed
+
+    def swap(self, i, j):
+        paths = self._paths
+        keys = self._keys
+        paths[i], paths[j] = paths[j], paths[i]
+        keys[i], keys[j] = keys[j], keys[i]
+        self.revision += 1
+        if self._stale_from is None:
+            self._index[keys[i]] = i
+            self._index[keys[j]] = j
+        else:
+            self._mark_stale(min(i, j))
+
+    def move(self, source, target):
+        if abs(source - target) == 1:
+            self.swap(source, target)
+            return
+        self._paths.insert(target, self._paths.pop(source))
+        self._keys.insert(target, self._keys.pop(source))
+        self._mark_stale(min(source, target))
+        self.revision += 1
+
+    def shuffle(self):
+        import random
+        order = list(range(len(self._paths)))
+        random.shuffle(order)
+        self._paths = [self._paths[i] for i in order]
+        self._keys = [self._keys[i] for i in order]
+        self._mark_stale(0)
+        self.revision += 1
+
+    def sort(self, key):
+        order = sorted(range(len(self._paths)), key=lambda i: key(self._paths[i]))
+        self._paths = [self._paths[i] for i in order]
+        self._keys = [self._keys[i] for i in order]
+        self._mark_stale(0)
+        self.revision += 1
+
+    def clear(self):
+        self._paths = []
+        self._keys = []
+        self._index = {}
+        self._stale_from = None
+        self.revision += 1
+
+def path_to_mrl(path):
+    return f"file:///{urllib.parse.quote(path, safe='/:')}"
+
+def mrl_to_path(mrl):
+    return urllib.parse.unquote(mrl.replace('file:///', ''))
+
+def diff_playlists(old, new, max_window=2000):
+    limit = min(len(old), len(new))
+    prefix = 0
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[len(old) - 1 - suffix] == new[len(new) - 1 - suffix]:
+        suffix += 1
+    old_mid = old[prefix:len(old) - suffix]
+    new_mid = new[prefix:len(new) - suffix]
+    if not old_mid and not new_mid:
+        return []
+    if len(old_mid) > max_window or len(new_mid) > max_window:
+        opcodes = [('replace', 0, len(old_mid), 0, len(new_mid))]
+    else:
+        matcher = difflib.SequenceMatcher(None, old_mid, new_mid, autojunk=False)
+        opcodes = [op for op in matcher.get_opcodes() if op[0] != 'equal']
+    return [(tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix) for tag, i1, i2, j1, j2 in opcodes]
+
+class MediaListSync:
+    def __init__(self, media_list, media_factory, max_window=2000):
+        self.media_list = media_list
+        self.media_factory = media_factory
+        self.max_window = max_window
+        self.paths = []
+        self.last_call_count = 0
+
+    def sync(self, paths):
+        new_paths = list(paths)
+        opcodes = diff_playlists(self.paths, new_paths, self.max_window)
+        calls = 0
+        if opcodes:
+            self.media_list.lock()
+            try:
+                for tag, i1, i2, j1, j2 in reversed(opcodes):
+                    for index in range(i2 - 1, i1 - 1, -1):
+                        self.media_list.remove_index(index)
+                        calls += 1
+                    for offset, path in enumerate(new_paths[j1:j2]):
+                        self.media_list.insert_media(self.media_factory(path), i1 + offset)
+                        calls += 1
+            finally:
+                self.media_list.unlock()
+        self.paths = new_paths
+        self.last_call_count = calls
+        return opcodes
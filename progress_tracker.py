@@ -0,0 +1,81 @@
+import time
+import threading
+
+PROGRESS_STEPS = 1000
+MIN_REFRESH_INTERVAL = 100
+
+class ProgressTracker:
+    def __init__(self, steps=PROGRESS_STEPS, min_interval=MIN_REFRESH_INTERVAL, clock=time.monotonic):
+        self.steps = steps
+        self.min_interval = min_interval
+        self.clock = clock
+        self.time = -1
+        self.position = 0.0
+        self.length = -1
+        self.active = False
+        self.events_received = 0
+        self.wakeups_requested = 0
+        self.refreshes = 0
+        self._pending = False
+        self._shown = None
+        self._last_refresh = None
+        self._lock = threading.Lock()
+
+    def set_active(self, active):
+        with self._lock:
+            changed = self.active != active
+            self.active = active
+            if not active:
+                self._pending = False
+            return changed
+
+    def push_time(self, ms):
+        with self._lock:
+            self.events_received += 1
+            self.time = ms
+            return self._wake()
+
+    def push_position(self, position):
+        with self._lock:
+            self.events_received += 1
+            self.position = position
+            return self._wake()
+
+    def push_length(self, ms):
+        with self._lock:
+            self.events_received += 1
+            self.length = ms
+            return self._wake()
+
+    def reset(self):
+        with self._lock:
+            self.time = -1
+            self.position = 0.0
+            self.length = -1
+            return self._wake()
+
+    def delay(self):
+        if self._last_refresh is None:
+            return 0
+        elapsed = (self.clock() - self._last_refresh) * 1000
+        return max(0, int(self.min_interval - elapsed))
+
+    def take(self):
+        with self._lock:
+            self._pending = False
+            self._shown = self._display_key()
+            self._last_refresh = self.clock()
+            self.refreshes += 1
+            return self.time, self.position, self.length
+
+    def _display_key(self):
+        return (self.time // 1000 if self.time >= 0 else -1,
+                int(self.position * self.steps),
+                self.length // 1000 if self.length >= 0 else -1)
+
+    def _wake(self):
+        if not self.active or self._pending or self._display_key() == self._shown:
+            return False
+        self._pending = True
+        self.wakeups_requested += 1
+        return True
@@ -0,0 +1,303 @@
+import os
+import json
+import mmap
+import struct
+import logging
+
+from config_store import write_json_atomic
+
+BINARY_PLAYLIST_EXTENSION = '.ldbp'
+JSON_PLAYLIST_EXTENSION = '.json'
+PLAYLIST_EXTENSIONS = (JSON_PLAYLIST_EXTENSION, BINARY_PLAYLIST_EXTENSION)
+
+BINARY_MAGIC = b'LDBP'
+BINARY_VERSION = 1
+HEADER = struct.Struct('<4sHHIIQQQQ')
+DIR_RECORD = struct.Struct('<HH')
+DIR_INDEX_SIZE = 4
+OFFSET_SIZE = 8
+PLAYLIST_INDEX_FILE = 'ldb_player_playlists.json'
+PLAYLIST_INDEX_VERSION = 2
+DURATION_BATCH = 1024
+
+def split_entry(path):
+    cut = max(path.rfind('/'), path.rfind('\\')) + 1
+    return path[:cut], path[cut:]
+
+def encode_text(text):
+    return text.encode('utf-8', 'surrogatepass')
+
+def decode_text(data):
+    return bytes(data).decode('utf-8', 'surrogatepass')
+
+def write_binary_playlist(path, entries):
+    split = [split_entry(entry) for entry in entries]
+    directories = sorted({directory for directory, _ in split})
+    dir_numbers = {directory: i for i, directory in enumerate(directories)}
+    dir_table = bytearray()
+    previous = b''
+    for directory in directories:
+        encoded = encode_text(directory)
+        shared = 0
+        limit = min(len(previous), len(encoded), 0xFFFF)
+        while shared < limit and previous[shared] == encoded[shared]:
+            shared += 1
+        suffix = encoded[shared:]
+        if len(suffix) > 0xFFFF:
+            raise ValueError(f"Directory name too long: {directory}")
+        dir_table += DIR_RECORD.pack(shared, len(suffix))
+        dir_table += suffix
+        previous = encoded
+    names = [encode_text(name) + b'\0' for _, name in split]
+    offsets = [0]
+    for name in names:
+        offsets.append(offsets[-1] + len(name))
+    count = len(split)
+    dir_offset = HEADER.size
+    index_offset = dir_offset + len(dir_table)
+    dir_ids_offset = index_offset + (count + 1) * OFFSET_SIZE
+    names_offset = dir_ids_offset + count * DIR_INDEX_SIZE
+    header = HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, count, len(directories),
+                         dir_offset, index_offset, dir_ids_offset, names_offset)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(header)
+        f.write(dir_table)
+        f.write(struct.pack(f'<{count + 1}Q', *offsets))
+        f.write(struct.pack(f'<{count}I', *(dir_numbers[directory] for directory, _ in split)))
+        f.write(b''.join(names))
+    os.replace(temp_path, path)
+
+class BinaryPlaylist:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Empty playlist file: {path}")
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f"Truncated playlist file: {path}")
+        (magic, version, _, self.entry_count, self.dir_count, self._dir_offset,
+         self._index_offset, self._dir_ids_offset, self._names_offset) = HEADER.unpack_from(self._map, 0)
+        if magic != BINARY_MAGIC or version > BINARY_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported playlist file: {path}")
+        if (self._names_offset > len(self._map) or
+            self._index_offset + (self.entry_count + 1) * OFFSET_SIZE > self._dir_ids_offset or
+            self._dir_ids_offset + self.entry_count * DIR_INDEX_SIZE > self._names_offset):
+            self.close()
+            raise ValueError(f"Corrupt playlist file: {path}")
+        self._directories = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.entry_count
+
+    def __iter__(self):
+        return iter(self.slice(0, self.entry_count))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.entry_count)
+            if step == 1:
+                return self.slice(start, stop)
+            return [self._entry(i) for i in range(start, stop, step)]
+        if index < 0:
+            index += self.entry_count
+        if not 0 <= index < self.entry_count:
+            raise IndexError("playlist index out of range")
+        return self._entry(index)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def directories(self):
+        if self._directories is None:
+            directories = []
+            previous = b''
+            position = self._dir_offset
+            for _ in range(self.dir_count):
+                shared, length = DIR_RECORD.unpack_from(self._map, position)
+                position += DIR_RECORD.size
+                encoded = previous[:shared] + self._map[position:position + length]
+                position += length
+                directories.append(decode_text(encoded))
+                previous = encoded
+            self._directories = directories
+        return self._directories
+
+    def slice(self, start, stop):
+        start = max(0, start)
+        stop = min(stop, self.entry_count)
+        if start >= stop:
+            return []
+        count = stop - start
+        begin = struct.unpack_from('<Q', self._map, self._index_offset + start * OFFSET_SIZE)[0]
+        end = struct.unpack_from('<Q', self._map, self._index_offset + stop * OFFSET_SIZE)[0]
+        names = decode_text(self._map[self._names_offset + begin:self._names_offset + end - 1]).split('\0')
+        dir_ids = struct.unpack_from(f'<{count}I', self._map, self._dir_ids_offset + start * DIR_INDEX_SIZE)
+        directories = self.directories()
+        return [directories[dir_id] + name for dir_id, name in zip(dir_ids, names)]
+
+    def _entry(self, index):
+        return self.slice(index, index + 1)[0]
+
+def is_binary_playlist(path):
+    return path.lower().endswith(BINARY_PLAYLIST_EXTENSION)
+
+def read_saved_playlist(path):
+    if is_binary_playlist(path):
+        with BinaryPlaylist(path) as playlist:
+            return playlist.slice(0, len(playlist))
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def write_saved_playlist(path, entries):
+    if is_binary_playlist(path):
+        write_binary_playlist(path, entries)
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(entries, f)
+
+def convert_playlist(source, destination):
+    write_saved_playlist(destination, read_saved_playlist(source))
+
+def playlist_file_name(name, default_extension=JSON_PLAYLIST_EXTENSION):
+    if name.lower().endswith(PLAYLIST_EXTENSIONS):
+        return name
+    return name + default_extension
+
+def playlist_entry_count(path):
+    if is_binary_playlist(path):
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size or header[:4] != BINARY_MAGIC:
+            raise ValueError(f"Unsupported playlist file: {path}")
+        return HEADER.unpack(header)[3], None
+    entries = read_saved_playlist(path)
+    return len(entries), entries
+
+class PlaylistIndex:
+    def __init__(self, playlist_dir, index_file=None, duration_lookup=None):
+        self.playlist_dir = playlist_dir
+        self.index_file = index_file or os.path.join(os.path.dirname(os.path.normpath(playlist_dir)), PLAYLIST_INDEX_FILE)
+        self.duration_lookup = duration_lookup
+        self.files_read = 0
+        self._records = None
+
+    def refresh(self):
+        records = self._load()
+        refreshed = {}
+        changed = False
+        try:
+            with os.scandir(self.playlist_dir) as entries:
+                for entry in entries:
+                    if not entry.name.lower().endswith(PLAYLIST_EXTENSIONS) or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    record = records.get(entry.name)
+                    if record is None or record['size'] != stat.st_size or record['mtime'] != stat.st_mtime_ns:
+                        previous = record
+                        record = self._read_record(entry.path, entry.name, stat)
+                        if record is None:
+                            continue
+                        changed = changed or record != previous
+                    refreshed[entry.name] = record
+        except FileNotFoundError:
+            os.makedirs(self.playlist_dir, exist_ok=True)
+        if changed or len(refreshed) != len(records):
+            self._records = refreshed
+            self._save()
+        return sorted(refreshed.values(), key=lambda record: record['name'].casefold())
+
+    def update_duration(self, file, duration, known):
+        record = self._load().get(file)
+        if record is None:
+            return False
+        try:
+            stat = os.stat(os.path.join(self.playlist_dir, file))
+        except OSError:
+            return False
+        if record['size'] != stat.st_size or record['mtime'] != stat.st_mtime_ns:
+            return False
+        duration = duration or None
+        if record.get('duration') == duration and record.get('known') == known:
+            return False
+        record['duration'] = duration
+        record['known'] = known
+        self._save()
+        return True
+
+    def _sum_durations(self, entries):
+        total = 0
+        known = 0
+        for entry in entries:
+            value = self.duration_lookup(entry)
+            if value:
+                total += value
+                known += 1
+        return total or None, known
+
+    def _read_record(self, path, file, stat):
+        duration = None
+        known = 0
+        try:
+            count, entries = playlist_entry_count(path)
+            if entries is not None:
+                first = entries[0] if entries else None
+                if self.duration_lookup is not None:
+                    duration, known = self._sum_durations(entries)
+            else:
+                with BinaryPlaylist(path) as playlist:
+                    first = playlist[0] if len(playlist) else None
+                    if self.duration_lookup is not None:
+                        duration, known = self._sum_durations(
+                            entry for start in range(0, len(playlist), DURATION_BATCH)
+                            for entry in playlist.slice(start, min(start + DURATION_BATCH, len(playlist))))
+        except (OSError, ValueError) as e:
+            logging.error(f"Failed to index playlist {file}: {e}")
+            return None
+        self.files_read += 1
+        return {
+            'file': file,
+            'name': os.path.splitext(file)[0],
+            'count': count,
+            'first': first,
+            'duration': duration,
+            'known': known,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+        }
+
+    def _load(self):
+        if self._records is None:
+            self._records = {}
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    document = json.load(f)
+                if document.get('version') == PLAYLIST_INDEX_VERSION and document.get('directory') == self.playlist_dir:
+                    self._records = {record['file']: record for record in document.get('playlists', [])}
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, AttributeError, KeyError, TypeError) as e:
+                logging.error(f"Failed to read playlist index: {e}")
+        return self._records
+
+    def _save(self):
+        document = {'version': PLAYLIST_INDEX_VERSION, 'directory': self.playlist_dir,
+                    'playlists': list(self._records.values())}
+        try:
+            write_json_atomic(self.index_file, document)
+        except OSError as e:
+            logging.error(f"Failed to write playlist index: {e}")
@@ -0,0 +1,213 @@
+import os
+import time
+import zlib
+import struct
+import hashlib
+import logging
+import threading
+import collections
+
+THUMBNAIL_WIDTH = 160
+THUMBNAIL_TIME = 10000
+THUMBNAIL_QUOTA = 64 * 1024 * 1024
+MAX_PENDING = 64
+
+def encode_png(width, height, rgb):
+    stride = width * 3
+    raw = b''.join(b'\0' + rgb[y * stride:(y + 1) * stride] for y in range(height))
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw, 6)) + chunk(b'IEND', b''))
+
+def thumbnail_key(path, stat, timestamp, width):
+    text = f"{os.path.normcase(path)}|{stat.st_size}|{stat.st_mtime_ns}|{timestamp}|{width}"
+    return hashlib.sha1(text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+class ThumbnailCache:
+    def __init__(self, cache_dir, quota=THUMBNAIL_QUOTA):
+        self.cache_dir = cache_dir
+        self.quota = quota
+        self.total = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key + '.png')
+
+    def get(self, key):
+        with self._lock:
+            entries = self._load()
+            if key not in entries:
+                self.misses += 1
+                return None
+            entries.move_to_end(key)
+            self.hits += 1
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.total -= self._entries.pop(key, 0)
+            return None
+        except OSError:
+            pass
+        return path
+
+    def put(self, key, data):
+        path = self.path(key)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        with self._lock:
+            entries = self._load()
+            self.total -= entries.pop(key, 0)
+            entries[key] = len(data)
+            self.total += len(data)
+            evicted = self._evict()
+        self._remove(evicted)
+        return path
+
+    def set_quota(self, quota):
+        with self._lock:
+            self.quota = quota
+            self._load()
+            evicted = self._evict()
+        self._remove(evicted)
+
+    def _evict(self):
+        evicted = []
+        while self.total > self.quota and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self.total -= size
+            self.evictions += 1
+            evicted.append(key)
+        return evicted
+
+    def _remove(self, keys):
+        for key in keys:
+            try:
+                os.remove(self.path(key))
+            except OSError as e:
+                logging.error(f"Failed to evict thumbnail {key}: {e}")
+
+    def _load(self):
+        if self._entries is None:
+            found = []
+            try:
+                with os.scandir(self.cache_dir) as entries:
+                    for entry in entries:
+                        if entry.name.endswith('.png') and entry.is_file():
+                            stat = entry.stat()
+                            found.append((stat.st_mtime_ns, entry.name[:-4], stat.st_size))
+            except FileNotFoundError:
+                pass
+            found.sort()
+            self._entries = collections.OrderedDict((key, size) for _, key, size in found)
+            self.total = sum(size for _, _, size in found)
+        return self._entries
+
+class ThumbnailService:
+    def __init__(self, frame_source, cache, timestamp=THUMBNAIL_TIME, width=THUMBNAIL_WIDTH,
+                 max_workers=2, max_pending=MAX_PENDING, duration_lookup=None):
+        self.frame_source = frame_source
+        self.cache = cache
+        self.timestamp = timestamp
+        self.width = width
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.duration_lookup = duration_lookup
+        self.requested = 0
+        self.generated = 0
+        self.failed = 0
+        self.dropped = 0
+        self._pending = collections.OrderedDict()
+        self._active = set()
+        self._failed = set()
+        self._threads = []
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def request(self, path, callback):
+        with self._condition:
+            if self._closed or path in self._active or path in self._failed:
+                return False
+            self.requested += 1
+            self._pending.pop(path, None)
+            self._pending[path] = callback
+            while len(self._pending) > self.max_pending:
+                self._pending.popitem(last=False)
+                self.dropped += 1
+            if len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._run, name=f"Thumbnailer-{len(self._threads)}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            self._condition.notify()
+            return True
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._pending.clear()
+            self._condition.notify_all()
+
+    def thumbnail_now(self, path):
+        stat = os.stat(path)
+        timestamp = self.timestamp
+        if self.duration_lookup is not None:
+            duration = self.duration_lookup(path)
+            if duration:
+                timestamp = min(timestamp, duration // 2)
+        key = thumbnail_key(path, stat, timestamp, self.width)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        width, height, rgb = self.frame_source(path, timestamp, self.width)
+        data = encode_png(width, height, rgb)
+        self.generated += 1
+        return self.cache.put(key, data)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                path, callback = self._pending.popitem(last=True)
+                self._active.add(path)
+            try:
+                result = self.thumbnail_now(path)
+            except Exception as e:
+                logging.error(f"Failed to create thumbnail for {path}: {e}")
+                result = None
+            with self._condition:
+                self._active.discard(path)
+                if result is None:
+                    self._failed.add(path)
+                    self.failed += 1
+            if result is not None:
+                try:
+                    callback(path, result)
+                except Exception as e:
+                    logging.error(f"Failed to deliver thumbnail for {path}: {e}")
+
+class StubFrameSource:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self, path, timestamp, width):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        height = width * 9 // 16
+        seed = zlib.crc32(f"{path}|{timestamp}".encode('utf-8', 'surrogatepass'))
+        red, green, blue = seed & 0xFF, seed >> 8 & 0xFF, seed >> 16 & 0xFF
+        row = bytes(value for x in range(width) for value in ((red + x) & 0xFF, green, blue))
+        return width, height, row * height
@@ -0,0 +1,130 @@
+import json
+import time
+import logging
+import threading
+
+from config_store import write_json_atomic
+
+RELEASES_URL = "https://api.github.com/repos/kakao90g/ldb_player/releases/latest"
+USER_AGENT = "Mozilla/5.0"
+RETRY_DELAY = 60
+MAX_RETRY_DELAY = 6 * 3600
+
+def parse_version(text):
+    return tuple(int(part) for part in text.lstrip('v').split('.'))
+
+class UpdateChecker:
+    def __init__(self, current_version, cache_file=None, url=RELEASES_URL, timeout=10,
+                 retry_delay=RETRY_DELAY, max_retry_delay=MAX_RETRY_DELAY, clock=time.time):
+        self.current_version = current_version
+        self.cache_file = cache_file
+        self.url = url
+        self.timeout = timeout
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.clock = clock
+        self._session = None
+        self.requests_sent = 0
+        self.not_modified = 0
+        self._state = None
+        self._lock = threading.Lock()
+        self._callbacks = None
+
+    @property
+    def session(self):
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
+
+    @property
+    def running(self):
+        return self._callbacks is not None
+
+    def release(self):
+        return self._load().get('release')
+
+    def check(self, callback, force=False):
+        with self._lock:
+            if self._callbacks is not None:
+                self._callbacks.append(callback)
+                return False
+            self._callbacks = [callback]
+        def run():
+            try:
+                result = self.check_now(force)
+            except Exception as e:
+                logging.error(f"Failed to check for updates: {e}")
+                result = {'version': None, 'newer': False, 'error': str(e)}
+            with self._lock:
+                callbacks = self._callbacks
+                self._callbacks = None
+            for callback in callbacks:
+                try:
+                    callback(result)
+                except Exception as e:
+                    logging.error(f"Failed to deliver update check result: {e}")
+        threading.Thread(target=run, name="UpdateChecker", daemon=True).start()
+        return True
+
+    def check_now(self, force=False):
+        import requests
+        state = self._load()
+        now = self.clock()
+        if not force and now < state.get('retry_at', 0):
+            return {'version': None, 'newer': False, 'error': f"Retrying in {int(state['retry_at'] - now)}s"}
+        headers = {"User-Agent": USER_AGENT, "Accept": "application/vnd.github+json"}
+        if state.get('etag') and state.get('release'):
+            headers["If-None-Match"] = state['etag']
+        try:
+            self.requests_sent += 1
+            response = self.session.get(self.url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304:
+                self.not_modified += 1
+                release = state['release']
+            else:
+                response.raise_for_status()
+                release = response.json()
+                parse_version(release['tag_name'])
+                state['release'] = release
+                state['etag'] = response.headers.get('ETag')
+        except (requests.RequestException, ValueError, KeyError, TypeError, AttributeError) as e:
+            logging.error(f"Failed to check for updates: {e}")
+            failures = state.get('failures', 0) + 1
+            state['failures'] = failures
+            state['retry_at'] = now + min(self.max_retry_delay, self.retry_delay * 2 ** (failures - 1))
+            self._save(state)
+            return {'version': None, 'newer': False, 'error': str(e)}
+        state['failures'] = 0
+        state['retry_at'] = 0
+        state['checked'] = now
+        self._save(state)
+        latest_version = release['tag_name'].lstrip('v')
+        return {
+            'version': latest_version,
+            'newer': parse_version(latest_version) > parse_version(self.current_version),
+            'error': None,
+        }
+
+    def _load(self):
+        if self._state is None:
+            self._state = {}
+            if self.cache_file:
+                try:
+                    with open(self.cache_file, 'r', encoding='utf-8') as f:
+                        state = json.load(f)
+                    if isinstance(state, dict):
+                        self._state = state
+                except FileNotFoundError:
+                    pass
+                except (OSError, ValueError) as e:
+                    logging.error(f"Failed to read update cache: {e}")
+        return self._state
+
+    def _save(self, state):
+        if not self.cache_file:
+            return
+        try:
+            write_json_atomic(self.cache_file, state)
+        except OSError as e:
+            logging.error(f"Failed to write update cache: {e}")
@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+import ctypes
+
+PID_VARIABLE = "LDB_PLAYER_PID"
+EXIT_TIMEOUT = 30
+REPLACE_TIMEOUT = 30
+POLL_INTERVAL = 0.05
+SYNCHRONIZE = 0x00100000
+WAIT_TIMEOUT = 0x102
+
+def player_pid(environ=os.environ):
+    try:
+        return int(environ.get(PID_VARIABLE, ''))
+    except ValueError:
+        return None
+
+def handshake_environment(pid=None):
+    return dict(os.environ, **{PID_VARIABLE: str(os.getpid() if pid is None else pid)})
+
+def process_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def wait_for_exit(pid, timeout=EXIT_TIMEOUT, clock=time.monotonic, sleep=time.sleep):
+    if sys.platform == 'win32':
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(SYNCHRONIZE, False, pid)
+        if not handle:
+            return True
+        try:
+            return kernel32.WaitForSingleObject(handle, int(timeout * 1000)) != WAIT_TIMEOUT
+        finally:
+            kernel32.CloseHandle(handle)
+    deadline = clock() + timeout
+    while process_running(pid):
+        if clock() >= deadline:
+            return False
+        sleep(POLL_INTERVAL)
+    return True
+
+def replace_file(source, target, timeout=REPLACE_TIMEOUT, clock=time.monotonic, sleep=time.sleep):
+    deadline = clock() + timeout
+    while True:
+        try:
+            os.replace(source, target)
+            return
+        except PermissionError:
+            if clock() >= deadline:
+                raise
+            sleep(POLL_INTERVAL)
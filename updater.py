@@ -1,9 +1,11 @@
 import sys
 import os
-import requests
 import logging
 import time
 import subprocess
+from downloader import logging_progress
+from delta_update import download_delta
+from update_handshake import EXIT_TIMEOUT, player_pid, wait_for_exit, replace_file
 from PyQt6.QtWidgets import QApplication, QDialog, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QFrame
 from PyQt6.QtCore import Qt, QTimer, QPoint
 from PyQt6.QtGui import QIcon
@@ -154,9 +156,14 @@ class LinkMessageDialog(DialogBase):
         ok_button.clicked.connect(self.accept)
         self.content_layout.addWidget(ok_button)
 
-def update_app(new_version):
+def update_app(new_version, expected_sha256=None, pid=None):
     logger.info("Updater launched.")
-    time.sleep(5)
+    launched = time.monotonic()
+    if pid is not None:
+        if wait_for_exit(pid):
+            logger.info(f"LDB Player exited after {time.monotonic() - launched:.2f}s.")
+        else:
+            logger.error(f"LDB Player (PID {pid}) is still running after {EXIT_TIMEOUT}s.")
     app = QApplication(sys.argv)
     app.setStyleSheet(QSS_STYLE)
     parent = None
@@ -164,19 +171,12 @@ def update_app(new_version):
     github_link = "https://github.com/kakao90g/ldb_player/releases"
     def proceed():
         logger.info(f"Starting update to v{new_version}.")
-        time.sleep(2)
         try:
             new_exe = os.path.join(os.path.dirname(current_exe), "LDBPlayer_new.exe")
             exe_url = f"https://github.com/kakao90g/ldb_player/releases/download/v{new_version}/LDBPlayer.exe"
-            response = requests.get(exe_url, headers={"User-Agent": "Mozilla/5.0"}, timeout=30, stream=True)
-            response.raise_for_status()
-            with open(new_exe, "wb") as f:
-                f.write(response.content)
-            if os.path.getsize(new_exe) <= 0:
-                raise ValueError("Downloaded file is empty")
-            if os.path.exists(current_exe):
-                os.remove(current_exe)
-            os.rename(new_exe, current_exe)
+            result = download_delta(exe_url, new_exe, current_exe, expected_sha256=expected_sha256, progress=logging_progress("LDBPlayer.exe"))
+            logger.info(f"Downloaded LDBPlayer.exe, SHA-256 {result['sha256']}, saved {result['saved_bytes']} of {result['size']} bytes.")
+            replace_file(new_exe, current_exe)
             logger.info("Download successful, starting LDBPlayer.exe.")
             subprocess.Popen(current_exe)
         except Exception as e:
@@ -202,7 +202,7 @@ def update_app(new_version):
         on_no()
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
+    if len(sys.argv) not in (2, 3):
         app = QApplication(sys.argv)
         app.setStyleSheet(QSS_STYLE)
         dialog = MessageDialog(None, "Updater Error",
@@ -210,4 +210,4 @@ if __name__ == "__main__":
         dialog.exec()
         sys.exit(1)
     new_version = sys.argv[1]
-    update_app(new_version)
\ No newline at end of file
+    update_app(new_version, sys.argv[2] if len(sys.argv) == 3 else None, player_pid())
\ No newline at end of file
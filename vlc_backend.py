@@ -0,0 +1,176 @@
+import ctypes
+import threading
+
+import vlc
+
+from playlist_model import MediaListSync, path_to_mrl, mrl_to_path
+from playback_core import MediaBackend, STATE_PLAYING, STATE_PAUSED, STATE_STOPPED
+from media_prefetch import MediaPrefetcher
+
+PARSE_TIMEOUT = 5000
+FRAME_TIMEOUT = 10.0
+
+class VlcBackend(MediaBackend):
+    def __init__(self, instance_args=""):
+        self.instance = vlc.Instance(instance_args)
+        self.media_list = self.instance.media_list_new()
+        self.list_player = self.instance.media_list_player_new()
+        self.player = self.list_player.get_media_player()
+        self.list_player.set_playback_mode(vlc.PlaybackMode.repeat)
+        self.list_player.set_media_list(self.media_list)
+        self.media_sync = MediaListSync(self.media_list, self.create_media)
+        self._mrl_paths = {}
+        self.prefetcher = MediaPrefetcher(self.parse_media, self.stop_parse, self.release_media)
+        self.upcoming = None
+        self.on_end_reached = None
+        self.event_manager = self.player.event_manager()
+        self.event_manager.event_attach(vlc.EventType.MediaPlayerEndReached, self.handle_end_reached)
+        self.event_manager.event_attach(vlc.EventType.MediaPlayerVout, lambda event: self.prefetcher.first_frame())
+
+    def handle_end_reached(self, event):
+        self.prefetcher.begin_switch(self.upcoming)
+        if self.on_end_reached is not None:
+            self.on_end_reached(event)
+
+    def create_media(self, path):
+        return self.instance.media_new(path_to_mrl(path))
+
+    def parse_media(self, media):
+        media.parse_with_options(vlc.MediaParseFlag.local, PARSE_TIMEOUT)
+
+    def stop_parse(self, media):
+        media.parse_stop()
+
+    def release_media(self, media):
+        media.release()
+
+    def probe_media(self, path):
+        media = self.create_media(path)
+        parsed = threading.Event()
+        events = media.event_manager()
+        events.event_attach(vlc.EventType.MediaParsedChanged, lambda event: parsed.set())
+        try:
+            media.parse_with_options(vlc.MediaParseFlag.local, PARSE_TIMEOUT)
+            finished = parsed.wait(PARSE_TIMEOUT / 1000 + 1)
+            status = media.get_parsed_status()
+            if status == vlc.MediaParsedStatus.timeout or (not finished and status != vlc.MediaParsedStatus.done):
+                raise TimeoutError(f"Parse {status}")
+            if status != vlc.MediaParsedStatus.done:
+                return {'error': f"Parse {status}"}
+            duration = media.get_duration()
+            info = {'duration': duration if duration > 0 else None}
+            for track in media.tracks_get() or ():
+                codec = track.codec.to_bytes(4, 'little').decode('ascii', 'replace').strip()
+                if track.type == vlc.TrackType.video and 'video_codec' not in info:
+                    info['video_codec'] = codec
+                    info['width'] = track.u.video.contents.width
+                    info['height'] = track.u.video.contents.height
+                elif track.type == vlc.TrackType.audio and 'audio_codec' not in info:
+                    info['audio_codec'] = codec
+            if 'video_codec' not in info and 'audio_codec' not in info:
+                info['error'] = "No playable tracks"
+            return info
+        finally:
+            events.event_detach(vlc.EventType.MediaParsedChanged)
+            media.release()
+
+    def grab_frame(self, path, timestamp, width):
+        height = width * 9 // 16
+        buffer = ctypes.create_string_buffer(width * height * 4)
+        frame = threading.Event()
+        @vlc.CallbackDecorators.VideoLockCb
+        def lock(opaque, planes):
+            planes[0] = ctypes.addressof(buffer)
+            return None
+        @vlc.CallbackDecorators.VideoDisplayCb
+        def display(opaque, picture):
+            frame.set()
+        media = self.create_media(path)
+        media.add_option(':no-audio')
+        media.add_option(':no-spu')
+        media.add_option(f':start-time={timestamp / 1000:.3f}')
+        player = self.instance.media_player_new()
+        try:
+            player.video_set_callbacks(lock, None, display, None)
+            player.video_set_format("RV32", width, height, width * 4)
+            player.set_media(media)
+            player.play()
+            if not frame.wait(FRAME_TIMEOUT):
+                raise TimeoutError(f"No frame decoded within {FRAME_TIMEOUT:.0f}s")
+            bgra = buffer.raw
+        finally:
+            player.stop()
+            player.release()
+            media.release()
+        rgb = bytearray(width * height * 3)
+        rgb[0::3] = bgra[2::4]
+        rgb[1::3] = bgra[1::4]
+        rgb[2::3] = bgra[0::4]
+        return width, height, bytes(rgb)
+
+    def set_playlist(self, paths):
+        if self.media_sync.sync(paths):
+            self._mrl_paths.clear()
+            self.prefetcher.clear()
+            self.upcoming = None
+
+    def count(self):
+        return self.media_list.count()
+
+    def play_index(self, index):
+        if 0 <= index < len(self.media_sync.paths):
+            self.prefetcher.begin_switch(self.media_sync.paths[index])
+        self.list_player.play_item_at_index(index)
+
+    def pause(self):
+        self.list_player.pause()
+
+    def resume(self):
+        self.list_player.pause()
+
+    def stop(self):
+        self.list_player.stop()
+
+    def state(self):
+        state = self.player.get_state()
+        if state == vlc.State.Playing:
+            return STATE_PLAYING
+        if state == vlc.State.Paused:
+            return STATE_PAUSED
+        return STATE_STOPPED
+
+    def is_playing(self):
+        return self.list_player.is_playing()
+
+    def current_path(self):
+        media = self.player.get_media()
+        if media is None:
+            return None
+        mrl = media.get_mrl()
+        path = self._mrl_paths.get(mrl)
+        if path is None:
+            path = mrl_to_path(mrl)
+            self._mrl_paths[mrl] = path
+        return path
+
+    def set_repeat_mode(self, mode):
+        self.list_player.set_playback_mode(vlc.PlaybackMode.repeat if mode == 'one' else vlc.PlaybackMode.loop)
+
+    def prefetch(self, indices, upcoming):
+        paths = self.media_sync.paths
+        items = []
+        self.media_list.lock()
+        try:
+            for index in indices:
+                if 0 <= index < len(paths):
+                    items.append((paths[index], self.media_list.item_at_index(index)))
+        finally:
+            self.media_list.unlock()
+        self.prefetcher.prepare(items)
+        self.upcoming = paths[upcoming] if 0 <= upcoming < len(paths) else None
+
+    def set_volume(self, volume):
+        self.player.audio_set_volume(volume)
+
+    def set_mute(self, muted):
+        self.player.audio_set_mute(muted)